@@ -0,0 +1,7 @@
+"""
+Benchmarks for the NRTSearch MCP server.
+
+These scripts run against a local stub of the NRTSearch REST API so that
+results do not depend on a real cluster. Run them from the repository root,
+e.g. ``python -m benchmarks.bench_connection_pool``.
+"""
@@ -0,0 +1,73 @@
+"""
+Per-call vs pooled HTTP client latency against the local stub server.
+
+"before" reproduces the old behaviour of opening a fresh ``httpx.AsyncClient``
+for every request; "after" goes through ``NRTSearchClient`` and its pooled,
+keep-alive client.
+
+Usage:
+    python -m benchmarks.bench_connection_pool [--requests 500] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+import httpx
+
+from benchmarks.common import format_summary, summarize
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+SEARCH_REQUEST = {"indexName": "yelp_reviews", "queryText": "tacos", "startHit": 0, "topHits": 10}
+
+
+async def _run(call: Callable[[], Awaitable[object]], requests: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def main(requests: int, concurrency: int) -> None:
+    with StubNRTSearchServer() as stub:
+        url = f"{stub.url}/search"
+
+        async def per_call_client() -> object:
+            async with httpx.AsyncClient() as http:
+                response = await http.post(url, json=SEARCH_REQUEST, timeout=30.0)
+                response.raise_for_status()
+                return response.json()
+
+        connections_before = stub.connection_count
+        before = await _run(per_call_client, requests, concurrency)
+        before_connections = stub.connection_count - connections_before
+
+        connection = NRTSearchConnection(host=stub.host, port=stub.port)
+        async with NRTSearchClient(connection) as client:
+            connections_before = stub.connection_count
+            after = await _run(
+                lambda: client.search("yelp_reviews", "tacos"), requests, concurrency
+            )
+            after_connections = stub.connection_count - connections_before
+
+    print(f"requests={requests} concurrency={concurrency}")
+    print(format_summary("before (client per call)", summarize(before)), f"connections={before_connections}")
+    print(format_summary("after (pooled client)", summarize(after)), f"connections={after_connections}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,81 @@
+"""
+Per-key scanning vs compiled hit decoding on a synthetic response.
+
+"before" is the ``[k for k in value.keys() if k.endswith("Value")]`` scan the
+tools used for every field of every hit; "after" is ``HitDecoder`` compiled
+from the index schema.
+
+Usage:
+    python -m benchmarks.bench_decoder [--hits 100] [--fields 20] [--repeat 200]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from nrtsearch_mcp.decoder import HitDecoder
+
+VALUE_TYPES = [("ATOM", "textValue", "value"), ("INT", "intValue", 42),
+               ("DOUBLE", "doubleValue", 3.5), ("LONG", "longValue", 1 << 40)]
+
+
+def make_response(num_hits: int, num_fields: int, list_shaped: bool):
+    schema = []
+    for f in range(num_fields):
+        field_type, _, _ = VALUE_TYPES[f % len(VALUE_TYPES)]
+        schema.append({"name": f"field_{f}", "type": field_type})
+
+    hits = []
+    for h in range(num_hits):
+        fields = {}
+        for f in range(num_fields):
+            _, key, value = VALUE_TYPES[f % len(VALUE_TYPES)]
+            typed = {key: value}
+            fields[f"field_{f}"] = {"fieldValue": [typed] if list_shaped else typed}
+        hits.append({"luceneDocId": h, "score": 1.0, "fields": fields})
+    return schema, {"hits": hits}
+
+
+def scan_decode(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    decoded = []
+    for hit in response["hits"]:
+        values = {}
+        for name, field_value in hit["fields"].items():
+            actual_value = field_value.get("fieldValue", {})
+            if isinstance(actual_value, list):
+                actual_value = actual_value[0] if actual_value else {}
+            value_type_keys = [k for k in actual_value.keys() if k.endswith("Value")]
+            if value_type_keys:
+                values[name] = actual_value.get(value_type_keys[0])
+        decoded.append(values)
+    return decoded
+
+
+def time_it(func: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(num_hits: int, num_fields: int, repeat: int) -> None:
+    for list_shaped in (False, True):
+        schema, response = make_response(num_hits, num_fields, list_shaped)
+        decoder = HitDecoder.from_field_info(schema)
+        assert scan_decode(response) == [decoder.decode_fields(h["fields"]) for h in response["hits"]]
+
+        before = time_it(lambda: scan_decode(response), repeat)
+        after = time_it(lambda: [decoder.decode_fields(h["fields"]) for h in response["hits"]], repeat)
+        shape = "list-shaped" if list_shaped else "dict-shaped"
+        print(f"{num_hits} hits x {num_fields} fields, {shape}: "
+              f"scan {before * 1e6:8.1f}us  compiled {after * 1e6:8.1f}us  "
+              f"speedup {before / after:4.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hits", type=int, default=100)
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.hits, args.fields, args.repeat)
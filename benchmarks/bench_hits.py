@@ -0,0 +1,85 @@
+"""
+Memory held by raw search responses vs decoded HitTables.
+
+"raw" is the response as decoded from JSON, which is what the result cache
+held and the renderers walked before; "table" is ``HitTable``, which the
+cache holds now. "containers only" compares one plain dict per hit with the
+table's columns, not counting the values both share with the response.
+Retained sizes and allocation counts are measured with tracemalloc, as is
+the peak while rendering each form.
+
+Usage:
+    python -m benchmarks.bench_hits [--hits 100 1000] [--text-size 200]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from benchmarks.stub_server import make_search_response
+from nrtsearch_mcp.decoder import HitDecoder
+from nrtsearch_mcp.hits import HitTable
+from nrtsearch_mcp.tools.render import RenderOptions, render_search_results
+
+UNBOUNDED = RenderOptions(max_output_bytes=1 << 30)
+
+
+def retained(build: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """Build a value and return it with the bytes and blocks it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    value = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return value, size, blocks
+
+
+def peak(func: Callable[[], Any]) -> int:
+    """Peak traced bytes while running ``func``."""
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top
+
+
+def main(hit_counts: Any, text_size: int) -> None:
+    decoder = HitDecoder({"review_id": "ATOM", "business_id": "ATOM", "stars": "INT", "text": "TEXT"})
+    for num_hits in hit_counts:
+        body = json.dumps(make_search_response(num_hits, text_size)).encode()
+        raw, raw_bytes, raw_blocks = retained(lambda: json.loads(body))
+        # What the result cache keeps: the table alone, the raw response dropped
+        table, table_bytes, table_blocks = retained(
+            lambda: HitTable.from_response(json.loads(body), decoder)
+        )
+        # Containers added on top of the raw response's values
+        _, dict_bytes, dict_blocks = retained(
+            lambda: [decoder.decode_fields(hit["fields"]) for hit in raw["hits"]]
+        )
+        _, columns_bytes, columns_blocks = retained(lambda: HitTable.from_response(raw, decoder))
+        assert len(table) == num_hits
+
+        render_raw = peak(lambda: render_search_results("q", raw, decoder, options=UNBOUNDED))
+        render_table = peak(lambda: render_search_results("q", table, options=UNBOUNDED))
+
+        print(f"{num_hits} hits, {text_size}-char text")
+        print(f"  raw response       {raw_bytes / 1024:9.1f} KiB  {raw_blocks:7d} blocks")
+        print(f"  hit table          {table_bytes / 1024:9.1f} KiB  {table_blocks:7d} blocks")
+        print(f"  containers only    dicts {dict_bytes / 1024:7.1f} KiB ({dict_blocks} blocks)"
+              f"   table {columns_bytes / 1024:7.1f} KiB ({columns_blocks} blocks)")
+        print(f"  render peak        raw {render_raw / 1024:9.1f} KiB   table {render_table / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hits", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--text-size", type=int, default=200)
+    args = parser.parse_args()
+    main(args.hits, args.text_size)
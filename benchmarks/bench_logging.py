@@ -0,0 +1,94 @@
+"""
+Per-request logging overhead: f-string debug calls vs lazy previews.
+
+"before" is the logging the client did on every request: three
+``logger.debug(f"...")`` calls that format the URL, the whole request dict
+and the whole decoded response even when DEBUG is off. "after" is the
+current scheme: one level check, then (with DEBUG on) a URL line plus a
+sampled, size-capped preview of the raw request and response bytes.
+
+Records go to a handler that formats and discards them, so the DEBUG-on
+numbers include message formatting but no I/O.
+
+Usage:
+    python -m benchmarks.bench_logging [--hits 100] [--text-size 4000] [--repeat 500]
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.stub_server import make_search_response
+from nrtsearch_mcp import jsoncodec
+from nrtsearch_mcp.logpreview import PayloadSampler
+
+logger = logging.getLogger("benchmarks.bench_logging")
+
+
+class FormattingNullHandler(logging.Handler):
+    """Formats each record like a real handler would, then drops it."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+
+
+def log_before(url: str, request: Dict[str, Any], result: Dict[str, Any]) -> None:
+    logger.debug(f"Making POST request to {url}")
+    if request:
+        logger.debug(f"Request data: {request}")
+    logger.debug(f"Response: {result}")
+
+
+def log_after(
+    sampler: PayloadSampler, url: str, content: bytes, body: bytes, elapsed: float
+) -> None:
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("%s %s", "POST", url)
+    if debug and sampler.sample():
+        logger.debug(
+            "%s %s -> %s in %.1fms\n  request: %s\n  response: %s",
+            "POST", url, 200, elapsed * 1000.0,
+            sampler.preview(content), sampler.preview(body)
+        )
+
+
+def time_it(func: Callable[[], None], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(num_hits: int, text_size: int, repeat: int) -> None:
+    url = "http://localhost:8000/search"
+    request = {"indexName": "reviews", "queryText": "great coffee", "startHit": 0, "topHits": num_hits}
+    result = make_search_response(num_hits, text_size)
+    content = jsoncodec.dumps(request)
+    body = jsoncodec.dumps(result)
+    sampled = PayloadSampler(rate=0.1)
+    every = PayloadSampler(rate=1.0)
+
+    logger.addHandler(FormattingNullHandler())
+    logger.propagate = False
+    cases = [
+        ("before", lambda: log_before(url, request, result)),
+        ("after, 10% payloads", lambda: log_after(sampled, url, content, body, 0.012)),
+        ("after, every payload", lambda: log_after(every, url, content, body, 0.012)),
+    ]
+    print(f"{num_hits} hits, text field of {text_size} chars, response {len(body)} bytes")
+    for level in (logging.INFO, logging.DEBUG):
+        logger.setLevel(level)
+        for label, func in cases:
+            elapsed = time_it(func, repeat)
+            print(f"{logging.getLevelName(level):<6} {label:<22} {elapsed * 1e6:10.2f}us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hits", type=int, default=100)
+    parser.add_argument("--text-size", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    main(args.hits, args.text_size, args.repeat)
@@ -0,0 +1,81 @@
+"""
+String concatenation vs the shared renderer on 100-hit responses.
+
+"before" is the ``formatted_results += ...`` loop the search tools used;
+"after" is ``render_search_results`` in verbose and compact modes, which
+joins a list of parts and applies the output byte budget. As in the tools,
+the renderer is given a ``HitTable`` decoded once, outside the timed loop;
+"decode" times that decoding on its own.
+
+Usage:
+    python -m benchmarks.bench_render [--hits 100] [--text-size 4000] [--repeat 200]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.stub_server import make_search_response
+from nrtsearch_mcp.decoder import HitDecoder
+from nrtsearch_mcp.hits import HitTable
+from nrtsearch_mcp.tools.render import RenderOptions, render_search_results
+
+SCHEMA = [
+    {"name": "review_id", "type": "ATOM"},
+    {"name": "business_id", "type": "ATOM"},
+    {"name": "stars", "type": "INT"},
+    {"name": "text", "type": "TEXT"},
+]
+
+
+def concat_format(query: str, result: Dict[str, Any]) -> str:
+    hits = result.get("hits", [])
+    total_hits = result.get("totalHits", {}).get("value", 0)
+    formatted_results = f"Found {total_hits} results for query: '{query}'\n\n"
+    for i, hit in enumerate(hits):
+        formatted_results += f"Result {i+1} (Score: {hit.get('score', 0):.2f}):\n"
+        for field_name, field_value in hit.get("fields", {}).items():
+            actual_value = field_value.get("fieldValue", [{}])[0]
+            value_type_keys = [k for k in actual_value.keys() if k.endswith("Value")]
+            if value_type_keys:
+                value = actual_value.get(value_type_keys[0])
+                formatted_results += f"  {field_name}: {value}\n"
+        formatted_results += "\n"
+    return formatted_results
+
+
+def time_it(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(num_hits: int, text_size: int, repeat: int) -> None:
+    response = make_search_response(num_hits, text_size)
+    decoder = HitDecoder.from_field_info(SCHEMA)
+    table = HitTable.from_response(response, decoder)
+    unbounded = RenderOptions(max_output_bytes=1 << 30)
+
+    cases = [
+        ("before (+= concatenation)", lambda: concat_format("q", response)),
+        ("after verbose, no budget", lambda: render_search_results("q", table, options=unbounded)),
+        ("after verbose, 64KB budget", lambda: render_search_results("q", table)),
+        ("after compact", lambda: render_search_results("q", table, mode="compact")),
+    ]
+    print(f"{num_hits} hits, text field of {text_size} chars")
+    for label, func in cases:
+        elapsed = time_it(func, repeat)
+        size = len(func().encode("utf-8"))
+        print(f"{label:<28} {elapsed * 1e6:9.1f}us  output {size:>8} bytes")
+    elapsed = time_it(lambda: HitTable.from_response(response, decoder), repeat)
+    print(f"{'decode (once per search)':<28} {elapsed * 1e6:9.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hits", type=int, default=100)
+    parser.add_argument("--text-size", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.hits, args.text_size, args.repeat)
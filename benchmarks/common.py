@@ -0,0 +1,36 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) of ``samples`` (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (in seconds) as milliseconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples, default=0.0) * 1000,
+    }
+
+
+def format_summary(label: str, summary: Dict[str, float]) -> str:
+    """Render a one-line latency summary."""
+    return (
+        f"{label:<28} n={summary['count']:<6} "
+        f"p50={summary['p50_ms']:8.3f}ms  p99={summary['p99_ms']:8.3f}ms  "
+        f"max={summary['max_ms']:8.3f}ms"
+    )
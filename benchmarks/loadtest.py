@@ -0,0 +1,352 @@
+"""
+Load test of the MCP tools against the local NRTSearch stub.
+
+Runs a workload through the tools at one or more fixed concurrency levels
+(closed loop: each worker sends its next call as soon as the previous one
+returns) and reports throughput, latency percentiles, errors and memory.
+Calls go straight to the tool functions (``--via direct``) or through an
+in-memory FastMCP client, including MCP dispatch and serialization
+(``--via mcp``).
+
+Save a run with ``--json`` and pass it to a later run with ``--compare`` to
+see the change between commits. Saved runs record the commit, Python
+version and every parameter.
+
+Usage:
+    python -m benchmarks.loadtest [--workload search_index] [--concurrency 1,8,32]
+        [--requests 1000 | --duration 10] [--latency 0.002] [--jitter 0.002]
+        [--hits 10] [--text-size 200] [--error-rate 0] [--distinct-queries 500]
+        [--via direct] [--no-cache] [--tracemalloc] [--json out.json]
+        [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import summarize
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.config import NRTSearchConnection, ServerConfig, get_default_config
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.index import register_index_tools
+from nrtsearch_mcp.tools.search import register_search_tools
+
+# Peak resident set size is only available on Unix
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+INDEX = "yelp_reviews"
+
+ToolCall = Tuple[str, Dict[str, Any]]
+
+
+def search_index_call(i: int, distinct: int) -> ToolCall:
+    return "search_index", {"index_name": INDEX, "query": f"query {i % distinct}"}
+
+
+def search_advanced_call(i: int, distinct: int) -> ToolCall:
+    return "search_advanced", {
+        "index_name": INDEX,
+        "query": f"query {i % distinct}",
+        "filters": [f"stars:{i % 5 + 1}"],
+        "fields": ["review_id", "stars", "text"],
+        "output_mode": "compact",
+    }
+
+
+def get_document_call(i: int, distinct: int) -> ToolCall:
+    return "get_document_by_id", {"index_name": INDEX, "doc_id": str(i % distinct)}
+
+
+def get_index_info_call(i: int, distinct: int) -> ToolCall:
+    return "get_index_info", {"index_name": INDEX}
+
+
+# Mixed traffic, in twentieths: 14 simple searches, 3 advanced, 2 lookups, 1 metadata
+_MIX = (
+    [search_index_call] * 14 + [search_advanced_call] * 3
+    + [get_document_call] * 2 + [get_index_info_call]
+)
+
+
+def mixed_call(i: int, distinct: int) -> ToolCall:
+    return _MIX[i % len(_MIX)](i, distinct)
+
+
+WORKLOADS: Dict[str, Callable[[int, int], ToolCall]] = {
+    "search_index": search_index_call,
+    "search_advanced": search_advanced_call,
+    "get_document_by_id": get_document_call,
+    "get_index_info": get_index_info_call,
+    "mixed": mixed_call,
+}
+
+
+class ToolCollector:
+    """Minimal stand-in for FastMCP that collects the registered tools."""
+
+    def __init__(self) -> None:
+        self.tools: Dict[str, Callable[..., Awaitable[str]]] = {}
+
+    def tool(self, **kwargs: Any) -> Callable[[Any], Any]:
+        def decorator(func: Any) -> Any:
+            self.tools[func.__name__] = func
+            return func
+        return decorator
+
+
+def is_error(output: str) -> bool:
+    """Whether a tool's output reports a failure (tools return errors as text)."""
+    return output.startswith("Error") or output.startswith('{"error"')
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_config(stub: StubNRTSearchServer, args: argparse.Namespace) -> ServerConfig:
+    config = get_default_config()
+    config.nrtsearch_connection = NRTSearchConnection(host=stub.host, port=stub.port)
+    config.search_cache.enabled = not args.no_cache
+    return config
+
+
+async def drive(
+    call: Callable[[str, Dict[str, Any]], Awaitable[str]],
+    workload: Callable[[int, int], ToolCall],
+    concurrency: int,
+    requests: Optional[int],
+    duration: Optional[float],
+    distinct: int,
+    first: int = 0
+) -> Tuple[List[float], int, float]:
+    """Run a closed-loop workload.
+
+    Returns:
+        Latencies of successful calls, number of failed calls, and wall time
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(first, first + requests) if requests is not None else _count(first))
+    stop_at = None if duration is None else time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                return
+            name, arguments = workload(i, distinct)
+            started = time.perf_counter()
+            try:
+                output = await call(name, arguments)
+                failed = is_error(output)
+            except Exception:
+                failed = True
+            if failed:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def _count(start: int) -> Any:
+    i = start
+    while True:
+        yield i
+        i += 1
+
+
+async def run_level(
+    stub: StubNRTSearchServer, args: argparse.Namespace, concurrency: int
+) -> Dict[str, Any]:
+    """Run the workload at one concurrency level with a fresh client."""
+    config = make_config(stub, args)
+    workload = WORKLOADS[args.workload]
+
+    async def measure(call: Callable[[str, Dict[str, Any]], Awaitable[str]]) -> Dict[str, Any]:
+        await drive(call, workload, concurrency, args.warmup, None, args.distinct_queries)
+        backend_before = stub.request_count
+        if args.tracemalloc:
+            tracemalloc.start()
+        latencies, errors, wall = await drive(
+            call, workload, concurrency, args.requests, args.duration,
+            args.distinct_queries, first=args.warmup
+        )
+        heap_peak = None
+        if args.tracemalloc:
+            heap_peak = tracemalloc.get_traced_memory()[1] / (1 << 20)
+            tracemalloc.stop()
+        completed = len(latencies) + errors
+        return {
+            "workload": args.workload,
+            "via": args.via,
+            "concurrency": concurrency,
+            "calls": completed,
+            "errors": errors,
+            "backend_requests": stub.request_count - backend_before,
+            "wall_s": wall,
+            "throughput_rps": completed / wall if wall else 0.0,
+            "latency": summarize(latencies),
+            "peak_rss_mb": peak_rss_mb(),
+            "heap_peak_mb": heap_peak,
+        }
+
+    if args.via == "mcp":
+        import fastmcp
+
+        from nrtsearch_mcp import server
+
+        mcp = server.create_server(config)
+        async with fastmcp.Client(mcp) as session:
+            async def call_mcp(name: str, arguments: Dict[str, Any]) -> str:
+                result = await session.call_tool(name, arguments, raise_on_error=False)
+                return result.content[0].text if result.content else ""
+            return await measure(call_mcp)
+
+    async with NRTSearchClient.from_config(config) as client:
+        tools = ToolCollector()
+        register_search_tools(tools, client, call_timeout=config.tool_timeout)
+        register_index_tools(tools, client, call_timeout=config.tool_timeout)
+
+        async def call_direct(name: str, arguments: Dict[str, Any]) -> str:
+            return await tools.tools[name](**arguments)
+        return await measure(call_direct)
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    latency = result["latency"]
+    memory = f"rss={result['peak_rss_mb']:.0f}MB" if result["peak_rss_mb"] is not None else ""
+    if result["heap_peak_mb"] is not None:
+        memory += f" heap={result['heap_peak_mb']:.1f}MB"
+    return (
+        f"c={result['concurrency']:<4} calls={result['calls']:<6} errors={result['errors']:<4} "
+        f"{result['throughput_rps']:9.1f}/s  p50={latency['p50_ms']:7.2f}ms "
+        f"p90={latency['p90_ms']:7.2f}ms p99={latency['p99_ms']:7.2f}ms "
+        f"max={latency['max_ms']:7.2f}ms  {memory}"
+    )
+
+
+def _delta(new: float, old: float) -> str:
+    if not old:
+        return "     n/a"
+    return f"{(new - old) / old * 100:+7.1f}%"
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """Print the change against a saved run, matching runs by workload, path and concurrency."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["workload"], r["via"], r["concurrency"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline['meta']['commit']} ({baseline_path}):")
+    for result in results:
+        old = previous.get((result["workload"], result["via"], result["concurrency"]))
+        if old is None:
+            print(f"c={result['concurrency']:<4} no matching baseline run")
+            continue
+        print(
+            f"c={result['concurrency']:<4} "
+            f"throughput {_delta(result['throughput_rps'], old['throughput_rps'])}  "
+            f"p50 {_delta(result['latency']['p50_ms'], old['latency']['p50_ms'])}  "
+            f"p99 {_delta(result['latency']['p99_ms'], old['latency']['p99_ms'])}"
+        )
+
+
+async def main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    stub = StubNRTSearchServer(
+        latency=args.latency,
+        num_hits=args.hits,
+        text_size=args.text_size,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    print(
+        f"workload={args.workload} via={args.via} hits={args.hits} text_size={args.text_size} "
+        f"latency={args.latency * 1000:.1f}ms+{args.jitter * 1000:.1f}ms "
+        f"error_rate={args.error_rate} cache={'off' if args.no_cache else 'on'}"
+    )
+    results = []
+    with stub:
+        for concurrency in levels:
+            result = await run_level(stub, args, concurrency)
+            print(format_result(result))
+            results.append(result)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="search_index")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated levels")
+    parser.add_argument("--requests", type=int, default=1000, help="calls per level")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="seconds per level (instead of a call count)")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed calls before each level")
+    parser.add_argument("--latency", type=float, default=0.002, help="stub seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.002, help="stub extra random seconds")
+    parser.add_argument("--hits", type=int, default=10, help="hits per search response")
+    parser.add_argument("--text-size", type=int, default=200, help="characters in each hit's text")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub requests failed")
+    parser.add_argument("--distinct-queries", type=int, default=500,
+                        help="distinct queries cycled through (fewer means more cache hits)")
+    parser.add_argument("--via", choices=("direct", "mcp"), default="direct")
+    parser.add_argument("--no-cache", action="store_true", help="disable the search result cache")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also report the peak Python heap (slows the run)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for stub jitter and failures")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="compare with results saved by --json")
+    args = parser.parse_args(argv)
+    if args.duration is not None:
+        args.requests = None
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(main(args))
+    if args.json:
+        meta = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        }
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    if args.compare:
+        compare(results, args.compare)
@@ -0,0 +1,330 @@
+"""
+Local stub of the NRTSearch REST API.
+
+The stub runs a threaded HTTP/1.1 server (with keep-alive) in a background
+thread and answers the endpoints used by ``NRTSearchClient`` with canned
+responses. Latency (with jitter), the size of search responses and injected
+failures can be tuned, and any path's response can be replaced. Searches
+honour ``retrieveFields`` and ``highlight`` (fragments are cut from the
+start of fields that contain a query word). It is meant for benchmarks and tests, not for
+correctness of the search results.
+
+Run it standalone to point a real server at it:
+
+    python -m benchmarks.stub_server --port 8000 --latency 0.005 --hits 100
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+
+
+def make_search_response(num_hits: int = 10, text_size: int = 200) -> Dict[str, Any]:
+    """Build a canned /search response with ``num_hits`` hits."""
+    text = ("lorem ipsum dolor sit amet " * (text_size // 27 + 1))[:text_size]
+    hits = []
+    for i in range(num_hits):
+        hits.append({
+            "luceneDocId": i,
+            "score": 1.0 / (i + 1),
+            "fields": {
+                "review_id": {"fieldValue": [{"textValue": f"review-{i}"}]},
+                "business_id": {"fieldValue": [{"textValue": f"business-{i % 7}"}]},
+                "stars": {"fieldValue": [{"intValue": i % 5 + 1}]},
+                "text": {"fieldValue": [{"textValue": text}]},
+            }
+        })
+    return {
+        "totalHits": {"value": num_hits, "relation": "EQUAL_TO"},
+        "hits": hits
+    }
+
+
+def project_response(
+    response: Dict[str, Any],
+    fields: Optional[List[str]],
+    highlight: Optional[Dict[str, Any]],
+    query: str = ""
+) -> Dict[str, Any]:
+    """Keep only ``fields`` of each hit and add fragments for ``highlight``.
+
+    Like NRTSearch, fields that do not contain a word of ``query`` get no
+    fragments, and matched words are wrapped in ``<em>`` tags.
+    """
+    words = [re.escape(word) for word in re.findall(r"\w+", query.lower())]
+    matched = re.compile(rf"\b({'|'.join(words)})\b", re.IGNORECASE) if words else None
+    hits = []
+    for hit in response["hits"]:
+        projected = dict(hit)
+        if fields:
+            projected["fields"] = {k: v for k, v in hit["fields"].items() if k in fields}
+        else:
+            projected["fields"] = {}
+        if highlight:
+            settings = highlight.get("settings", {})
+            size = settings.get("fragmentSize", 100)
+            count = settings.get("maxNumberOfFragments", 5)
+            projected["highlights"] = {}
+            for name in highlight.get("fields", []):
+                typed = hit["fields"].get(name, {}).get("fieldValue", [{}])[0]
+                text = str(typed.get("textValue", ""))
+                if matched is None or not matched.search(text):
+                    continue
+                fragments = [
+                    matched.sub(r"<em>\1</em>", text[i:i + size])
+                    for i in range(0, len(text), size)
+                ][:count]
+                projected["highlights"][name] = {"fragments": fragments}
+        hits.append(projected)
+    return dict(response, hits=hits)
+
+
+class StubNRTSearchServer:
+    """A local NRTSearch stand-in running on a background thread.
+
+    Args:
+        host: Interface to bind to
+        port: Port to bind to (0 picks a free port)
+        latency: Seconds to sleep before answering each request
+        num_hits: Number of hits in canned search responses
+        text_size: Size of the ``text`` field in canned hits
+        latency_jitter: Extra random latency per request, up to this many seconds
+        error_rate: Fraction of requests answered with ``injected_status``
+        injected_status: HTTP status of randomly injected failures
+        seed: Seed for the jitter and failure injection
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        num_hits: int = 10,
+        text_size: int = 200,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        injected_status: int = 503,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        # HTTP status to answer every request with instead of a canned response
+        self.error_status: Optional[int] = None
+        self.error_rate = error_rate
+        self.injected_status = injected_status
+        self.injected_errors = 0
+        # Path (without query string) -> response body, overriding the canned ones
+        self.responses: Dict[str, bytes] = {}
+        # Stored documents by ID. When set, /getDoc answers from it (404 for
+        # unknown IDs) and so do termInSetQuery searches on ``id_field``.
+        self.documents: Optional[Dict[str, Dict[str, Any]]] = None
+        self.id_field = "review_id"
+        # When False, searches asking for highlights are rejected (404)
+        self.highlighting = True
+        self._rng = random.Random(seed)
+        self.request_count = 0
+        self.connection_count = 0
+        # Request paths in arrival order
+        self.paths: List[str] = []
+        self._lock = threading.Lock()
+        self.set_search_payload(num_hits, text_size)
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._httpd.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _make_handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY the
+            # body waits for the client's delayed ACK (~40ms per response)
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connection_count += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _reply(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = self.rfile.read(length) if length else b""
+
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.paths.append(self.path)
+                    delay = stub.latency
+                    if stub.latency_jitter:
+                        delay += stub._rng.uniform(0.0, stub.latency_jitter)
+                    status = stub.error_status
+                    if status is None and stub.error_rate and stub._rng.random() < stub.error_rate:
+                        status = stub.injected_status
+                        stub.injected_errors += 1
+                if delay:
+                    time.sleep(delay)
+
+                body = stub.response_body(self.command, self.path, request)
+                if status is not None:
+                    self.send_response(status)
+                    body = b'{"error": "injected failure"}'
+                elif body is None:
+                    self.send_response(404)
+                    body = b'{"error": "not found"}'
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _reply
+            do_POST = _reply
+
+        return Handler
+
+    def response_body(self, method: str, path: str, request: bytes = b"") -> Optional[bytes]:
+        """Return the canned response body for a request, or None for 404."""
+        path = path.split("?", 1)[0]
+        if path.startswith("/v1/"):
+            path = path[3:]
+        if path in self.responses:
+            return self.responses[path]
+        if self.documents is not None and path in ("/getDoc", "/search"):
+            return self._document_response(path, json.loads(request or b"{}"))
+        if path == "/search":
+            return self._projected_search_body(json.loads(request or b"{}"))
+        if path == "/indices":
+            return b'{"indices": ["yelp_reviews"]}'
+        if path.endswith("/fields"):
+            return b'{"fields": []}'
+        if path.startswith("/indices/"):
+            return b'{"settings": {}, "status": {}}'
+        if path == "/getDoc":
+            return b'{"fields": {}}'
+        return None
+
+    def _document_response(self, path: str, request: Dict[str, Any]) -> Optional[bytes]:
+        assert self.documents is not None
+        if path == "/getDoc":
+            fields = self.documents.get(str(request.get("docId")))
+            return None if fields is None else json.dumps({"fields": fields}).encode()
+        terms = request.get("query", {}).get("termInSetQuery", {})
+        if terms.get("field") != self.id_field:
+            return self._projected_search_body(request)
+        ids = terms.get("textTerms", {}).get("terms", [])
+        response = {"hits": [
+            {"luceneDocId": i, "score": 1.0, "fields": self.documents[doc_id]}
+            for i, doc_id in enumerate(ids) if doc_id in self.documents
+        ]}
+        if request.get("retrieveFields"):
+            response = project_response(response, request["retrieveFields"], None)
+        response["totalHits"] = {"value": len(response["hits"])}
+        return json.dumps(response).encode()
+
+    def _projected_search_body(self, request: Dict[str, Any]) -> Optional[bytes]:
+        """The canned search response, cut down to the requested fields."""
+        fields = request.get("retrieveFields")
+        highlight = request.get("highlight")
+        if not fields and not highlight:
+            return self._search_body
+        if highlight and not self.highlighting:
+            return None
+        query = request.get("queryText", "") if highlight else ""
+        key = json.dumps([fields, highlight, query])
+        body = self._projected_bodies.get(key)
+        if body is None:
+            body = json.dumps(
+                project_response(self._search_response, fields, highlight, query)
+            ).encode()
+            self._projected_bodies[key] = body
+        return body
+
+    def set_documents(self, count: int, text_size: int = 200) -> None:
+        """Store ``count`` documents with IDs review-0, review-1, ..."""
+        hits = make_search_response(count, text_size)["hits"]
+        self.documents = {f"review-{i}": hit["fields"] for i, hit in enumerate(hits)}
+
+    def set_response(self, path: str, body: Union[bytes, Dict[str, Any], List[Any]]) -> None:
+        """Answer ``path`` (without the /v1 prefix) with ``body`` from now on."""
+        self.responses[path] = body if isinstance(body, bytes) else json.dumps(body).encode()
+
+    def set_search_payload(self, num_hits: int, text_size: int) -> None:
+        """Change the size of canned search responses."""
+        self._search_response = make_search_response(num_hits, text_size)
+        self._search_body = json.dumps(self._search_response).encode()
+        # Bodies of projected searches, by requested fields and highlight
+        self._projected_bodies: Dict[str, bytes] = {}
+
+    def start(self) -> "StubNRTSearchServer":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubNRTSearchServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stub of the NRTSearch REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds per request")
+    parser.add_argument("--hits", type=int, default=10, help="hits per search response")
+    parser.add_argument("--text-size", type=int, default=200, help="characters in each hit's text")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failed")
+    parser.add_argument("--error-status", type=int, default=503, help="status of injected failures")
+    args = parser.parse_args()
+
+    stub = StubNRTSearchServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        num_hits=args.hits,
+        text_size=args.text_size,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        injected_status=args.error_status
+    )
+    print(f"Stub NRTSearch listening on {stub.url}")
+    try:
+        stub._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Routing of NRTSearch requests across the nodes serving an index.
+
+Each index can be served by a primary and several replicas. Searches go to
+replicas, chosen with the power-of-two-choices rule: two candidates are drawn
+(weighted by their configured weight) and the one with the lower expected
+cost, its moving average latency times its outstanding requests, wins. Nodes
+that fail repeatedly are ejected until background health checks see them
+recover. Endpoints whose circuit breaker is open are skipped as well.
+"""
+
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+from nrtsearch_mcp.breaker import CircuitBreaker
+from nrtsearch_mcp.config import NRTSearchConnection, ServerConfig
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+REPLICA = "replica"
+ROLES = (PRIMARY, REPLICA)
+
+
+class Endpoint:
+    """An NRTSearch node and the state observed for it."""
+
+    def __init__(
+        self,
+        url: str,
+        role: str = PRIMARY,
+        weight: float = 1.0,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """Initialize the endpoint.
+
+        Args:
+            url: Base URL of the node
+            role: "primary" or "replica"
+            weight: Relative share of traffic among nodes with the same role
+            breaker: Optional circuit breaker for requests to the node
+
+        Raises:
+            ValueError: If the role or weight is invalid
+        """
+        if role not in ROLES:
+            raise ValueError(f"Unknown endpoint role '{role}' (expected one of: {', '.join(ROLES)})")
+        if weight <= 0:
+            raise ValueError(f"Endpoint weight must be positive, got {weight}")
+        self.url = url
+        self.role = role
+        self.weight = weight
+        self.breaker = breaker
+        self.healthy = True
+        # Moving average latency in seconds; None until the first response
+        self.ewma: Optional[float] = None
+        self.inflight = 0
+        self.consecutive_failures = 0
+        self.consecutive_successes = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the endpoint is healthy and its breaker lets requests through."""
+        return self.healthy and (self.breaker is None or self.breaker.accepting())
+
+    def cost(self) -> float:
+        """Expected cost of sending one more request here (lower is better)."""
+        return (self.ewma or 0.0) * (self.inflight + 1) / self.weight
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "role": self.role,
+            "weight": self.weight,
+            "healthy": self.healthy,
+            "ewma_ms": None if self.ewma is None else self.ewma * 1000.0,
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "breaker": None if self.breaker is None else self.breaker.stats(),
+        }
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r}, role={self.role!r}, weight={self.weight})"
+
+
+class LoadBalancer:
+    """Chooses an endpoint for each request and tracks endpoint health.
+
+    Endpoints are shared by URL, so a node serving several indexes has one
+    latency average and one health state.
+    """
+
+    def __init__(
+        self,
+        default_endpoints: List[Endpoint],
+        index_endpoints: Optional[Dict[str, List[Endpoint]]] = None,
+        ewma_alpha: float = 0.3,
+        unhealthy_threshold: int = 2,
+        healthy_threshold: int = 2,
+        health_check_interval: float = 0.0,
+        health_check_timeout: float = 2.0,
+        health_check_path: str = "/indices",
+        rng: Optional[random.Random] = None
+    ):
+        """Initialize the balancer.
+
+        Args:
+            default_endpoints: Endpoints for requests with no index-specific ones
+            index_endpoints: Index name to the endpoints serving it
+            ewma_alpha: Weight of the newest sample in the latency average
+            unhealthy_threshold: Consecutive failures before an endpoint is ejected
+            healthy_threshold: Consecutive successes before it is re-admitted
+            health_check_interval: Seconds between health checks (0 disables them)
+            health_check_timeout: Timeout in seconds for each health check
+            health_check_path: Path requested by health checks
+            rng: Random source, injectable for tests
+
+        Raises:
+            ValueError: If no default endpoint is given
+        """
+        if not default_endpoints:
+            raise ValueError("At least one default endpoint is required")
+        self.default_endpoints = list(default_endpoints)
+        self.index_endpoints = {
+            name: list(endpoints)
+            for name, endpoints in (index_endpoints or {}).items()
+            if endpoints
+        }
+        self.ewma_alpha = ewma_alpha
+        self.unhealthy_threshold = max(1, unhealthy_threshold)
+        self.healthy_threshold = max(1, healthy_threshold)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.health_check_path = health_check_path
+        self._rng = rng or random.Random()
+
+    @classmethod
+    def single(cls, url: str) -> "LoadBalancer":
+        """Build a balancer with one primary endpoint."""
+        return cls([Endpoint(url, PRIMARY)])
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "LoadBalancer":
+        """Build a balancer from the configured connection and index endpoints."""
+        connection: NRTSearchConnection = config.nrtsearch_connection
+        by_url: Dict[str, Endpoint] = {}
+
+        def endpoint(url: str, role: str, weight: float) -> Endpoint:
+            existing = by_url.get(url)
+            if existing is None:
+                breaker = CircuitBreaker.from_config(config)
+                existing = by_url[url] = Endpoint(url, role, weight, breaker)
+            return existing
+
+        default = [endpoint(connection.url, PRIMARY, 1.0)]
+        index_endpoints = {
+            index.name: [
+                endpoint(connection.endpoint_url(e.host, e.port), e.role, e.weight)
+                for e in index.endpoints
+            ]
+            for index in config.indexes
+        }
+        balancing = config.load_balancing
+        return cls(
+            default,
+            index_endpoints,
+            ewma_alpha=balancing.ewma_alpha,
+            unhealthy_threshold=balancing.unhealthy_threshold,
+            healthy_threshold=balancing.healthy_threshold,
+            health_check_interval=balancing.health_check_interval,
+            health_check_timeout=balancing.health_check_timeout,
+            health_check_path=balancing.health_check_path
+        )
+
+    def endpoints(self) -> List[Endpoint]:
+        """All distinct endpoints, in configuration order."""
+        seen: Dict[int, Endpoint] = {}
+        for endpoints in [self.default_endpoints, *self.index_endpoints.values()]:
+            for endpoint in endpoints:
+                seen.setdefault(id(endpoint), endpoint)
+        return list(seen.values())
+
+    def choose(
+        self,
+        index_name: Optional[str] = None,
+        role: str = REPLICA,
+        exclude: Optional[Endpoint] = None
+    ) -> Endpoint:
+        """Choose the endpoint for a request.
+
+        Available endpoints (healthy, breaker not open) with the preferred
+        role are used first, then any available endpoint. If none is
+        available, all of them are candidates again rather than failing the
+        request outright.
+
+        Args:
+            index_name: Index the request is for, if any
+            role: Preferred role, "replica" for searches, "primary" otherwise
+            exclude: Endpoint to avoid if there is any other, e.g. for a hedge
+
+        Returns:
+            The chosen endpoint
+        """
+        endpoints = self.index_endpoints.get(index_name or "", self.default_endpoints)
+        if exclude is not None:
+            endpoints = [e for e in endpoints if e is not exclude] or endpoints
+        if len(endpoints) == 1:
+            return endpoints[0]
+
+        available = [e for e in endpoints if e.available]
+        candidates = [e for e in available if e.role == role] or available or endpoints
+        return self._pick(candidates)
+
+    def _pick(self, candidates: List[Endpoint]) -> Endpoint:
+        """Power of two choices: the cheaper of two weighted random candidates."""
+        if len(candidates) == 1:
+            return candidates[0]
+        weights = [e.weight for e in candidates]
+        first = self._rng.choices(range(len(candidates)), weights)[0]
+        weights[first] = 0.0
+        second = self._rng.choices(range(len(candidates)), weights)[0]
+        a, b = candidates[first], candidates[second]
+        return b if b.cost() < a.cost() else a
+
+    def record_success(self, endpoint: Endpoint, latency: Optional[float] = None) -> None:
+        """Record a successful request or health check.
+
+        Args:
+            endpoint: The endpoint that answered
+            latency: Seconds the request took, if it should update the average
+        """
+        if latency is not None:
+            if endpoint.ewma is None:
+                endpoint.ewma = latency
+            else:
+                endpoint.ewma += self.ewma_alpha * (latency - endpoint.ewma)
+        endpoint.consecutive_failures = 0
+        endpoint.consecutive_successes += 1
+        if not endpoint.healthy and endpoint.consecutive_successes >= self.healthy_threshold:
+            endpoint.healthy = True
+            logger.info("Endpoint %s is healthy again, re-admitting it", endpoint.url)
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        """Record a failed request or health check, ejecting the endpoint if needed."""
+        endpoint.failures += 1
+        endpoint.consecutive_successes = 0
+        endpoint.consecutive_failures += 1
+        if endpoint.healthy and endpoint.consecutive_failures >= self.unhealthy_threshold:
+            endpoint.healthy = False
+            endpoint.ejections += 1
+            logger.warning(
+                "Endpoint %s failed %d times in a row, ejecting it",
+                endpoint.url, endpoint.consecutive_failures
+            )
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint routing statistics."""
+        return [endpoint.stats() for endpoint in self.endpoints()]
@@ -0,0 +1,120 @@
+"""
+Per-endpoint circuit breakers.
+
+A breaker opens after a run of consecutive failures, failing requests to its
+endpoint immediately instead of letting them time out. After a cool-down it
+lets a few probe requests through (half-open); a successful probe closes it
+again and a failed one re-opens it.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from nrtsearch_mcp.config import ServerConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Numeric encoding of the states, for metrics
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the endpoint's breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one endpoint."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before probing
+            half_open_max_calls: Probe requests allowed at once while half-open
+            clock: Monotonic time source, injectable for tests
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["CircuitBreaker"]:
+        """Build a breaker from the server configuration.
+
+        Returns:
+            The breaker, or None if circuit breaking is disabled
+        """
+        breaker = config.circuit_breaker
+        if not breaker.enabled:
+            return None
+        return cls(
+            failure_threshold=breaker.failure_threshold,
+            reset_timeout=breaker.reset_timeout,
+            half_open_max_calls=breaker.half_open_max_calls
+        )
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cool-down ends."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def accepting(self) -> bool:
+        """Whether a request would be let through right now."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and self._probes < self.half_open_max_calls)
+
+    def allow(self) -> bool:
+        """Admit a request, counting it as a probe while half-open."""
+        if not self.accepting():
+            self.rejected += 1
+            return False
+        if self._state == HALF_OPEN:
+            self._probes += 1
+        return True
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self._state == HALF_OPEN:
+            self._state = CLOSED
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self.opened += 1
+
+    def record_cancel(self) -> None:
+        """Forget an admitted request that was cancelled before completing."""
+        if self._state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,441 @@
+"""
+In-process caches used by the NRTSearch client.
+
+This module provides a TTL + LRU cache for search results, keyed on a
+canonical form of the search request so that trivially different requests
+(whitespace, filter order, field order) share one entry, a
+stale-while-revalidate cache for index metadata, and a byte-bounded LRU
+cache of documents fetched by ID.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from nrtsearch_mcp.config import ServerConfig
+from nrtsearch_mcp.hits import HitTable
+
+# A raw search response, or its hits decoded into a HitTable
+CachedResult = Union[Dict[str, Any], HitTable]
+
+
+def _normalize_whitespace(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends."""
+    return " ".join(text.split())
+
+
+def make_search_key(
+    index_name: str,
+    query: str,
+    start_hit: int = 0,
+    top_hits: int = 10,
+    retrieve_fields: Optional[Iterable[str]] = None,
+    filter_queries: Optional[Iterable[str]] = None
+) -> Tuple[Hashable, ...]:
+    """Build a canonical, hashable cache key for a search request.
+
+    Args:
+        index_name: Name of the index to search
+        query: Query text
+        start_hit: Starting position for results
+        top_hits: Number of results to return
+        retrieve_fields: Fields to retrieve
+        filter_queries: Filter queries to apply
+
+    Returns:
+        Tuple that compares equal for equivalent requests
+    """
+    fields = tuple(sorted(set(retrieve_fields or ())))
+    filters = tuple(sorted({_normalize_whitespace(f) for f in filter_queries or ()}))
+    return (
+        index_name,
+        _normalize_whitespace(query),
+        start_hit,
+        top_hits,
+        fields,
+        filters
+    )
+
+
+class SearchResultCache:
+    """Size-bounded LRU cache of search results with per-index TTLs.
+
+    Values are raw response dicts or decoded HitTables. Cached results are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 5.0,
+        index_ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            default_ttl: Seconds an entry stays fresh unless overridden per index
+            index_ttls: Per-index TTL overrides in seconds (0 disables caching)
+            clock: Monotonic time source, injectable for tests
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.index_ttls: Dict[str, float] = dict(index_ttls or {})
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, CachedResult]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["SearchResultCache"]:
+        """Build a cache from the server configuration.
+
+        Returns:
+            The cache, or None if caching is disabled
+        """
+        cache_config = config.search_cache
+        if not cache_config.enabled:
+            return None
+        return cls(
+            max_entries=cache_config.max_entries,
+            default_ttl=cache_config.default_ttl,
+            index_ttls={
+                index.name: index.cache_ttl
+                for index in config.indexes
+                if index.cache_ttl is not None
+            }
+        )
+
+    def ttl_for(self, index_name: str) -> float:
+        """Get the TTL in seconds for an index."""
+        return self.index_ttls.get(index_name, self.default_ttl)
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        """Look up a fresh cached result, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, index_name: str, value: CachedResult) -> None:
+        """Store a result, evicting the least recently used entries if full."""
+        ttl = self.ttl_for(index_name)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (self._clock() + ttl, index_name, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, index_name: Optional[str] = None) -> int:
+        """Drop cached results for one index, or everything.
+
+        Returns:
+            Number of entries removed
+        """
+        if index_name is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+        stale: List[Hashable] = [
+            key for key, (_, name, _) in self._entries.items() if name == index_name
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries)
+        }
+
+
+class MetadataCache:
+    """Cache of index metadata responses (listing, index info, field schema).
+
+    Metadata rarely changes, so entries are never dropped for age: once
+    older than the TTL they are reported as stale, and the client serves
+    them while fetching a fresh copy in the background. Entries are keyed
+    on the API path they were fetched from.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        refresh_interval: float = 60.0,
+        warm_on_start: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds before an entry is considered stale
+            refresh_interval: Seconds between background refreshes (0 disables)
+            warm_on_start: Whether the client should warm the cache on start
+            clock: Monotonic time source, injectable for tests
+        """
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.warm_on_start = warm_on_start
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["MetadataCache"]:
+        """Build a cache from the server configuration.
+
+        Returns:
+            The cache, or None if caching is disabled
+        """
+        cache_config = config.metadata_cache
+        if not cache_config.enabled:
+            return None
+        return cls(
+            ttl=cache_config.ttl,
+            refresh_interval=cache_config.refresh_interval,
+            warm_on_start=cache_config.warm_on_start
+        )
+
+    def get(self, path: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Look up a cached response.
+
+        Returns:
+            Tuple of (response, is_fresh), or None if not cached
+        """
+        entry = self._entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        fetched_at, value = entry
+        fresh = self._clock() - fetched_at < self.ttl
+        if fresh:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return value, fresh
+
+    def put(self, path: str, value: Dict[str, Any]) -> None:
+        """Store a freshly fetched response."""
+        self._entries[path] = (self._clock(), value)
+
+    def paths(self) -> List[str]:
+        """Paths of all cached entries."""
+        return list(self._entries)
+
+    def invalidate(self, index_name: Optional[str] = None) -> int:
+        """Drop cached metadata for one index, or everything.
+
+        Returns:
+            Number of entries removed
+        """
+        if index_name is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+        prefix = f"/indices/{index_name}"
+        stale = [
+            path for path in self._entries
+            if path == prefix or path.startswith(prefix + "/")
+        ]
+        for path in stale:
+            del self._entries[path]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/stale-hit/miss counters and current size."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "size": len(self._entries)
+        }
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a decoded JSON value, in bytes.
+
+    Strings count their length plus a fixed object overhead, so documents
+    with long text fields weigh proportionally more. This is much cheaper
+    than re-serializing the value and close enough for cache accounting.
+    """
+    if isinstance(value, str):
+        return 49 + len(value)
+    if isinstance(value, dict):
+        return 64 + sum(49 + len(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, list):
+        return 56 + sum(8 + estimate_size(v) for v in value)
+    return 32
+
+
+class DocumentCache:
+    """LRU cache of documents keyed on (index, doc_id), bounded by total size.
+
+    Documents are stored in the getDoc response shape (``{"fields": ...}``)
+    and are shared between callers, so they must be treated as read-only.
+    Sizes are estimated with ``estimate_size``.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_document_bytes: int = 1024 * 1024,
+        default_ttl: float = 60.0,
+        index_ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Total estimated size of cached documents
+            max_document_bytes: Larger documents are not cached
+            default_ttl: Seconds a document stays fresh unless overridden per index
+            index_ttls: Per-index TTL overrides in seconds (0 disables caching)
+            clock: Monotonic time source, injectable for tests
+        """
+        self.max_bytes = max_bytes
+        self.max_document_bytes = min(max_document_bytes, max_bytes)
+        self.default_ttl = default_ttl
+        self.index_ttls: Dict[str, float] = dict(index_ttls or {})
+        self._clock = clock
+        # (index, doc_id) -> (expires_at, size, document)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.too_large = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["DocumentCache"]:
+        """Build a cache from the server configuration.
+
+        Returns:
+            The cache, or None if caching is disabled
+        """
+        cache_config = config.document_cache
+        if not cache_config.enabled:
+            return None
+        return cls(
+            max_bytes=cache_config.max_bytes,
+            max_document_bytes=cache_config.max_document_bytes,
+            default_ttl=cache_config.ttl,
+            index_ttls={
+                index.name: index.cache_ttl
+                for index in config.indexes
+                if index.cache_ttl is not None
+            }
+        )
+
+    def ttl_for(self, index_name: str) -> float:
+        """Get the TTL in seconds for an index."""
+        return self.index_ttls.get(index_name, self.default_ttl)
+
+    def get(self, index_name: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a fresh cached document, marking it most recently used."""
+        key = (index_name, doc_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, size, document = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.bytes -= size
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return document
+
+    def put(self, index_name: str, doc_id: str, document: Dict[str, Any]) -> None:
+        """Store a document, evicting the least recently used ones to make room."""
+        ttl = self.ttl_for(index_name)
+        if ttl <= 0 or self.max_bytes <= 0:
+            return
+        size = estimate_size(document)
+        if size > self.max_document_bytes:
+            self.too_large += 1
+            return
+
+        key = (index_name, doc_id)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        self._entries[key] = (self._clock() + ttl, size, document)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self, index_name: Optional[str] = None) -> int:
+        """Drop cached documents for one index, or everything.
+
+        Returns:
+            Number of entries removed
+        """
+        if index_name is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+            return removed
+
+        stale = [key for key in self._entries if key[0] == index_name]
+        for key in stale:
+            self.bytes -= self._entries.pop(key)[1]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters, current size and estimated bytes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "too_large": self.too_large,
+            "size": len(self._entries),
+            "bytes": self.bytes
+        }
@@ -4,7 +4,7 @@ Configuration handling for the NRTSearch MCP server.
 
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -16,12 +16,38 @@ class NRTSearchConnection:
     host: str
     port: int
     use_https: bool = False
+    timeout: float = 30.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    # Prefix for every API path, e.g. "/v1" for the NRTSearch REST gateway
+    path_prefix: str = ""
     
     @property
     def url(self) -> str:
         """Get the URL for the NRTSearch server."""
+        return self.endpoint_url(self.host, self.port)
+    
+    def endpoint_url(self, host: str, port: int) -> str:
+        """Get the URL for another NRTSearch node using this connection's settings."""
         protocol = "https" if self.use_https else "http"
-        return f"{protocol}://{self.host}:{self.port}"
+        prefix = self.path_prefix.rstrip("/")
+        if prefix and not prefix.startswith("/"):
+            prefix = f"/{prefix}"
+        return f"{protocol}://{host}:{port}{prefix}"
+
+
+@dataclass
+class EndpointConfig:
+    """An NRTSearch node serving an index."""
+    
+    host: str
+    port: int
+    # "primary" or "replica"; searches are routed to replicas when any are healthy
+    role: str = "replica"
+    # Relative share of traffic among nodes with the same role
+    weight: float = 1.0
 
 
 @dataclass
@@ -32,6 +58,155 @@ class IndexConfig:
     description: str
     fields: List[str]
     default_search_fields: List[str]
+    # Seconds to cache search results for this index. None uses the
+    # search_cache default; keep it short for near-real-time indexes and
+    # long for static snapshots. 0 disables caching for the index.
+    cache_ttl: Optional[float] = None
+    # Nodes serving this index. Empty uses nrtsearch_connection's host/port.
+    endpoints: List[EndpointConfig] = field(default_factory=list)
+    # Field holding each document's ID. When set, large get_documents
+    # requests are answered with one search on this field.
+    id_field: Optional[str] = None
+
+
+@dataclass
+class SearchCacheConfig:
+    """Configuration for the in-process search result cache."""
+    
+    enabled: bool = True
+    max_entries: int = 1024
+    default_ttl: float = 5.0
+
+
+@dataclass
+class MetadataCacheConfig:
+    """Configuration for the index metadata (listing, info, schema) cache."""
+    
+    enabled: bool = True
+    # Seconds before a cached entry is considered stale. Stale entries are
+    # still served while a background refresh fetches a new copy.
+    ttl: float = 300.0
+    # Seconds between background refreshes of every cached entry (0 disables)
+    refresh_interval: float = 60.0
+    # Fetch metadata for the configured indexes when the server starts
+    warm_on_start: bool = True
+
+
+@dataclass
+class DocumentCacheConfig:
+    """Configuration for the cache of documents fetched by ID."""
+    
+    enabled: bool = True
+    # Total estimated size of cached documents, in bytes
+    max_bytes: int = 64 * 1024 * 1024
+    # Documents larger than this are not cached
+    max_document_bytes: int = 1024 * 1024
+    # Seconds a cached document is served for; an index's cache_ttl overrides it
+    ttl: float = 60.0
+
+
+@dataclass
+class SnippetConfig:
+    """Configuration of the snippets search tools return with snippets=True."""
+    
+    # Characters per snippet
+    length: int = 200
+    # Snippets per field
+    count: int = 2
+
+
+@dataclass
+class LoadBalancingConfig:
+    """Configuration for routing requests across an index's endpoints."""
+    
+    # Weight of the newest sample in each endpoint's moving average latency
+    ewma_alpha: float = 0.3
+    # Seconds between background health checks (0 disables them)
+    health_check_interval: float = 5.0
+    health_check_timeout: float = 2.0
+    # Path requested by health checks, relative to the endpoint URL
+    health_check_path: str = "/indices"
+    # Consecutive failures before an endpoint is ejected
+    unhealthy_threshold: int = 2
+    # Consecutive successful health checks before it is re-admitted
+    healthy_threshold: int = 2
+
+
+@dataclass
+class HedgingConfig:
+    """Configuration for hedged (duplicated) search requests."""
+    
+    enabled: bool = False
+    # Send a duplicate to a second replica once the first has taken longer
+    # than this percentile of recent search latencies
+    percentile: float = 95.0
+    # Maximum extra requests, as a percentage of searches
+    budget_percent: float = 5.0
+    # Number of recent latencies the percentile is computed over
+    window: int = 200
+    # Latencies to observe before hedging starts
+    min_samples: int = 20
+    # Lower bound in seconds on the hedge delay
+    min_delay: float = 0.0
+
+
+@dataclass
+class ConcurrencyLimitConfig:
+    """Configuration for the adaptive limit on outstanding backend requests."""
+    
+    enabled: bool = True
+    initial_limit: int = 32
+    min_limit: int = 4
+    max_limit: int = 256
+    # Requests waiting for a slot beyond this are rejected immediately
+    max_queue: int = 256
+    # Seconds a request may wait for a slot before it is rejected
+    queue_timeout: float = 5.0
+    # Requests slower than this many seconds shrink the limit
+    latency_threshold: float = 2.0
+    # Factor the limit is multiplied by on timeouts, overload or slow requests
+    backoff_ratio: float = 0.9
+
+
+@dataclass
+class RetryConfig:
+    """Configuration for retrying idempotent backend requests."""
+    
+    enabled: bool = True
+    # Attempts per request, including the first
+    max_attempts: int = 3
+    # Retry delays grow exponentially from base_delay up to max_delay, with
+    # each actual delay drawn uniformly below that bound
+    base_delay: float = 0.05
+    max_delay: float = 1.0
+    # Retries earned per request, and the most that can be saved up
+    budget_ratio: float = 0.2
+    budget_max_tokens: float = 10.0
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Configuration for the per-endpoint circuit breakers."""
+    
+    enabled: bool = True
+    # Consecutive failures that open an endpoint's breaker
+    failure_threshold: int = 5
+    # Seconds a breaker stays open before letting probe requests through
+    reset_timeout: float = 10.0
+    half_open_max_calls: int = 1
+
+
+@dataclass
+class TracingConfig:
+    """Configuration for request tracing."""
+    
+    enabled: bool = False
+    # Fraction of tool calls traced (0-1)
+    sample_rate: float = 1.0
+    # Where finished traces go: "log", "memory" or "opentelemetry"
+    exporter: str = "log"
+    # Spans kept per trace; further spans are counted but not exported
+    max_spans_per_trace: int = 256
 
 
 @dataclass
@@ -41,6 +216,30 @@ class ServerConfig:
     nrtsearch_connection: NRTSearchConnection
     indexes: List[IndexConfig]
     log_level: str = "INFO"
+    # Fraction of backend requests whose bodies are logged at DEBUG level,
+    # and the most bytes of each body logged
+    log_payload_sample_rate: float = 0.1
+    log_payload_max_chars: int = 1000
+    search_cache: SearchCacheConfig = field(default_factory=SearchCacheConfig)
+    metadata_cache: MetadataCacheConfig = field(default_factory=MetadataCacheConfig)
+    document_cache: DocumentCacheConfig = field(default_factory=DocumentCacheConfig)
+    snippets: SnippetConfig = field(default_factory=SnippetConfig)
+    # Maximum number of searches a search_batch call runs at once
+    batch_max_concurrency: int = 8
+    # Maximum getDoc requests a get_documents call runs at once, and the
+    # number of IDs above which it uses one ID search instead (for indexes
+    # with an id_field)
+    get_documents_max_concurrency: int = 8
+    get_documents_search_threshold: int = 20
+    # Time budget in seconds for each tool call, covering every backend
+    # attempt, retry and hedge it makes (0 disables the limit)
+    tool_timeout: float = 30.0
+    load_balancing: LoadBalancingConfig = field(default_factory=LoadBalancingConfig)
+    hedging: HedgingConfig = field(default_factory=HedgingConfig)
+    concurrency_limit: ConcurrencyLimitConfig = field(default_factory=ConcurrencyLimitConfig)
+    retry: RetryConfig = field(default_factory=RetryConfig)
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
 
 
 def load_config(config_path: Optional[str] = None) -> ServerConfig:
@@ -78,7 +277,13 @@ def load_config(config_path: Optional[str] = None) -> ServerConfig:
     connection = NRTSearchConnection(
         host=connection_data.get("host", "localhost"),
         port=connection_data.get("port", 8000),
-        use_https=connection_data.get("use_https", False)
+        use_https=connection_data.get("use_https", False),
+        timeout=connection_data.get("timeout", 30.0),
+        max_connections=connection_data.get("max_connections", 100),
+        max_keepalive_connections=connection_data.get("max_keepalive_connections", 20),
+        keepalive_expiry=connection_data.get("keepalive_expiry", 30.0),
+        http2=connection_data.get("http2", False),
+        path_prefix=connection_data.get("path_prefix", "")
     )
     
     # Parse index configurations
@@ -88,15 +293,139 @@ def load_config(config_path: Optional[str] = None) -> ServerConfig:
             name=idx_data.get("name", ""),
             description=idx_data.get("description", ""),
             fields=idx_data.get("fields", []),
-            default_search_fields=idx_data.get("default_search_fields", [])
+            default_search_fields=idx_data.get("default_search_fields", []),
+            cache_ttl=idx_data.get("cache_ttl"),
+            id_field=idx_data.get("id_field"),
+            endpoints=[
+                EndpointConfig(
+                    host=endpoint_data.get("host", connection.host),
+                    port=endpoint_data.get("port", connection.port),
+                    role=endpoint_data.get("role", "replica"),
+                    weight=endpoint_data.get("weight", 1.0)
+                )
+                for endpoint_data in idx_data.get("endpoints", [])
+            ]
         )
         indexes.append(index)
     
+    # Parse search result cache settings
+    cache_data = config_data.get("search_cache", {})
+    search_cache = SearchCacheConfig(
+        enabled=cache_data.get("enabled", True),
+        max_entries=cache_data.get("max_entries", 1024),
+        default_ttl=cache_data.get("default_ttl", 5.0)
+    )
+    
+    # Parse metadata cache settings
+    metadata_data = config_data.get("metadata_cache", {})
+    metadata_cache = MetadataCacheConfig(
+        enabled=metadata_data.get("enabled", True),
+        ttl=metadata_data.get("ttl", 300.0),
+        refresh_interval=metadata_data.get("refresh_interval", 60.0),
+        warm_on_start=metadata_data.get("warm_on_start", True)
+    )
+    
+    # Parse document cache settings
+    document_data = config_data.get("document_cache", {})
+    document_cache = DocumentCacheConfig(
+        enabled=document_data.get("enabled", True),
+        max_bytes=document_data.get("max_bytes", 64 * 1024 * 1024),
+        max_document_bytes=document_data.get("max_document_bytes", 1024 * 1024),
+        ttl=document_data.get("ttl", 60.0)
+    )
+    
+    # Parse snippet settings
+    snippet_data = config_data.get("snippets", {})
+    snippets = SnippetConfig(
+        length=snippet_data.get("length", 200),
+        count=snippet_data.get("count", 2)
+    )
+    
+    # Parse load balancing settings
+    balancing_data = config_data.get("load_balancing", {})
+    load_balancing = LoadBalancingConfig(
+        ewma_alpha=balancing_data.get("ewma_alpha", 0.3),
+        health_check_interval=balancing_data.get("health_check_interval", 5.0),
+        health_check_timeout=balancing_data.get("health_check_timeout", 2.0),
+        health_check_path=balancing_data.get("health_check_path", "/indices"),
+        unhealthy_threshold=balancing_data.get("unhealthy_threshold", 2),
+        healthy_threshold=balancing_data.get("healthy_threshold", 2)
+    )
+    
+    # Parse hedging settings
+    hedging_data = config_data.get("hedging", {})
+    hedging = HedgingConfig(
+        enabled=hedging_data.get("enabled", False),
+        percentile=hedging_data.get("percentile", 95.0),
+        budget_percent=hedging_data.get("budget_percent", 5.0),
+        window=hedging_data.get("window", 200),
+        min_samples=hedging_data.get("min_samples", 20),
+        min_delay=hedging_data.get("min_delay", 0.0)
+    )
+    
+    # Parse concurrency limit settings
+    limit_data = config_data.get("concurrency_limit", {})
+    concurrency_limit = ConcurrencyLimitConfig(
+        enabled=limit_data.get("enabled", True),
+        initial_limit=limit_data.get("initial_limit", 32),
+        min_limit=limit_data.get("min_limit", 4),
+        max_limit=limit_data.get("max_limit", 256),
+        max_queue=limit_data.get("max_queue", 256),
+        queue_timeout=limit_data.get("queue_timeout", 5.0),
+        latency_threshold=limit_data.get("latency_threshold", 2.0),
+        backoff_ratio=limit_data.get("backoff_ratio", 0.9)
+    )
+    
+    # Parse retry settings
+    retry_data = config_data.get("retry", {})
+    retry = RetryConfig(
+        enabled=retry_data.get("enabled", True),
+        max_attempts=retry_data.get("max_attempts", 3),
+        base_delay=retry_data.get("base_delay", 0.05),
+        max_delay=retry_data.get("max_delay", 1.0),
+        budget_ratio=retry_data.get("budget_ratio", 0.2),
+        budget_max_tokens=retry_data.get("budget_max_tokens", 10.0)
+    )
+    
+    # Parse circuit breaker settings
+    breaker_data = config_data.get("circuit_breaker", {})
+    circuit_breaker = CircuitBreakerConfig(
+        enabled=breaker_data.get("enabled", True),
+        failure_threshold=breaker_data.get("failure_threshold", 5),
+        reset_timeout=breaker_data.get("reset_timeout", 10.0),
+        half_open_max_calls=breaker_data.get("half_open_max_calls", 1)
+    )
+    
+    # Parse tracing settings
+    tracing_data = config_data.get("tracing", {})
+    tracing = TracingConfig(
+        enabled=tracing_data.get("enabled", False),
+        sample_rate=tracing_data.get("sample_rate", 1.0),
+        exporter=tracing_data.get("exporter", "log"),
+        max_spans_per_trace=tracing_data.get("max_spans_per_trace", 256)
+    )
+    
     # Create the server config
     return ServerConfig(
         nrtsearch_connection=connection,
         indexes=indexes,
-        log_level=config_data.get("log_level", "INFO")
+        log_level=config_data.get("log_level", "INFO"),
+        log_payload_sample_rate=config_data.get("log_payload_sample_rate", 0.1),
+        log_payload_max_chars=config_data.get("log_payload_max_chars", 1000),
+        search_cache=search_cache,
+        metadata_cache=metadata_cache,
+        document_cache=document_cache,
+        snippets=snippets,
+        batch_max_concurrency=config_data.get("batch_max_concurrency", 8),
+        get_documents_max_concurrency=config_data.get("get_documents_max_concurrency", 8),
+        get_documents_search_threshold=config_data.get("get_documents_search_threshold", 20),
+        tool_timeout=config_data.get("tool_timeout", 30.0),
+        load_balancing=load_balancing,
+        hedging=hedging,
+        concurrency_limit=concurrency_limit,
+        retry=retry,
+        circuit_breaker=circuit_breaker,
+        tracing=tracing
     )
 
 
@@ -112,7 +441,8 @@ def get_default_config() -> ServerConfig:
                 name="yelp_reviews",
                 description="Yelp reviews dataset",
                 fields=["review_id", "business_id", "stars", "text"],
-                default_search_fields=["text"]
+                default_search_fields=["text"],
+                id_field="review_id"
             )
         ]
     )
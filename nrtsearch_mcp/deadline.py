@@ -0,0 +1,83 @@
+"""
+Per-call deadlines.
+
+A tool invocation sets a deadline for everything it does. The deadline is
+kept in a context variable, so it follows the call into the tasks it starts
+(hedges, batch searches, page prefetches), and every backend attempt uses
+the remaining budget as its timeout. Nested deadlines can only shorten the
+budget, never extend it.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Absolute monotonic time by which the current call must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("nrtsearch_mcp_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call's time budget has run out."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Limit the work done inside the block to ``seconds``.
+
+    Args:
+        seconds: Time budget in seconds; None or 0 adds no limit
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current call's budget, or None if it has no deadline."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check(what: str = "request") -> Optional[float]:
+    """Ensure some budget is left before starting more work.
+
+    Args:
+        what: Description of the work, for the error message
+
+    Returns:
+        Seconds left, or None if there is no deadline
+
+    Raises:
+        DeadlineExceeded: If the budget has run out
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {what} could start")
+    return left
+
+
+@contextmanager
+def unbounded() -> Iterator[None]:
+    """Run the block without the current call's deadline.
+
+    For work shared by several calls (see SingleFlight), which each bound
+    their own wait for it instead.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
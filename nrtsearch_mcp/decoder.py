@@ -0,0 +1,159 @@
+"""
+Compiled decoding of NRTSearch hit fields.
+
+NRTSearch returns every retrieved field wrapped in a type-specific key, e.g.
+``{"fieldValue": [{"intValue": 4}]}`` (or, from some gateways, the dict-shaped
+``{"fieldValue": {"intValue": 4}}``). Rather than scanning every key of every
+value for a ``...Value`` suffix, a ``HitDecoder`` compiles one extractor per
+field from the index schema, so decoding a hit is a dict lookup per field.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# Sentinel for fields that carry no typed value
+MISSING = object()
+
+# NRTSearch field types (lower-cased) to the key holding their value
+TYPE_VALUE_KEYS = {
+    "atom": "textValue",
+    "text": "textValue",
+    "string": "textValue",
+    "int": "intValue",
+    "integer": "intValue",
+    "long": "longValue",
+    "float": "floatValue",
+    "double": "doubleValue",
+    "boolean": "booleanValue",
+    "date_time": "longValue",
+    "lat_lon": "latLngValue",
+}
+
+Extractor = Callable[[Any], Any]
+
+
+def _unwrap(values: List[Any]) -> Any:
+    """Collapse a decoded multi-value list, keeping single values scalar."""
+    if not values:
+        return MISSING
+    if len(values) == 1:
+        return values[0]
+    return values
+
+
+def scan_value(typed_value: Any) -> Any:
+    """Find the typed value in ``typed_value`` by scanning for a ``...Value`` key."""
+    if isinstance(typed_value, dict):
+        for key, value in typed_value.items():
+            if key.endswith("Value"):
+                return value
+    return MISSING
+
+
+def _compile_extractor(value_key: str) -> Extractor:
+    """Build an extractor that reads ``value_key``, scanning only as a fallback."""
+    def extract(field_value: Any) -> Any:
+        typed = field_value.get("fieldValue") if type(field_value) is dict else None
+        if type(typed) is list:
+            if len(typed) == 1:
+                value = typed[0].get(value_key, MISSING)
+                return scan_value(typed[0]) if value is MISSING else value
+            values = []
+            for item in typed:
+                value = item.get(value_key, MISSING)
+                if value is MISSING:
+                    value = scan_value(item)
+                if value is not MISSING:
+                    values.append(value)
+            return _unwrap(values)
+        if type(typed) is dict:
+            value = typed.get(value_key, MISSING)
+            return scan_value(typed) if value is MISSING else value
+        return MISSING
+
+    return extract
+
+
+def _scan_extractor(field_value: Any) -> Any:
+    """Extractor for fields with no known type."""
+    typed = field_value.get("fieldValue") if isinstance(field_value, dict) else None
+    if isinstance(typed, list):
+        return _unwrap([v for v in map(scan_value, typed) if v is not MISSING])
+    return scan_value(typed)
+
+
+class HitDecoder:
+    """Decodes hit fields using extractors compiled from an index schema.
+
+    Fields missing from the schema are scanned once, and the value key found
+    is compiled into an extractor for later hits.
+    """
+
+    def __init__(self, field_types: Optional[Dict[str, str]] = None):
+        """Initialize the decoder.
+
+        Args:
+            field_types: Field name to NRTSearch field type
+        """
+        self._extractors: Dict[str, Extractor] = {}
+        self._value_keys: Dict[str, str] = {}
+        for name, field_type in (field_types or {}).items():
+            value_key = TYPE_VALUE_KEYS.get(str(field_type).lower())
+            if value_key is not None:
+                self._compile(name, value_key)
+
+    @classmethod
+    def from_field_info(cls, fields: List[Dict[str, Any]]) -> "HitDecoder":
+        """Build a decoder from the output of NRTSearchClient.get_field_info."""
+        return cls({
+            field["name"]: field.get("type", "")
+            for field in fields
+            if isinstance(field, dict) and "name" in field
+        })
+
+    def _compile(self, name: str, value_key: str) -> Extractor:
+        extractor = _compile_extractor(value_key)
+        self._extractors[name] = extractor
+        self._value_keys[name] = value_key
+        return extractor
+
+    def _learn(self, name: str, field_value: Any) -> Extractor:
+        """Compile an extractor for a field from the first value seen."""
+        typed = field_value.get("fieldValue") if isinstance(field_value, dict) else None
+        sample = typed[0] if isinstance(typed, list) and typed else typed
+        if isinstance(sample, dict):
+            for key in sample:
+                if key.endswith("Value"):
+                    return self._compile(name, key)
+        return _scan_extractor
+
+    def decode_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode a hit's ``fields`` object.
+
+        Args:
+            fields: Field name to raw field value, as returned by NRTSearch
+
+        Returns:
+            Field name to plain value (a list for multi-valued fields). Fields
+            without a typed value are omitted.
+        """
+        extractors = self._extractors
+        value_keys = self._value_keys
+        decoded = {}
+        for name, field_value in fields.items():
+            # Fast path: a single value under the compiled key
+            value_key = value_keys.get(name)
+            if value_key is not None:
+                typed = field_value.get("fieldValue")
+                if type(typed) is list and len(typed) == 1:
+                    typed = typed[0]
+                if type(typed) is dict and value_key in typed:
+                    decoded[name] = typed[value_key]
+                    continue
+
+            extractor = extractors.get(name)
+            if extractor is None:
+                extractor = self._learn(name, field_value)
+            value = extractor(field_value)
+            if value is not MISSING:
+                decoded[name] = value
+        return decoded
@@ -0,0 +1,107 @@
+"""
+Hedged search requests.
+
+When a search has been outstanding for longer than a recent latency
+percentile, a duplicate is sent to a second replica and whichever answers
+first is used. A budget caps the extra load to a percentage of searches, so
+hedging cannot multiply traffic to an already overloaded cluster.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from nrtsearch_mcp.config import ServerConfig
+
+
+class HedgePolicy:
+    """Decides when to hedge a search and keeps hedging statistics."""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget_percent: float = 5.0,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.0
+    ):
+        """Initialize the policy.
+
+        Args:
+            percentile: Latency percentile (0-100) after which a search is hedged
+            budget_percent: Maximum hedges as a percentage of searches
+            window: Number of recent latencies kept
+            min_samples: Latencies to observe before hedging starts
+            min_delay: Lower bound on the hedge delay in seconds
+        """
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+        self.min_samples = max(1, min_samples)
+        self.min_delay = min_delay
+        self._latencies: Deque[float] = deque(maxlen=max(1, window))
+        self._delay: Optional[float] = None
+        self._dirty = False
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["HedgePolicy"]:
+        """Build a policy from the server configuration.
+
+        Returns:
+            The policy, or None if hedging is disabled
+        """
+        hedging = config.hedging
+        if not hedging.enabled:
+            return None
+        return cls(
+            percentile=hedging.percentile,
+            budget_percent=hedging.budget_percent,
+            window=hedging.window,
+            min_samples=hedging.min_samples,
+            min_delay=hedging.min_delay
+        )
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a completed search attempt in seconds."""
+        self._latencies.append(latency)
+        self._dirty = True
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough latencies are known."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        if self._dirty:
+            ordered = sorted(self._latencies)
+            rank = max(1, math.ceil(self.percentile / 100.0 * len(ordered)))
+            self._delay = max(self.min_delay, ordered[rank - 1])
+            self._dirty = False
+        return self._delay
+
+    def start(self) -> None:
+        """Count a search that may be hedged."""
+        self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """Take one hedge from the budget, if any is left."""
+        if (self.hedges + 1) * 100.0 > self.budget_percent * self.requests:
+            self.budget_exhausted += 1
+            return False
+        self.hedges += 1
+        return True
+
+    def record_win(self) -> None:
+        """Count a hedge that answered before the original request."""
+        self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_exhausted": self.budget_exhausted,
+            "delay_ms": None if delay is None else delay * 1000.0,
+        }
@@ -0,0 +1,169 @@
+"""
+Compact, columnar representation of decoded search hits.
+
+A raw NRTSearch response holds every hit as a dict of wrapped field values
+(``{"fieldValue": [{"textValue": ...}]}``), roughly five containers per field
+per hit. ``HitTable`` decodes a response once into one list per field plus
+an array of scores, so a cached or rendered result costs one list slot per
+value instead. Rendering, the result cache and structured output all read
+from the table.
+
+A search can ask for highlight fragments of some fields instead of their
+stored values (see ``Highlight``); the fragments then fill those fields'
+columns, so consumers need not tell a preview from a stored value. Where the
+backend returned the stored value instead, snippets are cut from it locally.
+"""
+
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from nrtsearch_mcp import snippets
+from nrtsearch_mcp.decoder import MISSING, HitDecoder
+
+# Placed between the fragments of a field joined into one preview
+FRAGMENT_SEPARATOR = " ... "
+
+# NRTSearch's default markup around matched terms in fragments
+_HIGHLIGHT_TAGS = re.compile(r"</?em>")
+
+
+@dataclass(frozen=True)
+class Highlight:
+    """Highlight fragments requested in place of some fields' stored values.
+
+    Hashable, so it can be part of a result cache key.
+    """
+
+    fields: Tuple[str, ...]
+    # Characters per fragment
+    fragment_chars: int = 160
+    # Fragments per field
+    max_fragments: int = 1
+
+    def to_request(self) -> Dict[str, Any]:
+        """Build the ``highlight`` object of an NRTSearch search request."""
+        return {
+            "fields": list(self.fields),
+            "settings": {
+                "fragmentSize": self.fragment_chars,
+                "maxNumberOfFragments": self.max_fragments
+            }
+        }
+
+
+def _fragments(hit: Dict[str, Any], name: str) -> Optional[str]:
+    """Join a hit's highlight fragments for one field, if it has any."""
+    fragments = hit.get("highlights", {}).get(name, {}).get("fragments")
+    if not fragments:
+        return None
+    return _HIGHLIGHT_TAGS.sub("", FRAGMENT_SEPARATOR.join(fragments))
+
+
+def missing_fragments(result: Dict[str, Any], highlight: Highlight) -> Dict[int, List[str]]:
+    """Find the highlighted fields each hit of a search response has no fragments for.
+
+    The backend only returns fragments where the query matched the field;
+    hits matched on other fields need the stored value for a preview.
+
+    Returns:
+        The names of those fields by hit position, for hits missing any
+    """
+    missing = {}
+    for i, hit in enumerate(result.get("hits", [])):
+        names = [name for name in highlight.fields if _fragments(hit, name) is None]
+        if names:
+            missing[i] = names
+    return missing
+
+
+class HitTable:
+    """Decoded search hits stored column by column.
+
+    ``columns`` maps each field name (in first-seen order) to one value per
+    hit, with ``MISSING`` for hits that do not carry the field. Tables may be
+    shared through the result cache and must be treated as read-only.
+    """
+
+    __slots__ = ("total_hits", "scores", "columns", "search_state")
+
+    def __init__(
+        self,
+        total_hits: int = 0,
+        scores: Optional[array] = None,
+        columns: Optional[Dict[str, List[Any]]] = None,
+        search_state: Optional[Dict[str, Any]] = None
+    ):
+        self.total_hits = total_hits
+        self.scores = scores if scores is not None else array("d")
+        self.columns: Dict[str, List[Any]] = columns if columns is not None else {}
+        self.search_state = search_state
+
+    @classmethod
+    def from_response(
+        cls,
+        result: Dict[str, Any],
+        decoder: HitDecoder,
+        highlight: Optional[Highlight] = None,
+        query: str = ""
+    ) -> "HitTable":
+        """Decode a raw search response.
+
+        Args:
+            result: Search response from NRTSearchClient.search
+            decoder: Hit decoder for the searched index
+            highlight: Highlighting wanted for the search. Highlighted fields
+                hold the backend's fragments, or snippets of the stored
+                text around the query terms when it was retrieved instead.
+            query: The query, for local snippets
+
+        Returns:
+            The decoded table; the raw response is not referenced
+        """
+        hits = result.get("hits", [])
+        scores = array("d", [hit.get("score", 0) or 0.0 for hit in hits])
+        columns: Dict[str, List[Any]] = {}
+        for i, hit in enumerate(hits):
+            for name, value in decoder.decode_fields(hit.get("fields", {})).items():
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = [MISSING] * len(hits)
+                column[i] = value
+        if highlight is not None:
+            terms = snippets.query_terms(query)
+            for name in highlight.fields:
+                column = columns.get(name) or [MISSING] * len(hits)
+                for i, hit in enumerate(hits):
+                    value = column[i]
+                    if isinstance(value, str):
+                        column[i] = snippets.snippet(
+                            value, terms, highlight.fragment_chars, highlight.max_fragments,
+                            FRAGMENT_SEPARATOR
+                        )
+                    elif value is MISSING:
+                        column[i] = _fragments(hit, name) or MISSING
+                if name not in columns and any(value is not MISSING for value in column):
+                    columns[name] = column
+        return cls(
+            total_hits=result.get("totalHits", {}).get("value", 0),
+            scores=scores,
+            columns=columns,
+            search_state=result.get("searchState")
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def fields(self, i: int) -> Dict[str, Any]:
+        """Get the decoded fields of hit ``i``, omitting missing ones."""
+        return {
+            name: column[i]
+            for name, column in self.columns.items()
+            if column[i] is not MISSING
+        }
+
+    def rows(self) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Iterate over (score, fields) pairs in rank order."""
+        for i, score in enumerate(self.scores):
+            yield score, self.fields(i)
@@ -0,0 +1,96 @@
+"""
+Pluggable JSON encoding and decoding.
+
+Uses orjson or msgspec when installed (``pip install "nrtsearch-mcp[fast-json]"``)
+and falls back to the standard library. Decoding works directly on the
+response bytes, and encoding produces bytes ready to send.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """A named pair of JSON decode/encode functions."""
+
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _available_codecs() -> Dict[str, JSONCodec]:
+    codecs = {"json": JSONCodec("json", json.loads, _stdlib_dumps)}
+
+    try:
+        import msgspec  # type: ignore
+        codecs["msgspec"] = JSONCodec("msgspec", msgspec.json.decode, msgspec.json.encode)
+    except ImportError:
+        pass
+
+    try:
+        import orjson  # type: ignore
+        codecs["orjson"] = JSONCodec("orjson", orjson.loads, orjson.dumps)
+    except ImportError:
+        pass
+
+    return codecs
+
+
+AVAILABLE_CODECS = _available_codecs()
+
+# Preferred backends, fastest first
+_PREFERENCE = ("orjson", "msgspec", "json")
+
+_codec = next(AVAILABLE_CODECS[name] for name in _PREFERENCE if name in AVAILABLE_CODECS)
+
+
+def get_codec() -> JSONCodec:
+    """Get the JSON codec currently in use."""
+    return _codec
+
+
+def use_codec(name: str) -> JSONCodec:
+    """Switch the JSON backend.
+
+    Args:
+        name: One of "orjson", "msgspec" or "json"
+
+    Returns:
+        The codec now in use
+
+    Raises:
+        ValueError: If the backend is not installed
+    """
+    global _codec
+    if name not in AVAILABLE_CODECS:
+        raise ValueError(
+            f"JSON backend '{name}' is not available "
+            f"(installed: {', '.join(sorted(AVAILABLE_CODECS))})"
+        )
+    _codec = AVAILABLE_CODECS[name]
+    logger.debug("Using JSON backend %s", name)
+    return _codec
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes (preferred) or text."""
+    return _codec.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON bytes."""
+    return _codec.dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode an object as compact JSON text."""
+    return _codec.dumps(obj).decode("utf-8")
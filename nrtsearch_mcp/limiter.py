@@ -0,0 +1,172 @@
+"""
+Adaptive concurrency limiting for backend requests.
+
+The limiter caps the number of requests outstanding to NRTSearch and adjusts
+the cap with AIMD: it grows by about one per round trip while requests
+succeed quickly and the cap is in use, and shrinks multiplicatively when a
+request times out, is rejected as overloaded, or is slower than the latency
+threshold. Requests over the cap wait in a bounded queue with one lane per
+priority, so cheap metadata lookups are admitted before queued searches.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from nrtsearch_mcp.config import ServerConfig
+
+# Priority lanes, served in this order
+HIGH_PRIORITY = 0
+LOW_PRIORITY = 1
+
+
+class LimiterRejected(Exception):
+    """Raised when a request cannot be admitted in time."""
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded, prioritised wait queue."""
+
+    def __init__(
+        self,
+        initial_limit: int = 32,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        max_queue: int = 256,
+        queue_timeout: float = 5.0,
+        latency_threshold: float = 2.0,
+        backoff_ratio: float = 0.9
+    ):
+        """Initialize the limiter.
+
+        Args:
+            initial_limit: Concurrent requests allowed at start
+            min_limit: Lowest the limit can shrink to
+            max_limit: Highest the limit can grow to
+            max_queue: Maximum requests waiting for a slot; more are rejected
+            queue_timeout: Seconds a request may wait before it is rejected
+            latency_threshold: Requests slower than this many seconds shrink the limit
+            backoff_ratio: Factor the limit is multiplied by when it shrinks
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+        self.inflight = 0
+        self._lanes: List[Deque["asyncio.Future[None]"]] = [deque(), deque()]
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.drops = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["AdaptiveLimiter"]:
+        """Build a limiter from the server configuration.
+
+        Returns:
+            The limiter, or None if concurrency limiting is disabled
+        """
+        limits = config.concurrency_limit
+        if not limits.enabled:
+            return None
+        return cls(
+            initial_limit=limits.initial_limit,
+            min_limit=limits.min_limit,
+            max_limit=limits.max_limit,
+            max_queue=limits.max_queue,
+            queue_timeout=limits.queue_timeout,
+            latency_threshold=limits.latency_threshold,
+            backoff_ratio=limits.backoff_ratio
+        )
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(len(lane) for lane in self._lanes)
+
+    async def acquire(self, priority: int = LOW_PRIORITY, timeout: Optional[float] = None) -> None:
+        """Wait for a slot.
+
+        Args:
+            priority: HIGH_PRIORITY or LOW_PRIORITY
+            timeout: Seconds to wait at most, if shorter than the queue timeout
+
+        Raises:
+            LimiterRejected: If the queue is full or the wait times out
+        """
+        if self.inflight < int(self.limit) and not self.waiting:
+            self.inflight += 1
+            self.admitted += 1
+            return
+
+        if self.waiting >= self.max_queue:
+            self.rejected_full += 1
+            raise LimiterRejected(
+                f"NRTSearch request queue is full ({self.max_queue} waiting)"
+            )
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        lane = self._lanes[priority]
+        lane.append(waiter)
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            wait = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+            await asyncio.wait({waiter}, timeout=max(0.0, wait))
+        except BaseException:
+            # Cancelled while waiting; give back a slot handed over meanwhile
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+                lane.remove(waiter)
+            raise
+
+        if not waiter.done():
+            waiter.cancel()
+            lane.remove(waiter)
+            self.rejected_timeout += 1
+            raise LimiterRejected(
+                f"Timed out after {time.monotonic() - started:.2f}s waiting for an "
+                f"NRTSearch request slot ({self.inflight} in flight)"
+            )
+        self.admitted += 1
+
+    def release(self, latency: Optional[float] = None, dropped: bool = False) -> None:
+        """Return a slot and adjust the limit.
+
+        Args:
+            latency: Seconds the request took, if it completed
+            dropped: Whether the backend timed out or reported overload
+        """
+        if dropped or (latency is not None and latency > self.latency_threshold):
+            self.drops += 1
+            self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+        elif latency is not None and self.inflight * 2 >= self.limit:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+        self.inflight -= 1
+        # Hand free slots straight to waiters, highest priority first
+        for lane in self._lanes:
+            while lane and self.inflight < int(self.limit):
+                waiter = lane.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    self.inflight += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "drops": self.drops,
+        }
@@ -0,0 +1,54 @@
+"""
+Cheap debug logging of request and response bodies.
+
+Bodies are logged from the bytes already on the wire, and only rendered
+when a log record is actually emitted: a ``BodyPreview`` is passed to the
+logger as an argument and decodes at most ``max_chars`` bytes in its
+``__str__``. Callers still guard with ``logger.isEnabledFor`` so that,
+with DEBUG off, logging a request costs one level check.
+"""
+
+import random
+from typing import Optional
+
+
+class BodyPreview:
+    """Lazily rendered, size-capped view of a request or response body."""
+
+    __slots__ = ("body", "max_chars")
+
+    def __init__(self, body: Optional[bytes], max_chars: int = 1000):
+        self.body = body
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        if not self.body:
+            return "<empty>"
+        text = self.body[:self.max_chars].decode("utf-8", errors="replace")
+        if len(self.body) > self.max_chars:
+            return f"{text}... ({len(self.body)} bytes)"
+        return text
+
+
+class PayloadSampler:
+    """Decides which requests get their bodies logged, and how much of them."""
+
+    def __init__(self, rate: float = 0.1, max_chars: int = 1000, rng: Optional[random.Random] = None):
+        """Initialize the sampler.
+
+        Args:
+            rate: Fraction of requests whose bodies are logged (0-1)
+            max_chars: Most bytes of each body logged
+            rng: Random source (for tests)
+        """
+        self.rate = rate
+        self.max_chars = max_chars
+        self._rng = rng or random.Random()
+
+    def sample(self) -> bool:
+        if self.rate >= 1.0:
+            return True
+        return self.rate > 0.0 and self._rng.random() < self.rate
+
+    def preview(self, body: Optional[bytes]) -> BodyPreview:
+        return BodyPreview(body, self.max_chars)
@@ -0,0 +1,344 @@
+"""
+Lightweight Prometheus-style metrics.
+
+Hot-path metrics (tool and backend latencies, bytes, errors) are plain
+counters and fixed-bucket histograms updated in place, costing a dict lookup
+and a bisect per observation. Everything else (caches, endpoints, breakers,
+limiter, retries, hedges) already keeps its own statistics and is read only
+when metrics are scraped.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from nrtsearch_mcp import tracing
+from nrtsearch_mcp.breaker import STATE_VALUES
+
+if TYPE_CHECKING:
+    from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow searches
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.values[labelvalues] = self.values.get(labelvalues, 0.0) + amount
+
+    def get(self, *labelvalues: str) -> float:
+        return self.values.get(labelvalues, 0.0)
+
+    def clear(self) -> None:
+        self.values.clear()
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self.values[labelvalues] = value
+
+
+class Histogram:
+    """Fixed-bucket histogram per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (+Inf last), sum, count]
+        self.values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        entry = self.values.get(labelvalues)
+        if entry is None:
+            entry = self.values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        entry = self.values.get(labelvalues)
+        return entry[2] if entry else 0
+
+    def quantile(self, q: float, *labelvalues: str) -> Optional[float]:
+        """Estimate a quantile (0-1) by interpolating within its bucket."""
+        entry = self.values.get(labelvalues)
+        if not entry or not entry[2]:
+            return None
+        counts: List[int] = entry[0]
+        total: int = entry[2]
+        rank = q * total
+        seen = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if bound == float("inf"):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = bound
+        return lower
+
+    def clear(self) -> None:
+        self.values.clear()
+
+    def render(self) -> List[str]:
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, (bucket_counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} "
+                    f"{cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+TOOL_DURATION = Histogram(
+    "nrtsearch_mcp_tool_duration_seconds", "Time spent in MCP tool calls", ["tool"]
+)
+TOOL_INFLIGHT = Gauge("nrtsearch_mcp_tool_inflight", "MCP tool calls in progress", ["tool"])
+TOOL_ERRORS = Counter(
+    "nrtsearch_mcp_tool_errors_total", "MCP tool calls that failed, by error class", ["tool", "error"]
+)
+BACKEND_DURATION = Histogram(
+    "nrtsearch_mcp_backend_request_duration_seconds",
+    "Time spent in NRTSearch HTTP requests",
+    ["endpoint", "path"]
+)
+BACKEND_ERRORS = Counter(
+    "nrtsearch_mcp_backend_errors_total",
+    "NRTSearch HTTP requests that failed, by error class",
+    ["endpoint", "error"]
+)
+BACKEND_BYTES_SENT = Counter(
+    "nrtsearch_mcp_backend_bytes_sent_total", "Request body bytes sent to NRTSearch", ["endpoint"]
+)
+BACKEND_BYTES_RECEIVED = Counter(
+    "nrtsearch_mcp_backend_bytes_received_total",
+    "Response body bytes received from NRTSearch",
+    ["endpoint"]
+)
+
+METRICS = (
+    TOOL_DURATION,
+    TOOL_INFLIGHT,
+    TOOL_ERRORS,
+    BACKEND_DURATION,
+    BACKEND_ERRORS,
+    BACKEND_BYTES_SENT,
+    BACKEND_BYTES_RECEIVED,
+)
+
+
+def reset() -> None:
+    """Clear every hot-path metric (for tests)."""
+    for metric in METRICS:
+        metric.clear()
+
+
+@contextmanager
+def track_tool(name: str) -> Iterator[None]:
+    """Record the latency, concurrency and errors of a tool call."""
+    TOOL_INFLIGHT.inc(name)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        TOOL_ERRORS.inc(name, type(e).__name__)
+        raise
+    finally:
+        TOOL_INFLIGHT.dec(name)
+        TOOL_DURATION.observe(time.perf_counter() - started, name)
+
+
+def path_label(path: str) -> str:
+    """Collapse index names out of a request path to keep label cardinality low."""
+    if path.startswith("/indices/"):
+        return "/indices/{index}/fields" if path.endswith("/fields") else "/indices/{index}"
+    return path
+
+
+def _hit_rate(stats: Dict[str, Any]) -> float:
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    return stats.get("hits", 0) / lookups if lookups else 0.0
+
+
+def server_stats(client: "NRTSearchClient") -> Dict[str, Any]:
+    """Collect a snapshot of tool metrics and client statistics."""
+    tools = {}
+    for (tool,), (_, total, count) in TOOL_DURATION.values.items():
+        tools[tool] = {
+            "calls": count,
+            "inflight": int(TOOL_INFLIGHT.get(tool)),
+            "errors": int(sum(v for (t, _), v in TOOL_ERRORS.values.items() if t == tool)),
+            "mean_ms": total / count * 1000.0 if count else 0.0,
+            "p50_ms": (TOOL_DURATION.quantile(0.5, tool) or 0.0) * 1000.0,
+            "p99_ms": (TOOL_DURATION.quantile(0.99, tool) or 0.0) * 1000.0,
+        }
+
+    stats = client.stats()
+    for cache in ("search_cache", "metadata_cache", "document_cache"):
+        if stats.get(cache) is not None:
+            stats[cache]["hit_rate"] = _hit_rate(stats[cache])
+    stats["tools"] = tools
+    tracer = tracing.get_tracer()
+    if tracer is not None:
+        stats["tracing"] = tracer.stats()
+    stats["backend_errors"] = {
+        f"{endpoint} {error}": int(value)
+        for (endpoint, error), value in BACKEND_ERRORS.values.items()
+    }
+    return stats
+
+
+def _client_lines(client: "NRTSearchClient") -> List[str]:
+    """Render the statistics kept by the client and its components."""
+    stats = client.stats()
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help: str, samples: List[Tuple[Dict[str, Any], float]]) -> None:
+        if not samples:
+            return
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+
+    endpoints = stats["endpoints"]
+    metric("nrtsearch_mcp_backend_inflight", "gauge", "NRTSearch requests in progress",
+           [({"endpoint": e["url"]}, e["inflight"]) for e in endpoints])
+    metric("nrtsearch_mcp_endpoint_healthy", "gauge", "Whether the endpoint is in rotation",
+           [({"endpoint": e["url"], "role": e["role"]}, int(e["healthy"])) for e in endpoints])
+    metric("nrtsearch_mcp_endpoint_latency_ewma_seconds", "gauge", "Moving average request latency",
+           [({"endpoint": e["url"]}, e["ewma_ms"] / 1000.0) for e in endpoints if e["ewma_ms"] is not None])
+    metric("nrtsearch_mcp_endpoint_ejections_total", "counter", "Times the endpoint was ejected",
+           [({"endpoint": e["url"]}, e["ejections"]) for e in endpoints])
+    breakers = [e for e in endpoints if e["breaker"] is not None]
+    metric("nrtsearch_mcp_circuit_breaker_state", "gauge",
+           "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+           [({"endpoint": e["url"]}, STATE_VALUES[e["breaker"]["state"]]) for e in breakers])
+    metric("nrtsearch_mcp_circuit_breaker_opened_total", "counter", "Times the breaker opened",
+           [({"endpoint": e["url"]}, e["breaker"]["opened"]) for e in breakers])
+    metric("nrtsearch_mcp_circuit_breaker_rejected_total", "counter", "Requests refused by an open breaker",
+           [({"endpoint": e["url"]}, e["breaker"]["rejected"]) for e in breakers])
+
+    # One family per statistic, with a sample per cache
+    caches = [
+        ({"cache": cache}, stats[cache])
+        for cache in ("search_cache", "metadata_cache", "document_cache")
+        if stats.get(cache) is not None
+    ]
+    metric("nrtsearch_mcp_cache_hits_total", "counter", "Cache hits",
+           [(labels, c["hits"]) for labels, c in caches])
+    metric("nrtsearch_mcp_cache_misses_total", "counter", "Cache misses",
+           [(labels, c["misses"]) for labels, c in caches])
+    metric("nrtsearch_mcp_cache_entries", "gauge", "Cached entries",
+           [(labels, c["size"]) for labels, c in caches])
+    metric("nrtsearch_mcp_cache_hit_ratio", "gauge", "Cache hit ratio since start",
+           [(labels, _hit_rate(c)) for labels, c in caches])
+    metric("nrtsearch_mcp_cache_bytes", "gauge", "Estimated size of cached entries",
+           [(labels, c["bytes"]) for labels, c in caches if "bytes" in c])
+
+    metric("nrtsearch_mcp_coalesced_requests_total", "counter",
+           "Requests that shared an identical in-flight request",
+           [({}, stats["singleflight"]["coalesced"])])
+
+    limiter = stats.get("limiter")
+    if limiter is not None:
+        metric("nrtsearch_mcp_concurrency_limit", "gauge", "Current adaptive concurrency limit",
+               [({}, limiter["limit"])])
+        metric("nrtsearch_mcp_concurrency_waiting", "gauge", "Requests waiting for a slot",
+               [({}, limiter["waiting"])])
+        metric("nrtsearch_mcp_concurrency_rejected_total", "counter", "Requests rejected by the limiter",
+               [({"reason": "queue_full"}, limiter["rejected_full"]),
+                ({"reason": "queue_timeout"}, limiter["rejected_timeout"])])
+
+    retry = stats.get("retry")
+    if retry is not None:
+        metric("nrtsearch_mcp_retries_total", "counter", "Backend requests retried",
+               [({}, retry["retries"])])
+        metric("nrtsearch_mcp_retry_budget_exhausted_total", "counter",
+               "Retries skipped because the budget was spent", [({}, retry["budget_exhausted"])])
+
+    hedging = stats.get("hedging")
+    if hedging is not None:
+        metric("nrtsearch_mcp_hedges_total", "counter", "Hedged search requests sent",
+               [({}, hedging["hedges"])])
+        metric("nrtsearch_mcp_hedge_wins_total", "counter", "Hedges that answered first",
+               [({}, hedging["hedge_wins"])])
+    return lines
+
+
+def render(client: Optional["NRTSearchClient"] = None) -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    if client is not None:
+        lines.extend(_client_lines(client))
+    return "\n".join(lines) + "\n"
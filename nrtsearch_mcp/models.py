@@ -0,0 +1,79 @@
+"""
+Structured result models for the MCP tools.
+
+These are returned (as JSON) when a tool is called with ``output_mode="json"``,
+so that clients can post-process results without parsing text.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    score: float
+    fields: Dict[str, Any]
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total_hits: int
+    hits: List[SearchHit]
+    # Number of hits left out to stay within the output budget
+    omitted_hits: int = 0
+    next_cursor: Optional[str] = None
+
+
+class BatchEntry(BaseModel):
+    query: str
+    result: Optional[SearchResponse] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchEntry]
+
+
+class Document(BaseModel):
+    index: str
+    doc_id: str
+    fields: Dict[str, Any]
+
+
+class DocumentBatch(BaseModel):
+    index: str
+    requested: int
+    found: int
+    # IDs with no document in the index, and IDs that could not be fetched
+    missing: List[str]
+    failed: Dict[str, str] = {}
+    documents: List[Document]
+    # Number of documents left out to stay within the output budget
+    omitted_documents: int = 0
+
+
+class IndexList(BaseModel):
+    indexes: List[str]
+
+
+class IndexInfo(BaseModel):
+    index: str
+    settings: Dict[str, Any]
+    status: Dict[str, Any]
+
+
+class FieldDefinition(BaseModel):
+    name: str
+    type: str
+    properties: Dict[str, Any] = {}
+
+
+class FieldList(BaseModel):
+    index: str
+    fields: List[FieldDefinition]
+
+
+class ErrorResult(BaseModel):
+    error: str
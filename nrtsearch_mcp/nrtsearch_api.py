@@ -4,29 +4,311 @@ NRTSearch API client implementation.
 This module provides a client interface to interact with the NRTSearch server.
 """
 
-import json
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Union
 
 import httpx
 
-from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.balancer import PRIMARY, REPLICA, Endpoint, LoadBalancer
+from nrtsearch_mcp.breaker import CircuitOpenError
+from nrtsearch_mcp.cache import DocumentCache, MetadataCache, SearchResultCache, make_search_key
+from nrtsearch_mcp.config import IndexConfig, NRTSearchConnection, ServerConfig
+from nrtsearch_mcp import deadline, jsoncodec, metrics, tracing
+from nrtsearch_mcp.decoder import MISSING, HitDecoder, scan_value
+from nrtsearch_mcp.hedging import HedgePolicy
+from nrtsearch_mcp.hits import Highlight, HitTable, missing_fragments
+from nrtsearch_mcp.limiter import HIGH_PRIORITY, LOW_PRIORITY, AdaptiveLimiter
+from nrtsearch_mcp.logpreview import PayloadSampler
+from nrtsearch_mcp.retry import RetryPolicy
+from nrtsearch_mcp.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 support in httpx needs the optional h2 package (``httpx[http2]``)
+try:
+    import h2  # type: ignore  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Read-only request paths that replicas can answer
+_REPLICA_PATHS = frozenset({"/search", "/getDoc"})
+
+# POST requests that only read, and so are safe to retry
+_IDEMPOTENT_POSTS = frozenset({"/search", "/getDoc"})
+
+# Backend status codes that signal overload to the concurrency limiter
+_OVERLOAD_STATUS = frozenset({429, 503})
+
+
+def _id_value(fields: Dict[str, Any], id_field: str) -> Optional[str]:
+    """Get a hit's document ID from its raw ``fields``.
+
+    Accepts both the list-shaped and the dict-shaped ``fieldValue``.
+    """
+    field_value = fields.get(id_field)
+    typed = field_value.get("fieldValue") if isinstance(field_value, dict) else None
+    if isinstance(typed, list):
+        typed = typed[0] if typed else None
+    value = scan_value(typed)
+    return None if value is MISSING else str(value)
+
+
+def _with_fields(
+    retrieve_fields: Optional[List[str]],
+    highlight: Optional[Highlight]
+) -> Optional[List[str]]:
+    """Add the highlighted fields to the retrieved ones, to fetch them in full."""
+    if highlight is None or retrieve_fields is None:
+        return retrieve_fields
+    return retrieve_fields + [name for name in highlight.fields if name not in retrieve_fields]
+
 
 class NRTSearchClient:
     """Client for interacting with the NRTSearch server."""
     
-    def __init__(self, connection: NRTSearchConnection):
+    def __init__(
+        self,
+        connection: NRTSearchConnection,
+        result_cache: Optional[SearchResultCache] = None,
+        batch_max_concurrency: int = 8,
+        metadata_cache: Optional[MetadataCache] = None,
+        known_indexes: Optional[List[str]] = None,
+        balancer: Optional[LoadBalancer] = None,
+        hedging: Optional[HedgePolicy] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        payload_sampler: Optional[PayloadSampler] = None,
+        index_configs: Optional[List[IndexConfig]] = None,
+        get_documents_max_concurrency: int = 8,
+        get_documents_search_threshold: int = 20,
+        document_cache: Optional[DocumentCache] = None
+    ):
         """Initialize the NRTSearch client.
         
         Args:
             connection: Connection configuration for the NRTSearch server
+            result_cache: Optional cache for search results
+            batch_max_concurrency: Maximum concurrent searches in search_batch
+            metadata_cache: Optional cache for index listings, info and schemas
+            known_indexes: Indexes whose metadata is warmed on start
+            balancer: Routes requests across the nodes serving each index
+                (default: every request goes to the connection's host)
+            hedging: Optional policy for duplicating slow searches to a
+                second replica
+            limiter: Optional adaptive limit on outstanding backend requests
+            retry: Optional retry policy for idempotent requests
+            payload_sampler: Which request and response bodies are logged
+                at DEBUG level (default: 10%, capped at 1000 bytes)
+            index_configs: Configuration of the known indexes (fields, ID field)
+            get_documents_max_concurrency: Maximum concurrent getDoc requests
+                in get_documents
+            get_documents_search_threshold: Number of IDs above which
+                get_documents uses one ID search instead of getDoc requests
+            document_cache: Optional cache of documents by ID, also filled
+                from search hits that carry every configured field
         """
         self.connection = connection
         self.base_url = connection.url
+        self.result_cache = result_cache
+        self.batch_max_concurrency = batch_max_concurrency
+        self.metadata_cache = metadata_cache
+        self.known_indexes = list(known_indexes or [])
+        self.balancer = balancer or LoadBalancer.single(connection.url)
+        self.hedging = hedging
+        self.limiter = limiter
+        self.retry = retry
+        self.payload_sampler = payload_sampler or PayloadSampler()
+        self.index_configs = {index.name: index for index in index_configs or []}
+        self.get_documents_max_concurrency = get_documents_max_concurrency
+        self.get_documents_search_threshold = get_documents_search_threshold
+        self.document_cache = document_cache
+        self._http: Optional[httpx.AsyncClient] = None
+        # Concurrent identical read requests share one backend call
+        self._inflight = SingleFlight()
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self._health_task: Optional["asyncio.Task[None]"] = None
+        self._background: "Set[asyncio.Task[Any]]" = set()
+        self._decoders: Dict[str, HitDecoder] = {}
+        # Indexes whose searches failed when asking for highlights
+        self._highlight_rejected: Set[str] = set()
+        
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "NRTSearchClient":
+        """Create a client with the features enabled in the server configuration.
+        
+        Args:
+            config: Server configuration
+            
+        Returns:
+            Configured client (not yet started)
+        """
+        return cls(
+            config.nrtsearch_connection,
+            result_cache=SearchResultCache.from_config(config),
+            batch_max_concurrency=config.batch_max_concurrency,
+            metadata_cache=MetadataCache.from_config(config),
+            known_indexes=[index.name for index in config.indexes],
+            balancer=LoadBalancer.from_config(config),
+            hedging=HedgePolicy.from_config(config),
+            limiter=AdaptiveLimiter.from_config(config),
+            retry=RetryPolicy.from_config(config),
+            payload_sampler=PayloadSampler(
+                config.log_payload_sample_rate, config.log_payload_max_chars
+            ),
+            index_configs=config.indexes,
+            get_documents_max_concurrency=config.get_documents_max_concurrency,
+            get_documents_search_threshold=config.get_documents_search_threshold,
+            document_cache=DocumentCache.from_config(config)
+        )
+        
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client used for all requests."""
+        http2 = self.connection.http2
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed; "
+                "falling back to HTTP/1.1"
+            )
+            http2 = False
+            
+        limits = httpx.Limits(
+            max_connections=self.connection.max_connections,
+            max_keepalive_connections=self.connection.max_keepalive_connections,
+            keepalive_expiry=self.connection.keepalive_expiry
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=self.connection.timeout,
+            http2=http2
+        )
+        
+    @property
+    def is_started(self) -> bool:
+        """Whether the pooled HTTP client is open."""
+        return self._http is not None
+        
+    async def start(self) -> None:
+        """Open the pooled HTTP client and start background tasks.
+        
+        Background tasks refresh cached metadata and, when an index is served
+        by several endpoints, health-check them.
+        
+        Calling this is optional: the first request opens the HTTP client
+        lazily. Servers should still call it at startup so that connection
+        setup and metadata warming do not happen on the first tool call.
+        """
+        if self._http is None:
+            self._http = self._build_http_client()
+            
+        balancer = self.balancer
+        if (
+            self._health_task is None
+            and balancer.health_check_interval > 0
+            and len(balancer.endpoints()) > 1
+        ):
+            self._health_task = asyncio.ensure_future(
+                self._health_check_loop(balancer.health_check_interval)
+            )
+            
+        cache = self.metadata_cache
+        if cache is not None and self._refresh_task is None:
+            if cache.warm_on_start:
+                await self.warm_metadata()
+            if cache.refresh_interval > 0:
+                self._refresh_task = asyncio.ensure_future(
+                    self._refresh_metadata_loop(cache.refresh_interval)
+                )
+            
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, opening it if necessary."""
+        if self._http is None:
+            self._http = self._build_http_client()
+        return self._http
+        
+    async def close(self) -> None:
+        """Stop background tasks and close the pooled HTTP client."""
+        tasks = list(self._background)
+        for task in (self._refresh_task, self._health_task):
+            if task is not None:
+                tasks.append(task)
+        self._refresh_task = None
+        self._health_task = None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+            
+    async def __aenter__(self) -> "NRTSearchClient":
+        await self.start()
+        return self
         
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+        
+    async def check_endpoints(self) -> None:
+        """Health-check every endpoint once, ejecting or re-admitting them."""
+        balancer = self.balancer
+        http = await self._get_http_client()
+        
+        async def check(endpoint: Endpoint) -> None:
+            try:
+                response = await http.get(
+                    f"{endpoint.url}{balancer.health_check_path}",
+                    timeout=balancer.health_check_timeout
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.debug("Health check of %s failed: %s", endpoint.url, e)
+                balancer.record_failure(endpoint)
+            else:
+                balancer.record_success(endpoint)
+                
+        await asyncio.gather(*(check(endpoint) for endpoint in balancer.endpoints()))
+    
+    async def _health_check_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_endpoints()
+    
+    def _route(
+        self,
+        path: str,
+        json_data: Optional[Dict[str, Any]],
+        exclude: Optional[Endpoint] = None
+    ) -> Endpoint:
+        """Choose the endpoint for a request from its path and index."""
+        index_name = json_data.get("indexName") if json_data else None
+        if index_name is None and path.startswith("/indices/"):
+            index_name = path.split("/")[2]
+        role = REPLICA if path in _REPLICA_PATHS else PRIMARY
+        return self.balancer.choose(index_name, role, exclude=exclude)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Statistics of the client's endpoints, caches and request policies."""
+        return {
+            "endpoints": self.balancer.stats(),
+            "search_cache": None if self.result_cache is None else self.result_cache.stats,
+            "metadata_cache": None if self.metadata_cache is None else self.metadata_cache.stats,
+            "document_cache": None if self.document_cache is None else self.document_cache.stats,
+            "singleflight": {
+                "calls": self._inflight.calls,
+                "coalesced": self._inflight.coalesced,
+                "inflight": len(self._inflight),
+            },
+            "limiter": None if self.limiter is None else self.limiter.stats(),
+            "retry": None if self.retry is None else self.retry.stats(),
+            "hedging": None if self.hedging is None else self.hedging.stats(),
+            # Indexes searched without backend highlighting (snippets cut locally)
+            "highlight_rejected": sorted(self._highlight_rejected),
+        }
+    
     async def _make_request(
         self, 
         method: str, 
@@ -35,6 +317,10 @@ class NRTSearchClient:
     ) -> Dict[str, Any]:
         """Make an HTTP request to the NRTSearch server.
         
+        Idempotent requests that fail with a retryable error are retried,
+        on another endpoint when there is one, according to the retry policy.
+        Attempts are bounded by the current call's deadline, if any.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             path: API endpoint path
@@ -45,24 +331,241 @@ class NRTSearchClient:
             
         Raises:
             httpx.HTTPError: If the request fails
+            LimiterRejected: If the concurrency limiter cannot admit the request
+            CircuitOpenError: If the endpoint's circuit breaker is open
+            DeadlineExceeded: If the call's deadline passes
         """
-        url = f"{self.base_url}{path}"
+        endpoint = self._route(path, json_data)
+        policy = self.retry
+        if policy is None or not (method.upper() == "GET" or path in _IDEMPOTENT_POSTS):
+            return await self._send(endpoint, method, path, json_data)
+            
+        policy.start()
+        return await self._send_with_retries(endpoint, method, path, json_data)
+    
+    async def _send_with_retries(
+        self,
+        endpoint: Endpoint,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send an idempotent request, retrying failures per the retry policy.
         
-        logger.debug(f"Making {method} request to {url}")
-        if json_data:
-            logger.debug(f"Request data: {json_data}")
+        The first attempt goes to ``endpoint``, retries to another endpoint
+        when there is one. The caller counts the request with the policy's
+        start(), so that it adds to the retry budget once.
+        """
+        policy = self.retry
+        if policy is None:
+            return await self._send(endpoint, method, path, json_data)
+            
+        attempt = 0
+        while True:
+            if attempt:
+                endpoint = self._route(path, json_data, exclude=endpoint)
+            attempt += 1
+            try:
+                return await self._send(endpoint, method, path, json_data)
+            except Exception as e:
+                left = deadline.remaining()
+                if (left is not None and left <= 0) or not policy.should_retry(e, attempt):
+                    raise
+                delay = policy.backoff(attempt)
+                if left is not None and delay >= left:
+                    raise
+                logger.info(
+                    "Retrying %s %s in %.3fs after attempt %d failed: %s",
+                    method, path, delay, attempt, e
+                )
+            await asyncio.sleep(delay)
+    
+    async def _send(
+        self,
+        endpoint: Endpoint,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a request to a specific endpoint, recording its latency and health.
         
-        async with httpx.AsyncClient() as client:
-            if method.upper() == "GET":
-                response = await client.get(url, timeout=30.0)
-            else:
-                response = await client.post(url, json=json_data, timeout=30.0)
+        Raises:
+            httpx.HTTPError: If the request fails
+            LimiterRejected: If the concurrency limiter cannot admit the request
+            DeadlineExceeded: If the call's deadline passes
+        """
+        left = deadline.check(f"{method} {path}")
+        limiter = self.limiter
+        if limiter is None:
+            return await self._send_now(endpoint, method, path, json_data)
             
-            response.raise_for_status()
-            result = response.json()
+        # Searches queue behind cheap metadata and document lookups
+        await limiter.acquire(LOW_PRIORITY if path == "/search" else HIGH_PRIORITY, timeout=left)
+        started = time.perf_counter()
+        latency = None
+        dropped = False
+        try:
+            result = await self._send_now(endpoint, method, path, json_data)
+            latency = time.perf_counter() - started
+            return result
+        except httpx.TimeoutException:
+            dropped = True
+            raise
+        except httpx.HTTPStatusError as e:
+            dropped = e.response.status_code in _OVERLOAD_STATUS
+            raise
+        finally:
+            limiter.release(latency, dropped)
+    
+    async def _send_now(
+        self,
+        endpoint: Endpoint,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        url = f"{endpoint.url}{path}"
+        # Each attempt gets the remaining budget if that is below the usual timeout
+        timeout = self.connection.timeout
+        left = deadline.check(f"{method} {path}")
+        deadline_bound = False
+        if left is not None and left < timeout:
+            timeout = left
+            deadline_bound = True
             
-            logger.debug(f"Response: {result}")
+        breaker = endpoint.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker is open for {endpoint.url}")
+        
+        http = await self._get_http_client()
+        content = None if method.upper() == "GET" else jsoncodec.dumps(json_data)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("%s %s", method, url)
+        endpoint.requests += 1
+        endpoint.inflight += 1
+        started = time.perf_counter()
+        http_span = tracing.span("http", {
+            "http.request.method": method,
+            "url.path": path,
+            "server.address": endpoint.url
+        })
+        try:
+            with http_span:
+                if content is None:
+                    response = await http.get(url, timeout=timeout)
+                else:
+                    metrics.BACKEND_BYTES_SENT.inc(endpoint.url, amount=len(content))
+                    response = await http.post(
+                        url,
+                        content=content,
+                        headers={"Content-Type": "application/json"},
+                        timeout=timeout
+                    )
+                http_span.set_attribute("http.response.status_code", response.status_code)
+                response.raise_for_status()
+        except httpx.TimeoutException as e:
+            metrics.BACKEND_ERRORS.inc(endpoint.url, type(e).__name__)
+            if deadline_bound:
+                # Our budget ran out; that says nothing about the endpoint
+                if breaker is not None:
+                    breaker.record_cancel()
+                raise deadline.DeadlineExceeded(
+                    f"Deadline exceeded waiting for {method} {path}"
+                ) from e
+            self.balancer.record_failure(endpoint)
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except httpx.HTTPError as e:
+            metrics.BACKEND_ERRORS.inc(endpoint.url, type(e).__name__)
+            # Client errors (4xx) say nothing about the endpoint's health
+            if not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500:
+                self.balancer.record_failure(endpoint)
+                if breaker is not None:
+                    breaker.record_failure()
+            elif breaker is not None:
+                breaker.record_success()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.record_cancel()
+            raise
+        finally:
+            endpoint.inflight -= 1
+        elapsed = time.perf_counter() - started
+        self.balancer.record_success(endpoint, elapsed)
+        if breaker is not None:
+            breaker.record_success()
+        metrics.BACKEND_DURATION.observe(elapsed, endpoint.url, metrics.path_label(path))
+        metrics.BACKEND_BYTES_RECEIVED.inc(endpoint.url, amount=len(response.content))
+        
+        # Decode straight from the response bytes, no intermediate text copy
+        with tracing.span("json.decode", {"http.response.body.size": len(response.content)}):
+            result = jsoncodec.loads(response.content)
+        
+        if debug and self.payload_sampler.sample():
+            # Logged from the raw bytes, only as much as the preview shows
+            sampler = self.payload_sampler
+            logger.debug(
+                "%s %s -> %s in %.1fms\n  request: %s\n  response: %s",
+                method, url, response.status_code, elapsed * 1000.0,
+                sampler.preview(content), sampler.preview(response.content)
+            )
+        return result
+    
+    async def _hedged_search(
+        self,
+        policy: HedgePolicy,
+        index_name: str,
+        search_request: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """POST a search, duplicating it to a second replica if it is slow.
+        
+        The duplicate is sent once the first attempt has been outstanding for
+        the hedge policy's latency percentile and the hedge budget allows it.
+        The first successful answer wins and the other attempt is cancelled.
+        Each attempt is retried according to the retry policy, which counts
+        the search once.
+        """
+        policy.start()
+        if self.retry is not None:
+            self.retry.start()
+        
+        async def attempt(endpoint: Endpoint) -> Dict[str, Any]:
+            started = time.perf_counter()
+            result = await self._send_with_retries(endpoint, "POST", "/search", search_request)
+            policy.observe(time.perf_counter() - started)
             return result
+            
+        first_endpoint = self.balancer.choose(index_name, REPLICA)
+        first = asyncio.ensure_future(attempt(first_endpoint))
+        attempts = [first]
+        try:
+            delay = policy.delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done:
+                    second_endpoint = self.balancer.choose(index_name, REPLICA, exclude=first_endpoint)
+                    if second_endpoint is not first_endpoint and policy.try_acquire():
+                        attempts.append(asyncio.ensure_future(attempt(second_endpoint)))
+                        
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            policy.record_win()
+                        return task.result()
+            # Every attempt failed; report the original one's error
+            return first.result()
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
     
     async def search(
         self,
@@ -84,9 +587,204 @@ class NRTSearchClient:
             filter_queries: Additional filter queries to apply
             
         Returns:
-            Search results with hits and metadata
+            Search results with hits and metadata. Results may be served from
+            the result cache or shared with concurrent identical searches, and
+            must not be modified by the caller.
+        """
+        with tracing.span("search.normalize"):
+            cache_key = make_search_key(
+                index_name, query, start_hit, top_hits, retrieve_fields, filter_queries
+            )
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if isinstance(cached, dict):
+                tracing.current_span().set_attribute("search.cache_hit", True)
+                return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            result = await self._fetch_search(
+                index_name, query, start_hit, top_hits, retrieve_fields, filter_queries
+            )
+            if self.result_cache is not None:
+                self.result_cache.put(cache_key, index_name, result)
+            return result
+            
+        return await self._inflight.do(("search",) + cache_key, fetch)
+    
+    async def search_hits(
+        self,
+        index_name: str,
+        query: str,
+        start_hit: int = 0,
+        top_hits: int = 10,
+        retrieve_fields: Optional[List[str]] = None,
+        filter_queries: Optional[List[str]] = None,
+        highlight: Optional[Highlight] = None
+    ) -> HitTable:
+        """Search an index and decode the hits into a HitTable.
+        
+        Takes the same arguments as search(), plus optional highlighting.
+        The response is decoded once with the index's hit decoder, and the
+        result cache keeps the compact table rather than the raw response.
+        
+        Highlighted fields are returned as fragments instead of their stored
+        values. Where a hit has no fragments (the query matched it on other
+        fields), the stored values of just those hits are looked up by ID and
+        previews are cut from them locally. Indexes without an id_field
+        repeat the search without highlights instead.
+        
+        If a highlighted search fails with a client error and the same
+        search without highlights succeeds, the backend is taken not to
+        support highlighting for the index and is not asked again: the
+        highlighted fields are retrieved in full and cut into snippets
+        around the query terms locally, before caching.
+        
+        Args:
+            highlight: Fields to return as highlight fragments; they should
+                not also be in retrieve_fields
+            
+        Returns:
+            Decoded hits. Tables may be served from the result cache or
+            shared with concurrent identical searches, and must not be
+            modified by the caller.
+        """
+        with tracing.span("search.normalize"):
+            cache_key = ("hits",) + make_search_key(
+                index_name, query, start_hit, top_hits, retrieve_fields, filter_queries
+            )
+            if highlight is not None:
+                cache_key += (highlight,)
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if isinstance(cached, HitTable):
+                tracing.current_span().set_attribute("search.cache_hit", True)
+                return cached
+        
+        index_config = self.index_configs.get(index_name)
+        id_field = index_config.id_field if index_config is not None else None
+        
+        async def fetch() -> HitTable:
+            applied = highlight
+            if applied is not None and index_name in self._highlight_rejected:
+                applied = None
+            fields = retrieve_fields
+            added_id = False
+            if applied is None:
+                fields = _with_fields(retrieve_fields, highlight)
+            elif id_field and fields is not None and id_field not in fields:
+                # Needed to look up stored values for hits without fragments
+                fields = fields + [id_field]
+                added_id = True
+            try:
+                result = await self._fetch_search(
+                    index_name, query, start_hit, top_hits, fields, filter_queries, applied
+                )
+            except httpx.HTTPStatusError as e:
+                if applied is None or e.response.status_code >= 500:
+                    raise
+                # The 4xx may be about the query rather than the highlights;
+                # only a search without them that succeeds says it was not
+                try:
+                    result = await self._fetch_search(
+                        index_name, query, start_hit, top_hits,
+                        _with_fields(retrieve_fields, highlight), filter_queries
+                    )
+                except httpx.HTTPStatusError:
+                    raise e
+                logger.warning(
+                    "Highlighting on %s was rejected (%s), retrieving %s in full instead",
+                    index_name, e.response.status_code, ", ".join(applied.fields)
+                )
+                self._highlight_rejected.add(index_name)
+            else:
+                unhighlighted = missing_fragments(result, applied) if applied is not None else {}
+                if unhighlighted:
+                    # Hits matched on other fields have no fragments; get the
+                    # stored values to preview those fields instead
+                    filled = None
+                    if id_field:
+                        filled = await self._add_stored_values(
+                            index_name, id_field, result, unhighlighted
+                        )
+                    if filled is None:
+                        filled = await self._fetch_search(
+                            index_name, query, start_hit, top_hits,
+                            _with_fields(retrieve_fields, highlight), filter_queries
+                        )
+                    result = filled
+            table = HitTable.from_response(
+                result, await self.get_hit_decoder(index_name), highlight, query
+            )
+            if added_id and id_field:
+                table.columns.pop(id_field, None)
+            if self.result_cache is not None:
+                self.result_cache.put(cache_key, index_name, table)
+            return table
+            
+        return await self._inflight.do(cache_key, fetch)
+    
+    async def _add_stored_values(
+        self,
+        index_name: str,
+        id_field: str,
+        result: Dict[str, Any],
+        unhighlighted: Dict[int, List[str]]
+    ) -> Optional[Dict[str, Any]]:
+        """Add the stored values of fields that got no fragments to their hits.
+        
+        The values are fetched with one search for the IDs of those hits,
+        retrieving only those fields.
+        
+        Returns:
+            A copy of the response with the values added, or None if the
+            backend rejected the ID search
         """
-        search_request = {
+        hits = list(result.get("hits", []))
+        positions: Dict[str, List[int]] = {}
+        for i in unhighlighted:
+            doc_id = _id_value(hits[i].get("fields", {}), id_field)
+            if doc_id is not None:
+                positions.setdefault(doc_id, []).append(i)
+        if not positions:
+            return result
+        
+        names = list(dict.fromkeys(name for names in unhighlighted.values() for name in names))
+        try:
+            found = await self._search_documents(index_name, id_field, list(positions), names)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                raise
+            logger.warning(
+                "ID search on %s.%s was rejected (%s), repeating the search instead",
+                index_name, id_field, e.response.status_code
+            )
+            return None
+        
+        for doc_id, hit_positions in positions.items():
+            document = found[doc_id]["document"]
+            if document is None:
+                continue
+            stored = document.get("fields", {})
+            for i in hit_positions:
+                fields = dict(hits[i].get("fields", {}))
+                for name in unhighlighted[i]:
+                    if name in stored:
+                        fields[name] = stored[name]
+                hits[i] = dict(hits[i], fields=fields)
+        return dict(result, hits=hits)
+    
+    async def _fetch_search(
+        self,
+        index_name: str,
+        query: str,
+        start_hit: int,
+        top_hits: int,
+        retrieve_fields: Optional[List[str]],
+        filter_queries: Optional[List[str]],
+        highlight: Optional[Highlight] = None
+    ) -> Dict[str, Any]:
+        """Send a search to the backend, bypassing the result cache."""
+        search_request: Dict[str, Any] = {
             "indexName": index_name,
             "queryText": query,
             "startHit": start_hit,
@@ -99,7 +797,249 @@ class NRTSearchClient:
         if filter_queries:
             search_request["filterQueries"] = filter_queries
             
-        return await self._make_request("POST", "/search", search_request)
+        if highlight is not None:
+            search_request["highlight"] = highlight.to_request()
+            
+        if self.hedging is not None:
+            result = await self._hedged_search(self.hedging, index_name, search_request)
+        else:
+            result = await self._make_request("POST", "/search", search_request)
+        self._cache_documents(index_name, result.get("hits", []))
+        return result
+    
+    async def iter_search_pages(
+        self,
+        index_name: str,
+        query: str,
+        page_size: int = 100,
+        max_hits: Optional[int] = None,
+        retrieve_fields: Optional[List[str]] = None,
+        filter_queries: Optional[List[str]] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Walk a result set page by page using searchAfter cursors.
+        
+        Each page continues from the last hit of the previous one (taken from
+        the response's searchState), so the backend never re-collects earlier
+        hits. The next page is requested as soon as the current one arrives,
+        while the caller consumes it, so at most two pages are held at once.
+        Backends that do not return a searchState are paged with startHit.
+        
+        Args:
+            index_name: Name of the index to search
+            query: Query text (can be in Lucene query syntax)
+            page_size: Number of hits per page
+            max_hits: Stop after this many hits in total (None for all)
+            retrieve_fields: List of fields to retrieve from matching documents
+            filter_queries: Additional filter queries to apply
+            
+        Yields:
+            Raw search responses, one per page
+        """
+        base_request: Dict[str, Any] = {
+            "indexName": index_name,
+            "queryText": query,
+            "startHit": 0
+        }
+        if retrieve_fields:
+            base_request["retrieveFields"] = retrieve_fields
+        if filter_queries:
+            base_request["filterQueries"] = filter_queries
+            
+        def fetch(
+            size: int, search_after: Optional[Dict[str, Any]], offset: int
+        ) -> "asyncio.Future[Dict[str, Any]]":
+            request = dict(base_request, topHits=size)
+            if search_after is not None:
+                request["searchAfter"] = search_after
+            elif offset:
+                request["startHit"] = offset
+            return asyncio.ensure_future(self._make_request("POST", "/search", request))
+            
+        fetched = 0
+        requested = page_size if max_hits is None else min(page_size, max_hits)
+        next_page: Optional["asyncio.Future[Dict[str, Any]]"] = None
+        if requested > 0:
+            next_page = fetch(requested, None, 0)
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                hits = page.get("hits", [])
+                self._cache_documents(index_name, hits)
+                fetched += len(hits)
+                
+                remaining = None if max_hits is None else max_hits - fetched
+                if len(hits) >= requested and (remaining is None or remaining > 0):
+                    state = page.get("searchState") or {}
+                    search_after = None
+                    if "lastDocId" in state:
+                        search_after = {
+                            "lastDocId": state["lastDocId"],
+                            "lastScore": state.get("lastScore", 0.0),
+                            "lastFieldValues": state.get("lastFieldValues", [])
+                        }
+                    requested = page_size if remaining is None else min(page_size, remaining)
+                    next_page = fetch(requested, search_after, fetched)
+                    
+                yield page
+        finally:
+            if next_page is not None:
+                if next_page.done() and not next_page.cancelled():
+                    next_page.exception()
+                next_page.cancel()
+    
+    async def search_batch(
+        self,
+        searches: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        decode: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Run several searches concurrently.
+        
+        A failing search does not affect the others; its error is reported
+        in its own entry instead. When the call's deadline passes, searches
+        that have not finished are reported as errors and completed ones are
+        still returned.
+        
+        Args:
+            searches: Keyword arguments for search(), one dict per search
+            max_concurrency: Maximum searches in flight at once, capped at
+                batch_max_concurrency
+            decode: Return HitTables from search_hits() instead of raw
+                responses
+            
+        Returns:
+            One dict per search, in input order, with either a "result" or an
+            "error" key
+        """
+        search = self.search_hits if decode else self.search
+        limit = self.batch_max_concurrency
+        if max_concurrency is not None:
+            limit = min(limit, max_concurrency)
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        async def run(spec: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    deadline.check("search")
+                    return {"result": await search(**spec)}
+                except Exception as e:
+                    return {"error": f"{type(e).__name__}: {e}"}
+                    
+        return list(await asyncio.gather(*(run(spec) for spec in searches)))
+    
+    async def _get_shared(self, path: str) -> Dict[str, Any]:
+        """GET a read-only metadata resource.
+        
+        Served from the metadata cache when possible; stale entries are
+        returned immediately while a fresh copy is fetched in the background.
+        Concurrent identical fetches are coalesced.
+        """
+        if self.metadata_cache is not None:
+            cached = self.metadata_cache.get(path)
+            if cached is not None:
+                value, fresh = cached
+                if not fresh:
+                    self._revalidate_in_background(path)
+                return value
+                
+        return await self._fetch_metadata(path)
+    
+    async def _fetch_metadata(self, path: str) -> Dict[str, Any]:
+        """Fetch a metadata resource from the backend and cache it."""
+        async def fetch() -> Dict[str, Any]:
+            result = await self._make_request("GET", path)
+            if self.metadata_cache is not None:
+                self.metadata_cache.put(path, result)
+            return result
+            
+        return await self._inflight.do(("GET", path), fetch)
+    
+    def _revalidate_in_background(self, path: str) -> None:
+        """Refresh a stale metadata entry without blocking the caller."""
+        async def revalidate() -> None:
+            try:
+                await self._fetch_metadata(path)
+            except Exception as e:
+                logger.warning("Failed to refresh metadata for %s: %s", path, e)
+                
+        task = asyncio.ensure_future(revalidate())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    async def warm_metadata(self) -> None:
+        """Fetch the index listing and the info and schema of known indexes.
+        
+        Failures are logged rather than raised, so an unavailable backend
+        does not prevent the server from starting.
+        """
+        paths = ["/indices"]
+        for index_name in self.known_indexes:
+            paths.append(f"/indices/{index_name}")
+            paths.append(f"/indices/{index_name}/fields")
+        await self._refetch_metadata(paths)
+    
+    async def refresh_metadata(self) -> None:
+        """Re-fetch every cached metadata entry."""
+        if self.metadata_cache is not None:
+            await self._refetch_metadata(self.metadata_cache.paths())
+    
+    async def _refetch_metadata(self, paths: List[str]) -> None:
+        results = await asyncio.gather(
+            *(self._fetch_metadata(path) for path in paths), return_exceptions=True
+        )
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to fetch metadata for %s: %s", path, result)
+    
+    async def _refresh_metadata_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh_metadata()
+    
+    def invalidate_metadata(self, index_name: Optional[str] = None) -> int:
+        """Drop cached metadata for one index, or for all indexes.
+        
+        Args:
+            index_name: Index to invalidate, or None for everything
+            
+        Returns:
+            Number of cache entries removed
+        """
+        if index_name is None:
+            self._decoders.clear()
+        else:
+            self._decoders.pop(index_name, None)
+            
+        if self.metadata_cache is None:
+            return 0
+        return self.metadata_cache.invalidate(index_name)
+    
+    async def get_hit_decoder(self, index_name: str) -> HitDecoder:
+        """Get the compiled hit decoder for an index.
+        
+        The decoder is built once per index from its field schema. If the
+        schema cannot be fetched, a decoder that learns field types from the
+        first hits is used instead.
+        
+        Args:
+            index_name: Name of the index
+            
+        Returns:
+            Decoder for the index's hits
+        """
+        decoder = self._decoders.get(index_name)
+        if decoder is None:
+            try:
+                decoder = HitDecoder.from_field_info(await self.get_field_info(index_name))
+            except deadline.DeadlineExceeded:
+                # Out of time for this call; fetch the schema on a later one
+                raise
+            except Exception as e:
+                logger.warning("No field schema for index %s, decoding without it: %s", index_name, e)
+                decoder = HitDecoder()
+            self._decoders[index_name] = decoder
+        return decoder
     
     async def get_indexes(self) -> List[str]:
         """Get a list of available indexes.
@@ -107,7 +1047,7 @@ class NRTSearchClient:
         Returns:
             List of index names
         """
-        result = await self._make_request("GET", "/indices")
+        result = await self._get_shared("/indices")
         return result.get("indices", [])
     
     async def get_index_info(self, index_name: str) -> Dict[str, Any]:
@@ -119,7 +1059,7 @@ class NRTSearchClient:
         Returns:
             Index metadata and configuration
         """
-        return await self._make_request("GET", f"/indices/{index_name}")
+        return await self._get_shared(f"/indices/{index_name}")
     
     async def get_document(self, index_name: str, doc_id: str) -> Dict[str, Any]:
         """Retrieve a document by ID.
@@ -129,13 +1069,167 @@ class NRTSearchClient:
             doc_id: Document ID
             
         Returns:
-            Document data
+            Document data. Documents may be served from the document cache
+            and must not be modified by the caller.
         """
-        return await self._make_request(
-            "POST", 
-            "/getDoc", 
-            {"indexName": index_name, "docId": doc_id}
-        )
+        if self.document_cache is not None:
+            cached = self.document_cache.get(index_name, doc_id)
+            if cached is not None:
+                return cached
+        return await self._fetch_document(index_name, doc_id)
+    
+    async def _fetch_document(self, index_name: str, doc_id: str) -> Dict[str, Any]:
+        """Fetch a document with getDoc and cache it."""
+        async def fetch() -> Dict[str, Any]:
+            document = await self._make_request(
+                "POST", 
+                "/getDoc", 
+                {"indexName": index_name, "docId": doc_id}
+            )
+            if self.document_cache is not None:
+                self.document_cache.put(index_name, doc_id, document)
+            return document
+            
+        return await self._inflight.do(("getDoc", index_name, doc_id), fetch)
+    
+    async def get_documents(
+        self,
+        index_name: str,
+        doc_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve several documents by ID.
+        
+        Up to get_documents_search_threshold IDs are fetched with concurrent
+        getDoc requests. Larger sets are fetched with a single search for
+        the IDs when the index has an id_field configured; if the backend
+        rejects that search, getDoc requests are used instead.
+        
+        Args:
+            index_name: Name of the index to get the documents from
+            doc_ids: Document IDs; duplicates are fetched once
+            max_concurrency: Maximum getDoc requests in flight at once,
+                capped at get_documents_max_concurrency
+            
+        Returns:
+            One dict per input ID, in input order, with the "doc_id" and
+            either a "document" (None if there is no such document) or an
+            "error"
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for doc_id in dict.fromkeys(doc_ids):
+            cached = None
+            if self.document_cache is not None:
+                cached = self.document_cache.get(index_name, doc_id)
+            if cached is not None:
+                found[doc_id] = {"document": cached}
+            else:
+                missing.append(doc_id)
+                
+        index_config = self.index_configs.get(index_name)
+        id_field = index_config.id_field if index_config is not None else None
+        fetched: Optional[Dict[str, Dict[str, Any]]] = None
+        if id_field and len(missing) > self.get_documents_search_threshold:
+            try:
+                fetched = await self._search_documents(index_name, id_field, missing)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code >= 500:
+                    raise
+                logger.warning(
+                    "ID search on %s.%s was rejected (%s), using getDoc instead",
+                    index_name, id_field, e.response.status_code
+                )
+        if fetched is None and missing:
+            fetched = await self._get_documents_parallel(index_name, missing, max_concurrency)
+        found.update(fetched or {})
+        return [dict(found[doc_id], doc_id=doc_id) for doc_id in doc_ids]
+    
+    async def _get_documents_parallel(
+        self,
+        index_name: str,
+        doc_ids: List[str],
+        max_concurrency: Optional[int]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch documents with concurrent getDoc requests."""
+        limit = self.get_documents_max_concurrency
+        if max_concurrency is not None:
+            limit = min(limit, max_concurrency)
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        async def fetch(doc_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    deadline.check("getDoc")
+                    return {"document": await self._fetch_document(index_name, doc_id)}
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 404:
+                        return {"document": None}
+                    return {"error": f"{type(e).__name__}: {e}"}
+                except Exception as e:
+                    return {"error": f"{type(e).__name__}: {e}"}
+                    
+        results = await asyncio.gather(*(fetch(doc_id) for doc_id in doc_ids))
+        return dict(zip(doc_ids, results))
+    
+    async def _search_documents(
+        self,
+        index_name: str,
+        id_field: str,
+        doc_ids: List[str],
+        retrieve_fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch documents with one search matching any of the IDs.
+        
+        Documents hold the given fields, or all of the index's fields.
+        """
+        if retrieve_fields is not None:
+            retrieve_fields = list(retrieve_fields)
+        else:
+            retrieve_fields = list(self.index_configs[index_name].fields)
+        if not retrieve_fields:
+            retrieve_fields = [f["name"] for f in await self.get_field_info(index_name) if "name" in f]
+        if id_field not in retrieve_fields:
+            retrieve_fields.append(id_field)
+            
+        result = await self._make_request("POST", "/search", {
+            "indexName": index_name,
+            "startHit": 0,
+            "topHits": len(doc_ids),
+            "retrieveFields": retrieve_fields,
+            "query": {
+                "termInSetQuery": {"field": id_field, "textTerms": {"terms": doc_ids}}
+            }
+        })
+        
+        hits = result.get("hits", [])
+        self._cache_documents(index_name, hits)
+        found: Dict[str, Dict[str, Any]] = {doc_id: {"document": None} for doc_id in doc_ids}
+        for hit in hits:
+            fields = hit.get("fields", {})
+            doc_id = _id_value(fields, id_field)
+            if doc_id in found:
+                found[doc_id] = {"document": {"fields": fields}}
+        return found
+    
+    def _cache_documents(self, index_name: str, hits: List[Dict[str, Any]]) -> None:
+        """Cache search hits that carry every configured field of their index.
+        
+        Only indexes with an id_field and a configured field list qualify;
+        hits retrieved with fewer fields are not complete documents.
+        """
+        if self.document_cache is None:
+            return
+        index_config = self.index_configs.get(index_name)
+        if index_config is None or not index_config.id_field or not index_config.fields:
+            return
+        for hit in hits:
+            fields = hit.get("fields")
+            if not fields or any(name not in fields for name in index_config.fields):
+                continue
+            doc_id = _id_value(fields, index_config.id_field)
+            if doc_id is not None:
+                self.document_cache.put(index_name, doc_id, {"fields": fields})
     
     async def get_field_info(self, index_name: str) -> List[Dict[str, Any]]:
         """Get information about fields in an index.
@@ -146,5 +1240,5 @@ class NRTSearchClient:
         Returns:
             List of field definitions
         """
-        result = await self._make_request("GET", f"/indices/{index_name}/fields")
+        result = await self._get_shared(f"/indices/{index_name}/fields")
         return result.get("fields", [])
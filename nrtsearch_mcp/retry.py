@@ -0,0 +1,116 @@
+"""
+Retries for idempotent backend requests.
+
+Failed attempts are retried after an exponentially growing delay with full
+jitter, so clients that failed together do not retry together. A retry
+budget caps retries to a fraction of requests: while the backend is healthy
+the budget stays full, but during an outage it drains quickly and failures
+are returned instead of multiplying the load.
+"""
+
+import random
+from typing import Any, Dict, Optional
+
+import httpx
+
+from nrtsearch_mcp.breaker import CircuitOpenError
+from nrtsearch_mcp.config import ServerConfig
+
+# Status codes worth retrying, possibly on another endpoint
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed attempt may succeed if repeated."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TransportError, CircuitOpenError))
+
+
+class RetryPolicy:
+    """Backoff schedule and retry budget for idempotent requests."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        budget_ratio: float = 0.2,
+        budget_max_tokens: float = 10.0,
+        rng: Optional[random.Random] = None
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Attempts per request, including the first
+            base_delay: Upper bound in seconds of the delay before the first retry
+            max_delay: Upper bound in seconds of any retry delay
+            budget_ratio: Retries earned per request
+            budget_max_tokens: Maximum retries that can be saved up
+            rng: Random source, injectable for tests
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_max_tokens = budget_max_tokens
+        self._tokens = budget_max_tokens
+        self._rng = rng or random.Random()
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["RetryPolicy"]:
+        """Build a policy from the server configuration.
+
+        Returns:
+            The policy, or None if retries are disabled
+        """
+        retry = config.retry
+        if not retry.enabled:
+            return None
+        return cls(
+            max_attempts=retry.max_attempts,
+            base_delay=retry.base_delay,
+            max_delay=retry.max_delay,
+            budget_ratio=retry.budget_ratio,
+            budget_max_tokens=retry.budget_max_tokens
+        )
+
+    def start(self) -> None:
+        """Count a request, adding its share to the retry budget."""
+        self.requests += 1
+        self._tokens = min(self.budget_max_tokens, self._tokens + self.budget_ratio)
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Decide whether to retry after a failed attempt, taking from the budget.
+
+        Args:
+            error: The attempt's error
+            attempt: Number of attempts made so far
+
+        Returns:
+            True if the request should be attempted again
+        """
+        if attempt >= self.max_attempts or not is_retryable(error):
+            return False
+        if self._tokens < 1.0:
+            self.budget_exhausted += 1
+            return False
+        self._tokens -= 1.0
+        self.retries += 1
+        return True
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number ``attempt`` (1-based), with full jitter."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng.uniform(0.0, cap)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "budget_exhausted": self.budget_exhausted,
+            "budget_tokens": self._tokens,
+        }
@@ -1,22 +1,36 @@
 """
-Minimal FastMCP server that exposes one tool: nrtsearch/search
-──────────────────────────────────────────────────────────────
-• Accepts **any** Lucene query the caller provides.
-• Normalises bare keywords → text:"…" so phrase tests still work.
-• Validates topHits (1-100) to avoid runaway requests.
-• Returns   [{"score": …, "stars": …, "text": …}]  – easy for Copilot to display.
+FastMCP entry point for the NRTSearch MCP server
+────────────────────────────────────────────────
+• Builds one pooled NRTSearchClient from the server configuration.
+• Registers the search and index tools on a single FastMCP instance.
+• Keeps the original nrtsearch/search tool for existing clients:
+  bare keywords → text:"…", topHits clamped to 1-100,
+  returns [{"score": …, "stars": …, "text": …}].
 """
 
+import argparse
 import logging
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 
-import httpx
 from fastmcp import FastMCP
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools import ToolResult
+from mcp.types import CallToolRequestParams
 from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 
-logger = logging.getLogger(__name__)
+from nrtsearch_mcp import metrics, tracing
+from nrtsearch_mcp.config import ServerConfig, get_default_config, load_config
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.index import register_index_tools
+from nrtsearch_mcp.tools.render import RenderOptions
+from nrtsearch_mcp.tools.search import register_search_tools
+from nrtsearch_mcp.tools.stats import register_stats_tools
+from nrtsearch_mcp.tools.utils import tool_call
 
-mcp = FastMCP("nrtsearch")          # host / port / path supplied at run()
+logger = logging.getLogger(__name__)
 
 # ────────── result schema ─────────────────────────────────────────────────────
 class Hit(BaseModel):
@@ -29,90 +43,223 @@ class SearchResult(BaseModel):
     hits: List[Hit]
 
 
-# ────────── MCP tool ──────────────────────────────────────────────────────────
-@mcp.tool(
-    description="Search an NRTSearch/Lucene index",
-    annotations={
-        "parameters": {
-            "properties": {
-                "queryText": {
-                    "description": (
-                        "Lucene Boolean query **required**.\n"
-                        "• Join keywords with AND/OR/NOT  → text:(gay AND bar AND sf)\n"
-                        "• Use quotes for phrases         → text:\"great coffee\"\n"
-                        "• Range / wildcard / fuzzy ok    → stars:[4 TO 5], bar*, cocktail~1"
-                    )
+# ────────── MCP tools ─────────────────────────────────────────────────────────
+def register_legacy_search_tool(
+    mcp: FastMCP,
+    client: NRTSearchClient,
+    call_timeout: Optional[float] = None
+) -> None:
+    """Register the original ``search`` tool, backed by the shared client."""
+
+    @mcp.tool(
+        description="Search an NRTSearch/Lucene index",
+        annotations={
+            "parameters": {
+                "properties": {
+                    "queryText": {
+                        "description": (
+                            "Lucene Boolean query **required**.\n"
+                            "• Join keywords with AND/OR/NOT  → text:(gay AND bar AND sf)\n"
+                            "• Use quotes for phrases         → text:\"great coffee\"\n"
+                            "• Range / wildcard / fuzzy ok    → stars:[4 TO 5], bar*, cocktail~1"
+                        )
+                    }
                 }
-            }
-        },
-        "examples": [
-            {  # Boolean keywords
-                "index": "yelp_reviews_staging",
-                "queryText": 'text:(irish AND pub AND (texas OR tx))',
-                "topHits": 3
             },
-            {  # Phrase
-                "index": "yelp_reviews_staging",
-                "queryText": 'text:"great coffee"',
-                "topHits": 5
-            }
-        ],
-    },
-)
-
-async def search(
-    index: str,
-    queryText: str,
-    topHits: int = 10,
-    retrieveFields: Optional[List[str]] = None,
-) -> SearchResult:
+            "examples": [
+                {  # Boolean keywords
+                    "index": "yelp_reviews_staging",
+                    "queryText": 'text:(irish AND pub AND (texas OR tx))',
+                    "topHits": 3
+                },
+                {  # Phrase
+                    "index": "yelp_reviews_staging",
+                    "queryText": 'text:"great coffee"',
+                    "topHits": 5
+                }
+            ],
+        },
+    )
+    async def search(
+        index: str,
+        queryText: str,
+        topHits: int = 10,
+        retrieveFields: Optional[List[str]] = None,
+    ) -> SearchResult:
+        """
+        index         – index name (e.g. yelp_reviews_staging)
+        queryText     – **Full Lucene query**. If no field or quotes are present the
+                        string is treated as a phrase on the `text` field, i.e.
+                        → text:"…"
+        topHits       – 1-100 results (default 10)
+        retrieveFields – optional extra fields; defaults to ["text", "stars"]
+        """
+        # ── sanity-check inputs ───────────────────────────────────────────────────
+        topHits = max(1, min(topHits, 100))
+        if "text:" not in queryText and '"' not in queryText:
+            queryText = f'text:"{queryText}"'
+
+        retrieveFields = retrieveFields or ["text", "stars"]
+
+        logger.info("→ search %s | %r | top=%s", index, queryText, topHits)
+
+        # ── search through the shared client (pool, cache, single-flight) ──────
+        with tool_call("search", call_timeout):
+            table = await client.search_hits(
+                index_name=index,
+                query=queryText,
+                top_hits=topHits,
+                retrieve_fields=retrieveFields,
+            )
+
+        # ── reshape results for Copilot ──────────────────────────────────────────
+        hits: List[Hit] = []
+        for score, fields in table.rows():
+            hits.append(
+                Hit(
+                    score=score,
+                    stars=fields["stars"],
+                    text=fields["text"],
+                )
+            )
+
+        return SearchResult(hits=hits)
+
+
+def register_tools(
+    mcp: FastMCP,
+    client: NRTSearchClient,
+    call_timeout: Optional[float] = None,
+    render_options: Optional[RenderOptions] = None
+) -> None:
+    """Register every tool the server exposes on ``mcp``.
+
+    Args:
+        mcp: The MCP server instance
+        client: The shared NRTSearch client
+        call_timeout: Time budget in seconds for each tool call
+        render_options: Output limits (default: RenderOptions())
     """
-    index         – index name (e.g. yelp_reviews_staging)
-    queryText     – **Full Lucene query**. If no field or quotes are present the
-                    string is treated as a phrase on the `text` field, i.e.
-                    → text:"…"
-    topHits       – 1-100 results (default 10)
-    retrieveFields – optional extra fields; defaults to ["text", "stars"]
+    register_search_tools(mcp, client, render_options=render_options, call_timeout=call_timeout)
+    register_index_tools(mcp, client, render_options=render_options, call_timeout=call_timeout)
+    register_legacy_search_tool(mcp, client, call_timeout=call_timeout)
+    register_stats_tools(mcp, client)
+
+
+class TracingMiddleware(Middleware):
+    """Open each tool call's trace as soon as the MCP request is dispatched,
+    so argument validation and routing show up as the ``mcp.dispatch`` span."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[CallToolRequestParams],
+        call_next: CallNext[CallToolRequestParams, ToolResult]
+    ) -> ToolResult:
+        with tracing.dispatch_span(context.message.name):
+            return await call_next(context)
+
+
+def create_server(config: ServerConfig) -> FastMCP:
+    """Create the MCP server and its NRTSearch client from a configuration.
+
+    The client's connection pool, metadata warm-up and background refresh
+    follow the server lifespan. Tracing, if enabled, is installed
+    process-wide.
+
+    Args:
+        config: Server configuration
+
+    Returns:
+        The FastMCP server with all tools registered
     """
-    # ── sanity-check inputs ───────────────────────────────────────────────────
-    topHits = max(1, min(topHits, 100))
-    if "text:" not in queryText and '"' not in queryText:
-        queryText = f'text:"{queryText}"'
-
-    retrieveFields = retrieveFields or ["text", "stars"]
-
-    logger.info("→ search %s | %r | top=%s", index, queryText, topHits)
-
-    # ── call the HTTP wrapper ────────────────────────────────────────────────
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.post(
-            "http://localhost:8080/v1/search",
-            json={
-                "indexName": index,
-                "queryText": queryText,
-                "topHits": topHits,
-                "retrieveFields": retrieveFields,
-            },
-        )
-        resp.raise_for_status()
-        raw = resp.json()
-
-    # ── reshape results for Copilot ──────────────────────────────────────────
-    hits: List[Hit] = []
-    for hit in raw.get("hits", []):
-        fields = hit["fields"]
-        hits.append(
-            Hit(
-                score=hit["score"],
-                stars=fields["stars"]["fieldValue"][0]["intValue"],
-                text=fields["text"]["fieldValue"][0]["textValue"],
-            )
-        )
+    client = NRTSearchClient.from_config(config)
+    tracer = tracing.Tracer.from_config(config)
+    tracing.configure(tracer)
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+        """Open the pooled HTTP client on startup and close it on shutdown."""
+        await client.start()
+        try:
+            yield
+        finally:
+            await client.close()
+
+    mcp = FastMCP("nrtsearch", lifespan=lifespan)   # host / port / path supplied at run()
+    register_tools(
+        mcp, client,
+        call_timeout=config.tool_timeout,
+        render_options=RenderOptions.from_config(config)
+    )
+    if tracer is not None:
+        mcp.add_middleware(TracingMiddleware())
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_endpoint(request: Request) -> Response:
+        """Prometheus scrape endpoint (HTTP transport only)."""
+        return PlainTextResponse(metrics.render(client), media_type=metrics.CONTENT_TYPE)
+
+    return mcp
+
 
-    return SearchResult(hits=hits)
+def _load_server_config(config_path: Optional[str] = None) -> ServerConfig:
+    """Load the configuration, falling back to the defaults when none is found."""
+    try:
+        return load_config(config_path)
+    except FileNotFoundError:
+        if config_path:
+            raise
+        logger.warning("No configuration file found, using the default configuration")
+        return get_default_config()
+
+
+def _default_server() -> FastMCP:
+    """Get the module-level ``mcp``, creating it on first use."""
+    server = globals().get("mcp")
+    if server is None:
+        server = globals()["mcp"] = create_server(_load_server_config())
+    return server
+
+
+def __getattr__(name: str) -> object:
+    """Build the module-level ``mcp`` and ``app`` on first access.
+
+    They serve `fastmcp run` and `uvicorn nrtsearch_mcp.server:app` with the
+    default configuration. Building them lazily keeps importing this module
+    free of side effects (a client, a process-wide tracer).
+    """
+    if name == "mcp":
+        return _default_server()
+    if name == "app":
+        app = _default_server().http_app(path="/")
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ────────── run the server ────────────────────────────────────────────────────
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="NRTSearch MCP server")
+    parser.add_argument("-c", "--config", help="Path to the JSON configuration file")
+    parser.add_argument(
+        "-t", "--transport", choices=["http", "stdio"], default="http",
+        help="MCP transport (default: http)"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=3000, help="HTTP port (default: 3000)")
+    args = parser.parse_args()
+
+    config = _load_server_config(args.config)
+    logging.basicConfig(level=config.log_level)
+    server = create_server(config)
+
+    if args.transport == "stdio":
+        server.run(transport="stdio")
+    else:
+        # Streamable-HTTP endpoint on http://<host>:<port>/
+        server.run(transport="http", host=args.host, port=args.port, path="/")
+
+
 if __name__ == "__main__":
-    # Streamable-HTTP endpoint on http://127.0.0.1:3000/
-    mcp.run(transport="http", host="127.0.0.1", port=3000, path="/")
+    main()
@@ -0,0 +1,89 @@
+"""
+Single-flight request coalescing.
+
+While a call for a given key is in flight, further calls for the same key
+wait for the first call's result instead of starting their own.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from nrtsearch_mcp import deadline
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls that share a key.
+
+    The shared call runs in its own task, so one waiter being cancelled does
+    not cancel it for the others. It is only cancelled once every waiter has
+    gone away.
+
+    The shared call runs without any caller's deadline; each waiter instead
+    stops waiting when its own deadline passes.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Hashable identity of the call
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the (possibly shared) call
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline passes first
+            Whatever the shared call raises
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(self._run(fn))
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+
+        self._waiters[key] += 1
+        try:
+            left = deadline.remaining()
+            if left is None:
+                return await asyncio.shield(task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), max(0.0, left))
+            except asyncio.TimeoutError:
+                raise deadline.DeadlineExceeded("Deadline exceeded waiting for a shared request") from None
+        finally:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+                if not self._waiters[key] and not task.done():
+                    # The last waiter gave up; nobody needs the result
+                    self._forget(key, task)
+                    task.cancel()
+
+    @staticmethod
+    async def _run(fn: Callable[[], Awaitable[T]]) -> T:
+        with deadline.unbounded():
+            return await fn()
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        if task.done() and not task.cancelled():
+            # Mark the exception as retrieved; waiters re-raise it themselves
+            task.exception()
@@ -0,0 +1,123 @@
+"""
+Local snippet extraction, used when the backend does not highlight.
+
+``best_windows`` picks the windows of a text that cover the most distinct
+query terms (then the most matches), so a multi-KB review can be shown as a
+few short passages around what the query was about. Terms match whole words
+or word prefixes, case-insensitively, which roughly stands in for the
+analyzer's stemming.
+"""
+
+import bisect
+import re
+from typing import List, Optional, Tuple
+
+# Lucene syntax that is not part of a term: operators, field prefixes,
+# grouping, boosts, fuzziness, ranges and wildcards
+_OPERATORS = frozenset({"and", "or", "not", "to"})
+_FIELD_PREFIX = re.compile(r"\b\w+:")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Marks text cut before or after a snippet
+ELLIPSIS = "..."
+
+
+def query_terms(query: str) -> List[str]:
+    """Extract the search terms from a (possibly Lucene syntax) query.
+
+    Args:
+        query: Query text
+
+    Returns:
+        Lower-cased terms in first-seen order, without operators, field
+        names or single characters
+    """
+    terms = []
+    for word in _WORD.findall(_FIELD_PREFIX.sub(" ", query)):
+        word = word.lower()
+        if len(word) > 1 and word not in _OPERATORS and not word.isdigit():
+            terms.append(word)
+    return list(dict.fromkeys(terms))
+
+
+def _term_pattern(terms: List[str]) -> Optional["re.Pattern[str]"]:
+    if not terms:
+        return None
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b({alternatives})\w*", re.IGNORECASE)
+
+
+def _snap(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Move a window's ends inward to word boundaries (if that keeps most of it)."""
+    if start > 0 and text[start - 1].isalnum():
+        space = text.find(" ", start, end)
+        if 0 <= space - start < (end - start) // 4:
+            start = space + 1
+    if end < len(text) and text[end].isalnum():
+        space = text.rfind(" ", start, end)
+        if space > start and end - space < (end - start) // 4:
+            end = space
+    return start, end
+
+
+def best_windows(text: str, terms: List[str], length: int = 200, count: int = 1) -> List[Tuple[int, int]]:
+    """Choose up to ``count`` non-overlapping windows of ``text``.
+
+    Args:
+        text: Text to cut snippets from
+        terms: Lower-cased query terms
+        length: Characters per window
+        count: Maximum number of windows
+
+    Returns:
+        (start, end) offsets in text order. Without any term match, the
+        start of the text is the only window.
+    """
+    if len(text) <= length:
+        return [(0, len(text))]
+    pattern = _term_pattern(terms)
+    matches = [] if pattern is None else [(m.start(), m.group(1).lower()) for m in pattern.finditer(text)]
+    if not matches:
+        return [_snap(text, 0, length)]
+
+    positions = [position for position, _ in matches]
+    lead = length // 4
+    candidates = []
+    for position, _ in matches:
+        start = min(max(0, position - lead), len(text) - length)
+        first = bisect.bisect_left(positions, start)
+        last = bisect.bisect_left(positions, start + length)
+        window_terms = {term for _, term in matches[first:last]}
+        candidates.append((len(window_terms), last - first, -start, start))
+    candidates.sort(reverse=True)
+
+    chosen: List[Tuple[int, int]] = []
+    for _, _, _, start in candidates:
+        if len(chosen) >= count:
+            break
+        if all(start + length <= s or start >= e for s, e in chosen):
+            chosen.append((start, start + length))
+    return sorted(_snap(text, start, end) for start, end in chosen)
+
+
+def snippet(text: str, terms: List[str], length: int = 200, count: int = 1, separator: str = " ... ") -> str:
+    """Cut ``text`` down to its best-matching windows.
+
+    Args:
+        text: Text to shorten
+        terms: Lower-cased query terms
+        length: Characters per window
+        count: Maximum number of windows
+        separator: Placed between windows
+
+    Returns:
+        The windows joined by ``separator``, with an ellipsis where the text
+        was cut at either end
+    """
+    windows = best_windows(text, terms, length, count)
+    result = separator.join(text[start:end].strip() for start, end in windows)
+    if windows[0][0] > 0:
+        result = ELLIPSIS + result
+    if windows[-1][1] < len(text):
+        result += ELLIPSIS
+    return result
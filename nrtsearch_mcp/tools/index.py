@@ -22,135 +22,185 @@ except ImportError:
             return decorator
 
 from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.render import (
+    DEFAULT_OPTIONS,
+    VERBOSE,
+    RenderOptions,
+    check_mode,
+    render_document,
+    render_documents,
+    render_error,
+    render_field_info,
+    render_index_info,
+    render_index_list,
+)
+from nrtsearch_mcp.tools.utils import tool_call
 
+# Most document IDs a get_documents call accepts
+MAX_DOCUMENT_IDS = 1000
 
-def register_index_tools(mcp: FastMCP, client: NRTSearchClient) -> None:
+
+def register_index_tools(
+    mcp: FastMCP,
+    client: NRTSearchClient,
+    render_options: Optional[RenderOptions] = None,
+    call_timeout: Optional[float] = None
+) -> None:
     """Register all index-related tools with the MCP server.
     
     Args:
         mcp: The MCP server instance
         client: The NRTSearch client
+        render_options: Output limits (default: RenderOptions())
+        call_timeout: Time budget in seconds for each tool call, shared by
+            every backend request it makes (default: no limit)
     """
+    options = render_options or DEFAULT_OPTIONS
     
     @mcp.tool()
-    async def get_indexes() -> str:
+    async def get_indexes(output_mode: str = VERBOSE) -> str:
         """
         List all available indexes.
         
+        Args:
+            output_mode: "verbose" (text) or "json" (structured)
+            
         Returns:
             List of available indexes and descriptions
         """
         try:
-            indexes = await client.get_indexes()
-            
-            if not indexes:
-                return "No indexes available."
-                
-            return "\n".join([f"- {index}" for index in indexes])
+            check_mode(output_mode)
+            with tool_call("get_indexes", call_timeout):
+                indexes = await client.get_indexes()
+                return render_index_list(indexes, output_mode)
             
         except Exception as e:
-            return f"Error retrieving indexes: {str(e)}"
+            return render_error(f"Error retrieving indexes: {str(e)}", output_mode)
     
     @mcp.tool()
-    async def get_index_info(index_name: str) -> str:
+    async def get_index_info(index_name: str, output_mode: str = VERBOSE) -> str:
         """
         Get detailed information about a specific index.
         
         Args:
             index_name: Name of the index to get information for
+            output_mode: "verbose" (text) or "json" (structured)
             
         Returns:
             Detailed index information
         """
         try:
-            info = await client.get_index_info(index_name)
-            
-            # Format the index information
-            formatted_info = f"Index: {index_name}\n\n"
-            
-            # Add settings information
-            settings = info.get("settings", {})
-            formatted_info += "Settings:\n"
-            for key, value in settings.items():
-                formatted_info += f"  {key}: {value}\n"
-            
-            # Add status information
-            status = info.get("status", {})
-            formatted_info += "\nStatus:\n"
-            for key, value in status.items():
-                formatted_info += f"  {key}: {value}\n"
-                
-            return formatted_info
+            check_mode(output_mode)
+            with tool_call("get_index_info", call_timeout):
+                info = await client.get_index_info(index_name)
+                return render_index_info(index_name, info, options=options, mode=output_mode)
             
         except Exception as e:
-            return f"Error retrieving index information: {str(e)}"
+            return render_error(f"Error retrieving index information: {str(e)}", output_mode)
     
     @mcp.tool()
-    async def get_document_by_id(index_name: str, doc_id: str) -> str:
+    async def get_document_by_id(
+        index_name: str,
+        doc_id: str,
+        output_mode: str = VERBOSE
+    ) -> str:
         """
         Retrieve a specific document by ID.
         
         Args:
             index_name: Name of the index to get the document from
             doc_id: Document ID
+            output_mode: "verbose" (text) or "json" (structured)
             
         Returns:
             Document content
         """
         try:
-            doc = await client.get_document(index_name, doc_id)
+            check_mode(output_mode)
+            with tool_call("get_document_by_id", call_timeout):
+                doc = await client.get_document(index_name, doc_id)
+                decoder = await client.get_hit_decoder(index_name)
+                return render_document(
+                    index_name, doc_id, doc, decoder, options=options, mode=output_mode
+                )
             
-            # Format the document data
-            formatted_doc = f"Document {doc_id} from index {index_name}:\n\n"
+        except Exception as e:
+            return render_error(f"Error retrieving document: {str(e)}", output_mode)
+    
+    @mcp.tool()
+    async def get_documents(
+        index_name: str,
+        doc_ids: List[str],
+        output_mode: str = VERBOSE
+    ) -> str:
+        """
+        Retrieve several documents by ID in one call.
+        
+        Documents are returned in the order of doc_ids; IDs with no document
+        are listed as not found.
+        
+        Args:
+            index_name: Name of the index to get the documents from
+            doc_ids: Document IDs (at most 1000)
+            output_mode: "verbose" (text) or "json" (structured)
             
-            # Format fields
-            fields = doc.get("fields", {})
-            for field_name, field_value in fields.items():
-                actual_value = field_value.get("fieldValue", {})
-                
-                # Extract the correct type of value
-                value_type_keys = [k for k in actual_value.keys() if k.endswith("Value")]
-                if value_type_keys:
-                    value = actual_value.get(value_type_keys[0])
-                    formatted_doc += f"{field_name}: {value}\n"
-                
-            return formatted_doc
+        Returns:
+            Document contents, followed by the IDs not found
+        """
+        try:
+            check_mode(output_mode)
+            with tool_call("get_documents", call_timeout):
+                if len(doc_ids) > MAX_DOCUMENT_IDS:
+                    raise ValueError(
+                        f"too many document IDs ({len(doc_ids)}); at most {MAX_DOCUMENT_IDS} per call"
+                    )
+                entries = await client.get_documents(index_name, [str(d) for d in doc_ids])
+                decoder = await client.get_hit_decoder(index_name)
+                return render_documents(
+                    index_name, entries, decoder, options=options, mode=output_mode
+                )
             
         except Exception as e:
-            return f"Error retrieving document: {str(e)}"
+            return render_error(f"Error retrieving documents: {str(e)}", output_mode)
     
     @mcp.tool()
-    async def get_field_info(index_name: str) -> str:
+    async def get_field_info(index_name: str, output_mode: str = VERBOSE) -> str:
         """
         Get information about fields in an index.
         
         Args:
             index_name: Name of the index to get field info for
+            output_mode: "verbose" (text) or "json" (structured)
             
         Returns:
             Field definitions and types
         """
         try:
-            fields = await client.get_field_info(index_name)
+            check_mode(output_mode)
+            with tool_call("get_field_info", call_timeout):
+                fields = await client.get_field_info(index_name)
+                return render_field_info(index_name, fields, options=options, mode=output_mode)
             
-            if not fields:
-                return f"No field definitions found for index '{index_name}'."
-                
-            # Format the field information
-            formatted_fields = f"Fields for index {index_name}:\n\n"
+        except Exception as e:
+            return render_error(f"Error retrieving field information: {str(e)}", output_mode)
+    
+    @mcp.tool()
+    async def invalidate_metadata_cache(index_name: Optional[str] = None) -> str:
+        """
+        Drop cached index metadata so that it is fetched again on next use.
+        
+        Use this after changing an index's schema or settings.
+        
+        Args:
+            index_name: Index to invalidate (default: all indexes)
             
-            for field in fields:
-                field_name = field.get("name", "unknown")
-                field_type = field.get("type", "unknown")
-                formatted_fields += f"- {field_name} ({field_type})\n"
-                
-                # Add additional field properties if available
-                properties = field.get("properties", {})
-                if properties:
-                    for prop_name, prop_value in properties.items():
-                        formatted_fields += f"  - {prop_name}: {prop_value}\n"
-                    
-            return formatted_fields
+        Returns:
+            Number of cache entries removed
+        """
+        try:
+            removed = client.invalidate_metadata(index_name)
+            target = f"index '{index_name}'" if index_name else "all indexes"
+            return f"Invalidated {removed} cached metadata entries for {target}."
             
         except Exception as e:
-            return f"Error retrieving field information: {str(e)}"
+            return f"Error invalidating metadata cache: {str(e)}"
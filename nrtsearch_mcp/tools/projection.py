@@ -0,0 +1,101 @@
+"""
+Field projection for the search tools.
+
+Tools ask the backend only for the fields they will render: the fields the
+caller named, or else the index's configured ``fields``. When a tool will
+only show a preview of long values (a per-field character limit applies,
+as in compact mode), the index's ``default_search_fields`` are requested as
+highlight fragments of that size instead of being retrieved in full. With
+snippets requested, they are highlighted in any mode, with the configured
+snippet length and count.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from nrtsearch_mcp.config import IndexConfig
+from nrtsearch_mcp.hits import FRAGMENT_SEPARATOR, Highlight
+from nrtsearch_mcp.snippets import ELLIPSIS
+from nrtsearch_mcp.tools.render import RenderOptions
+
+
+@dataclass
+class Projection:
+    """What a search retrieves from the backend."""
+
+    # Stored fields to retrieve (None leaves the choice to the backend)
+    retrieve_fields: Optional[List[str]] = None
+    # Fields returned as highlight fragments instead of stored values
+    highlight: Optional[Highlight] = None
+
+    def all_fields(self) -> Optional[List[str]]:
+        """All projected fields, for searches that cannot highlight."""
+        if self.highlight is None or self.retrieve_fields is None:
+            return self.retrieve_fields
+        return self.retrieve_fields + list(self.highlight.fields)
+
+
+def plan_projection(
+    index_config: Optional[IndexConfig],
+    fields: Optional[List[str]],
+    mode: str,
+    options: RenderOptions,
+    max_field_chars: Optional[int] = None,
+    snippets: bool = False
+) -> Projection:
+    """Choose the fields a search tool retrieves.
+
+    Args:
+        index_config: Configuration of the searched index, if known
+        fields: Fields the caller asked for, if any
+        mode: Output mode of the call
+        options: Output limits of the tool
+        max_field_chars: Per-field character limit given by the caller
+        snippets: Whether the caller asked for snippets of the text fields
+
+    Returns:
+        The projection to search with
+    """
+    if fields:
+        requested = list(dict.fromkeys(fields))
+    elif index_config is not None and index_config.fields:
+        requested = list(index_config.fields)
+    else:
+        return Projection()
+
+    if index_config is None:
+        return Projection(requested)
+    previewed = [name for name in requested if name in index_config.default_search_fields]
+    if not previewed:
+        return Projection(requested)
+    if snippets:
+        highlight = Highlight(tuple(previewed), options.snippet_chars, options.snippet_count)
+    else:
+        preview_chars = max_field_chars if max_field_chars is not None else options.field_chars(mode)
+        if preview_chars is None:
+            return Projection(requested)
+        highlight = Highlight(tuple(previewed), fragment_chars=preview_chars)
+    return Projection(
+        retrieve_fields=[name for name in requested if name not in previewed],
+        highlight=highlight
+    )
+
+
+def snippet_field_chars(
+    mode: str,
+    options: RenderOptions,
+    max_field_chars: Optional[int] = None
+) -> Optional[int]:
+    """Per-field character limit for rendering results with snippets.
+
+    A limit given by the caller is kept; the mode's limit is raised so that
+    a full set of snippets is not cut short.
+    """
+    if max_field_chars is not None:
+        return max_field_chars
+    limit = options.field_chars(mode)
+    if limit is None:
+        return None
+    count = options.snippet_count
+    snippets = count * options.snippet_chars + (count - 1) * len(FRAGMENT_SEPARATOR)
+    return max(limit, snippets + 2 * len(ELLIPSIS))
@@ -0,0 +1,581 @@
+"""
+Rendering of tool results.
+
+Text output is built as a list of parts joined once at the end, so the cost
+is linear in the output size. Rendering is bounded by an output byte budget:
+once the next block would exceed it, rendering stops and a note says how
+much was left out.
+
+In "json" mode the same data is returned as the structured models from
+``nrtsearch_mcp.models`` instead, skipping text rendering altogether.
+
+Search results are rendered from a ``HitTable``; raw responses are decoded
+into one first.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from nrtsearch_mcp import jsoncodec, tracing
+from nrtsearch_mcp.config import ServerConfig
+from nrtsearch_mcp.decoder import MISSING, HitDecoder
+from nrtsearch_mcp.hits import HitTable
+from nrtsearch_mcp.models import (
+    BatchEntry,
+    BatchResponse,
+    Document,
+    DocumentBatch,
+    ErrorResult,
+    FieldDefinition,
+    FieldList,
+    IndexInfo,
+    IndexList,
+    SearchHit,
+    SearchResponse,
+)
+from nrtsearch_mcp.tools.utils import format_plain_value, truncate_text
+
+VERBOSE = "verbose"
+COMPACT = "compact"
+JSON = "json"
+OUTPUT_MODES = (VERBOSE, COMPACT, JSON)
+
+# Bytes kept free for the note added when output is cut short
+_NOTE_RESERVE = 160
+
+# Missing or failed document IDs listed in text output before summarizing
+_MAX_LISTED_IDS = 50
+
+# A search response: decoded, or raw as returned by NRTSearchClient.search
+SearchResult = Union[HitTable, Dict[str, Any]]
+
+
+@dataclass
+class RenderOptions:
+    """Limits applied when rendering tool output."""
+
+    # Total size of one tool response, in UTF-8 bytes
+    max_output_bytes: int = 64 * 1024
+    # Per-field character limit in verbose mode (None for no limit)
+    verbose_field_chars: Optional[int] = None
+    # Per-field character limit in compact mode
+    compact_field_chars: Optional[int] = 160
+    # Characters per snippet, and snippets per field, when search tools
+    # are called with snippets=True
+    snippet_chars: int = 200
+    snippet_count: int = 2
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "RenderOptions":
+        """Build output limits from the server configuration."""
+        return cls(snippet_chars=config.snippets.length, snippet_count=config.snippets.count)
+
+    def field_chars(self, mode: str) -> Optional[int]:
+        """Per-field character limit for an output mode (json uses verbose)."""
+        return self.compact_field_chars if mode == COMPACT else self.verbose_field_chars
+
+
+DEFAULT_OPTIONS = RenderOptions()
+
+
+def check_mode(mode: str) -> None:
+    """Raise ValueError for an unknown output mode."""
+    if mode not in OUTPUT_MODES:
+        raise ValueError(
+            f"Unknown output mode '{mode}' (expected one of: {', '.join(OUTPUT_MODES)})"
+        )
+
+
+class OutputBuffer:
+    """Collects output parts up to a byte budget.
+
+    A character takes at most four bytes in UTF-8, so parts are only
+    measured in bytes once their length in characters gets near the budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.parts: List[str] = []
+        self.max_bytes = max_bytes
+        # Bytes in parts[:_measured_parts], and characters in the rest
+        self._measured_bytes = 0
+        self._measured_parts = 0
+        self._unmeasured_chars = 0
+
+    def add(self, text: str) -> bool:
+        """Append ``text`` if it fits in the budget.
+
+        Returns:
+            False (and appends nothing) if the budget would be exceeded
+        """
+        self.parts.append(text)
+        self._unmeasured_chars += len(text)
+        if self._measured_bytes + 4 * self._unmeasured_chars <= self.max_bytes:
+            return True
+        for part in self.parts[self._measured_parts:]:
+            self._measured_bytes += _utf8_size(part)
+        self._measured_parts = len(self.parts)
+        self._unmeasured_chars = 0
+        if self._measured_bytes <= self.max_bytes:
+            return True
+        self.parts.pop()
+        self._measured_parts -= 1
+        self._measured_bytes -= _utf8_size(text)
+        return False
+
+    def add_note(self, text: str) -> None:
+        """Append a note regardless of the budget."""
+        self.parts.append(text)
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+
+def _field_text(value: Any, max_chars: Optional[int]) -> str:
+    text = value if type(value) is str else format_plain_value(value)
+    if max_chars is not None and len(text) > max_chars:
+        text = truncate_text(text, max_chars)
+    return text
+
+
+def _truncate_strings(fields: Dict[str, Any], max_chars: Optional[int]) -> Dict[str, Any]:
+    """Shorten string values (and strings in lists) for structured output."""
+    if max_chars is None:
+        return fields
+    truncated = {}
+    for name, value in fields.items():
+        if isinstance(value, str):
+            value = truncate_text(value, max_chars)
+        elif isinstance(value, list):
+            value = [truncate_text(v, max_chars) if isinstance(v, str) else v for v in value]
+        truncated[name] = value
+    return truncated
+
+
+def _utf8_size(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def render_error(message: str, mode: str = VERBOSE) -> str:
+    """Render an error message, as ``{"error": ...}`` in json mode."""
+    if mode == JSON:
+        return ErrorResult(error=message).model_dump_json()
+    return message
+
+
+def as_hit_table(result: SearchResult, decoder: Optional[HitDecoder] = None) -> HitTable:
+    """Decode a raw search response, passing HitTables through unchanged."""
+    if isinstance(result, HitTable):
+        return result
+    return HitTable.from_response(result, decoder or HitDecoder())
+
+
+def search_response_model(
+    query: str,
+    result: SearchResult,
+    decoder: Optional[HitDecoder] = None,
+    max_field_chars: Optional[int] = None,
+    next_cursor: Optional[str] = None
+) -> SearchResponse:
+    """Convert a search response to its structured model."""
+    table = as_hit_table(result, decoder)
+    hits = [
+        SearchHit(score=score, fields=_truncate_strings(fields, max_field_chars))
+        for score, fields in table.rows()
+    ]
+    return SearchResponse(
+        query=query,
+        total_hits=table.total_hits,
+        hits=hits,
+        next_cursor=next_cursor
+    )
+
+
+def _fit_search_response(response: SearchResponse, max_bytes: int) -> str:
+    """Serialize a search response, dropping trailing hits to fit the budget."""
+    text = response.model_dump_json()
+    while _utf8_size(text) > max_bytes and response.hits:
+        keep = len(response.hits) // 2
+        response.omitted_hits += len(response.hits) - keep
+        response.hits = response.hits[:keep]
+        text = response.model_dump_json()
+    return text
+
+
+@tracing.traced("format")
+def render_search_results(
+    query: str,
+    result: SearchResult,
+    decoder: Optional[HitDecoder] = None,
+    start: int = 0,
+    mode: str = VERBOSE,
+    max_field_chars: Optional[int] = None,
+    options: RenderOptions = DEFAULT_OPTIONS,
+    next_cursor: Optional[str] = None
+) -> str:
+    """Render a search response.
+
+    Args:
+        query: The query that produced the results
+        result: Decoded hits, or a raw search response
+        decoder: Hit decoder for the searched index (only used for raw responses)
+        start: Number of hits shown before this response (for numbering)
+        mode: "verbose" (one line per field), "compact" (one line per hit)
+            or "json" (structured SearchResponse)
+        max_field_chars: Per-field character limit, overriding the mode default
+        options: Output limits
+        next_cursor: Cursor for the next page, if there is one
+
+    Returns:
+        Formatted search results
+    """
+    check_mode(mode)
+    if max_field_chars is None:
+        max_field_chars = options.field_chars(mode)
+
+    table = as_hit_table(result, decoder)
+    if mode == JSON:
+        response = search_response_model(query, table, None, max_field_chars, next_cursor)
+        return _fit_search_response(response, options.max_output_bytes)
+
+    total_hits = table.total_hits
+    if not table:
+        return f"No results found for query: '{query}'"
+
+    out = OutputBuffer(options.max_output_bytes - _NOTE_RESERVE)
+    if mode == COMPACT:
+        out.add(f"Found {total_hits} results for query: '{query}'\n")
+    else:
+        out.add(f"Found {total_hits} results for query: '{query}'\n\n")
+
+    # Read the columns directly rather than building a dict per hit
+    columns = list(table.columns.items())
+    shown = 0
+    for i, score in enumerate(table.scores):
+        if mode == COMPACT:
+            values = []
+            for name, column in columns:
+                value = column[i]
+                if value is not MISSING:
+                    values.append(f"{name}={_field_text(value, max_field_chars)}")
+            block = f"{start+i+1}. ({score:.2f}) {' | '.join(values)}\n"
+        else:
+            lines = [f"Result {start+i+1} (Score: {score:.2f}):\n"]
+            for name, column in columns:
+                value = column[i]
+                if value is not MISSING:
+                    lines.append(f"  {name}: {_field_text(value, max_field_chars)}\n")
+            lines.append("\n")
+            block = "".join(lines)
+
+        if not out.add(block):
+            break
+        shown += 1
+
+    if shown < len(table):
+        out.add_note(
+            f"... output truncated: showing {shown} of {len(table)} results "
+            f"(limit {options.max_output_bytes} bytes)\n"
+        )
+    if next_cursor is not None:
+        out.add_note(f"More results available. Next cursor: {next_cursor}\n")
+    return out.getvalue()
+
+
+@tracing.traced("format")
+def render_batch_results(
+    entries: List[Tuple[str, Optional[SearchResult], Optional[str], Optional[HitDecoder]]],
+    mode: str = VERBOSE,
+    options: RenderOptions = DEFAULT_OPTIONS
+) -> str:
+    """Render the results of a search batch.
+
+    The output budget is shared evenly between the queries.
+
+    Args:
+        entries: One (query, result, error, decoder) tuple per query, where
+            exactly one of result and error is set; the decoder is only
+            needed for raw results
+        mode: Output mode, as for render_search_results
+        options: Output limits
+
+    Returns:
+        Formatted results for each query, in input order
+    """
+    check_mode(mode)
+    failed = sum(1 for _, _, error, _ in entries if error is not None)
+    succeeded = len(entries) - failed
+    share = max(options.max_output_bytes // max(1, len(entries)), 1024)
+    query_options = replace(options, max_output_bytes=share)
+
+    if mode == JSON:
+        results = []
+        for query, result, error, decoder in entries:
+            if error is not None or result is None:
+                results.append(BatchEntry(query=query, error=error or "no result"))
+                continue
+            response = search_response_model(
+                query, result, decoder, options.field_chars(mode)
+            )
+            # Apply the per-query budget to each response
+            _fit_search_response(response, share)
+            results.append(BatchEntry(query=query, result=response))
+        return BatchResponse(succeeded=succeeded, failed=failed, results=results).model_dump_json()
+
+    sections = [f"Batch of {len(entries)} queries: {succeeded} succeeded, {failed} failed\n"]
+    for i, (query, result, error, decoder) in enumerate(entries):
+        header = f"=== Query {i+1}: '{query}' ===\n"
+        if error is not None or result is None:
+            sections.append(f"{header}Error: {error or 'no result'}\n")
+        else:
+            sections.append(header + render_search_results(
+                query, result, decoder, mode=mode, options=query_options
+            ))
+    return "\n".join(sections)
+
+
+@tracing.traced("format")
+def render_document(
+    index_name: str,
+    doc_id: str,
+    doc: Dict[str, Any],
+    decoder: HitDecoder,
+    max_field_chars: Optional[int] = None,
+    options: RenderOptions = DEFAULT_OPTIONS,
+    mode: str = VERBOSE
+) -> str:
+    """Render a document fetched by ID."""
+    check_mode(mode)
+    if max_field_chars is None:
+        max_field_chars = options.field_chars(mode)
+
+    if mode == JSON:
+        fields = decoder.decode_fields(doc.get("fields", {}))
+        document = Document(index=index_name, doc_id=doc_id, fields=_truncate_strings(fields, max_field_chars))
+        text = document.model_dump_json()
+        if _utf8_size(text) > options.max_output_bytes and fields:
+            # Share the budget between the fields
+            limit = max(options.max_output_bytes // len(fields) - 64, 16)
+            document.fields = _truncate_strings(fields, limit)
+            text = document.model_dump_json()
+        return text
+
+    out = OutputBuffer(options.max_output_bytes - _NOTE_RESERVE)
+    out.add(f"Document {doc_id} from index {index_name}:\n\n")
+
+    fields = decoder.decode_fields(doc.get("fields", {}))
+    for name, value in fields.items():
+        if not out.add(f"{name}: {_field_text(value, max_field_chars)}\n"):
+            out.add_note(f"... output truncated (limit {options.max_output_bytes} bytes)\n")
+            break
+    return out.getvalue()
+
+
+@tracing.traced("format")
+def render_documents(
+    index_name: str,
+    entries: List[Dict[str, Any]],
+    decoder: HitDecoder,
+    options: RenderOptions = DEFAULT_OPTIONS,
+    mode: str = VERBOSE
+) -> str:
+    """Render documents fetched by NRTSearchClient.get_documents.
+
+    Documents are shown in input order, each ID once, followed by the IDs
+    that were not found or could not be fetched.
+
+    Args:
+        index_name: Index the documents come from
+        entries: Results of get_documents, one per requested ID
+        decoder: Hit decoder for the index
+        options: Output limits
+        mode: "verbose" (text) or "json" (structured DocumentBatch)
+    """
+    check_mode(mode)
+    max_field_chars = options.field_chars(mode)
+    documents: List[Tuple[str, Dict[str, Any]]] = []
+    missing: List[str] = []
+    failed: Dict[str, str] = {}
+    seen = set()
+    for entry in entries:
+        doc_id = entry["doc_id"]
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        if "error" in entry:
+            failed[doc_id] = entry["error"]
+        elif entry.get("document") is None:
+            missing.append(doc_id)
+        else:
+            documents.append((doc_id, entry["document"]))
+
+    if mode == JSON:
+        batch = DocumentBatch(
+            index=index_name,
+            requested=len(seen),
+            found=len(documents),
+            missing=missing,
+            failed=failed,
+            documents=[
+                Document(
+                    index=index_name,
+                    doc_id=doc_id,
+                    fields=_truncate_strings(decoder.decode_fields(doc.get("fields", {})), max_field_chars)
+                )
+                for doc_id, doc in documents
+            ]
+        )
+        text = batch.model_dump_json()
+        while _utf8_size(text) > options.max_output_bytes and batch.documents:
+            keep = len(batch.documents) // 2
+            batch.omitted_documents += len(batch.documents) - keep
+            batch.documents = batch.documents[:keep]
+            text = batch.model_dump_json()
+        return text
+
+    out = OutputBuffer(options.max_output_bytes - _NOTE_RESERVE)
+    out.add(
+        f"Fetched {len(documents)} of {len(seen)} documents from index {index_name}"
+        f" ({len(missing)} missing, {len(failed)} failed)\n\n"
+    )
+    shown = 0
+    for doc_id, doc in documents:
+        parts = [f"=== Document {doc_id} ===\n"]
+        for name, value in decoder.decode_fields(doc.get("fields", {})).items():
+            parts.append(f"{name}: {_field_text(value, max_field_chars)}\n")
+        parts.append("\n")
+        if not out.add("".join(parts)):
+            break
+        shown += 1
+    if shown < len(documents):
+        out.add_note(
+            f"... output truncated: showing {shown} of {len(documents)} documents "
+            f"(limit {options.max_output_bytes} bytes)\n"
+        )
+    if missing:
+        out.add_note(f"Not found: {_id_list(missing)}\n")
+    for doc_id, error in list(failed.items())[:_MAX_LISTED_IDS]:
+        out.add_note(f"Failed {doc_id}: {error}\n")
+    if len(failed) > _MAX_LISTED_IDS:
+        out.add_note(f"... and {len(failed) - _MAX_LISTED_IDS} more failures\n")
+    return out.getvalue()
+
+
+def _id_list(ids: List[str]) -> str:
+    listed = ", ".join(ids[:_MAX_LISTED_IDS])
+    if len(ids) > _MAX_LISTED_IDS:
+        listed += f" and {len(ids) - _MAX_LISTED_IDS} more"
+    return listed
+
+
+@tracing.traced("format")
+def render_index_list(indexes: List[str], mode: str = VERBOSE) -> str:
+    """Render the list of available indexes."""
+    check_mode(mode)
+    if mode == JSON:
+        return IndexList(indexes=indexes).model_dump_json()
+    if not indexes:
+        return "No indexes available."
+    return "\n".join([f"- {index}" for index in indexes])
+
+
+@tracing.traced("format")
+def render_index_info(
+    index_name: str,
+    info: Dict[str, Any],
+    options: RenderOptions = DEFAULT_OPTIONS,
+    mode: str = VERBOSE
+) -> str:
+    """Render index settings and status."""
+    check_mode(mode)
+    if mode == JSON:
+        return IndexInfo(
+            index=index_name,
+            settings=info.get("settings", {}),
+            status=info.get("status", {})
+        ).model_dump_json()
+
+    out = OutputBuffer(options.max_output_bytes - _NOTE_RESERVE)
+    lines = [f"Index: {index_name}\n\n", "Settings:\n"]
+    for key, value in info.get("settings", {}).items():
+        lines.append(f"  {key}: {value}\n")
+    lines.append("\nStatus:\n")
+    for key, value in info.get("status", {}).items():
+        lines.append(f"  {key}: {value}\n")
+
+    for line in lines:
+        if not out.add(line):
+            out.add_note(f"... output truncated (limit {options.max_output_bytes} bytes)\n")
+            break
+    return out.getvalue()
+
+
+@tracing.traced("format")
+def render_field_info(
+    index_name: str,
+    fields: List[Dict[str, Any]],
+    options: RenderOptions = DEFAULT_OPTIONS,
+    mode: str = VERBOSE
+) -> str:
+    """Render an index's field definitions."""
+    check_mode(mode)
+    if mode == JSON:
+        return FieldList(
+            index=index_name,
+            fields=[
+                FieldDefinition(
+                    name=field.get("name", "unknown"),
+                    type=str(field.get("type", "unknown")),
+                    properties=field.get("properties", {})
+                )
+                for field in fields
+            ]
+        ).model_dump_json()
+
+    if not fields:
+        return f"No field definitions found for index '{index_name}'."
+
+    out = OutputBuffer(options.max_output_bytes - _NOTE_RESERVE)
+    out.add(f"Fields for index {index_name}:\n\n")
+    for field in fields:
+        lines = [f"- {field.get('name', 'unknown')} ({field.get('type', 'unknown')})\n"]
+        for prop_name, prop_value in field.get("properties", {}).items():
+            lines.append(f"  - {prop_name}: {prop_value}\n")
+        if not out.add("".join(lines)):
+            out.add_note(f"... output truncated (limit {options.max_output_bytes} bytes)\n")
+            break
+    return out.getvalue()
+
+
+def _stats_lines(value: Any, indent: str) -> List[str]:
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            if isinstance(item, (dict, list)) and item:
+                lines.append(f"{indent}{key}:\n")
+                lines.extend(_stats_lines(item, indent + "  "))
+            else:
+                lines.append(f"{indent}{key}: {_stats_scalar(item)}\n")
+        return lines
+    if isinstance(value, list):
+        lines = []
+        for item in value:
+            lines.append(f"{indent}-\n")
+            lines.extend(_stats_lines(item, indent + "  "))
+        return lines
+    return [f"{indent}{_stats_scalar(value)}\n"]
+
+
+def _stats_scalar(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if value is None or value == {} or value == []:
+        return "-"
+    return str(value)
+
+
+def render_server_stats(stats: Dict[str, Any], mode: str = VERBOSE) -> str:
+    """Render server statistics (tool latencies, endpoints, caches, policies)."""
+    check_mode(mode)
+    if mode == JSON:
+        return jsoncodec.dumps_str(stats)
+    return "".join(_stats_lines(stats, ""))
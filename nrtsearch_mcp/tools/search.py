@@ -2,7 +2,10 @@
 Search-related MCP tools for NRTSearch.
 """
 
-from typing import Any, Dict, List, Optional
+import uuid
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 # Using try-except to handle when MCP package is not available
 try:
@@ -21,19 +24,85 @@ except ImportError:
                 return func
             return decorator
 
+from nrtsearch_mcp.decoder import HitDecoder
+from nrtsearch_mcp.hits import Highlight, HitTable
 from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.render import (
+    COMPACT,
+    DEFAULT_OPTIONS,
+    VERBOSE,
+    RenderOptions,
+    SearchResult,
+    check_mode,
+    render_batch_results,
+    render_error,
+    render_search_results,
+)
+from nrtsearch_mcp.tools.projection import plan_projection, snippet_field_chars
+from nrtsearch_mcp.tools.utils import tool_call
 
+# Keys accepted in a search_batch query spec, mapped to NRTSearchClient.search arguments
+_BATCH_SPEC_KEYS = {
+    "index_name": "index_name",
+    "query": "query",
+    "filters": "filter_queries",
+    "fields": "retrieve_fields",
+    "start_hit": "start_hit",
+    "top_hits": "top_hits",
+}
 
-def register_search_tools(mcp: FastMCP, client: NRTSearchClient) -> None:
+# Maximum number of open search_pages cursors; the oldest is closed first
+MAX_OPEN_CURSORS = 64
+
+
+def _batch_spec_to_search_args(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a search_batch query spec to NRTSearchClient.search arguments.
+    
+    Raises:
+        ValueError: If the spec is missing required keys or has unknown ones
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("query spec must be an object")
+    unknown = sorted(set(spec) - set(_BATCH_SPEC_KEYS))
+    if unknown:
+        raise ValueError(f"unknown keys: {', '.join(unknown)}")
+    for required in ("index_name", "query"):
+        if not spec.get(required):
+            raise ValueError(f"missing '{required}'")
+    return {_BATCH_SPEC_KEYS[key]: value for key, value in spec.items()}
+
+
+def register_search_tools(
+    mcp: FastMCP,
+    client: NRTSearchClient,
+    render_options: Optional[RenderOptions] = None,
+    call_timeout: Optional[float] = None
+) -> None:
     """Register all search-related tools with the MCP server.
     
+    Each tool retrieves only the fields it renders, as chosen by
+    plan_projection for the call's fields and output mode. With
+    snippets=True, an index's default_search_fields are shown as a few
+    passages around the query terms instead of in full: highlighted by
+    NRTSearch where it can, and cut locally from the text otherwise.
+    
     Args:
         mcp: The MCP server instance
         client: The NRTSearch client
+        render_options: Output limits (default: RenderOptions())
+        call_timeout: Time budget in seconds for each tool call, shared by
+            every backend request it makes (default: no limit)
     """
+    options = render_options or DEFAULT_OPTIONS
     
     @mcp.tool()
-    async def search_index(index_name: str, query: str, top_hits: int = 10) -> str:
+    async def search_index(
+        index_name: str,
+        query: str,
+        top_hits: int = 10,
+        output_mode: str = VERBOSE,
+        snippets: bool = False
+    ) -> str:
         """
         Search an index with a natural language query.
         
@@ -41,46 +110,37 @@ def register_search_tools(mcp: FastMCP, client: NRTSearchClient) -> None:
             index_name: Name of the index to search
             query: Natural language query
             top_hits: Number of results to return (default: 10)
+            output_mode: "verbose" (one line per field), "compact" (one
+                line per result, long values shortened) or "json" (structured)
+            snippets: Show the matching passages of long text fields
+                instead of the full text
             
         Returns:
             Formatted search results
         """
         try:
-            result = await client.search(
-                index_name=index_name,
-                query=query,
-                top_hits=top_hits
-            )
-            
-            # Format the results in a readable way
-            hits = result.get("hits", [])
-            total_hits = result.get("totalHits", {}).get("value", 0)
-            
-            if not hits:
-                return f"No results found for query: '{query}'"
-                
-            formatted_results = f"Found {total_hits} results for query: '{query}'\n\n"
-            
-            for i, hit in enumerate(hits):
-                formatted_results += f"Result {i+1} (Score: {hit.get('score', 0):.2f}):\n"
-                
-                # Format fields
-                fields = hit.get("fields", {})
-                for field_name, field_value in fields.items():
-                    actual_value = field_value.get("fieldValue", {})
-                    
-                    # Extract the correct type of value
-                    value_type_keys = [k for k in actual_value.keys() if k.endswith("Value")]
-                    if value_type_keys:
-                        value = actual_value.get(value_type_keys[0])
-                        formatted_results += f"  {field_name}: {value}\n"
-                
-                formatted_results += "\n"
-                
-            return formatted_results
+            check_mode(output_mode)
+            with tool_call("search_index", call_timeout):
+                projection = plan_projection(
+                    client.index_configs.get(index_name), None, output_mode, options,
+                    snippets=snippets
+                )
+                hits = await client.search_hits(
+                    index_name=index_name,
+                    query=query,
+                    top_hits=top_hits,
+                    retrieve_fields=projection.retrieve_fields,
+                    highlight=projection.highlight
+                )
+                return render_search_results(
+                    query, hits,
+                    mode=output_mode,
+                    max_field_chars=snippet_field_chars(output_mode, options) if snippets else None,
+                    options=options
+                )
             
         except Exception as e:
-            return f"Error searching index: {str(e)}"
+            return render_error(f"Error searching index: {str(e)}", output_mode)
     
     @mcp.tool()
     async def search_advanced(
@@ -89,7 +149,10 @@ def register_search_tools(mcp: FastMCP, client: NRTSearchClient) -> None:
         filters: Optional[List[str]] = None,
         fields: Optional[List[str]] = None,
         start_hit: int = 0,
-        top_hits: int = 10
+        top_hits: int = 10,
+        output_mode: str = VERBOSE,
+        max_field_chars: Optional[int] = None,
+        snippets: bool = False
     ) -> str:
         """
         Perform an advanced search with filters and field selection.
@@ -101,46 +164,212 @@ def register_search_tools(mcp: FastMCP, client: NRTSearchClient) -> None:
             fields: Optional list of fields to retrieve
             start_hit: Starting position for results (for pagination)
             top_hits: Number of results to return
+            output_mode: "verbose" (one line per field), "compact" (one
+                line per result, long values shortened) or "json" (structured)
+            max_field_chars: Shorten each field value to this many characters
+            snippets: Show the matching passages of long text fields
+                instead of the full text
             
         Returns:
             Formatted search results
         """
         try:
-            result = await client.search(
-                index_name=index_name,
-                query=query,
-                start_hit=start_hit,
-                top_hits=top_hits,
-                retrieve_fields=fields,
-                filter_queries=filters
-            )
+            check_mode(output_mode)
+            with tool_call("search_advanced", call_timeout):
+                projection = plan_projection(
+                    client.index_configs.get(index_name), fields, output_mode, options,
+                    max_field_chars, snippets
+                )
+                if snippets:
+                    max_field_chars = snippet_field_chars(output_mode, options, max_field_chars)
+                hits = await client.search_hits(
+                    index_name=index_name,
+                    query=query,
+                    start_hit=start_hit,
+                    top_hits=top_hits,
+                    retrieve_fields=projection.retrieve_fields,
+                    filter_queries=filters,
+                    highlight=projection.highlight
+                )
+                return render_search_results(
+                    query, hits,
+                    mode=output_mode,
+                    max_field_chars=max_field_chars,
+                    options=options
+                )
             
-            # Format the results in a readable way
-            hits = result.get("hits", [])
-            total_hits = result.get("totalHits", {}).get("value", 0)
+        except Exception as e:
+            return render_error(f"Error performing advanced search: {str(e)}", output_mode)
+    
+    # Open search_pages cursors: cursor id -> (page iterator, hits returned so
+    # far, page size, fields to cut snippets from)
+    cursors: "OrderedDict[str, Tuple[AsyncGenerator[Dict[str, Any], None], int, int, Optional[Highlight]]]" = OrderedDict()
+    
+    @mcp.tool()
+    async def search_pages(
+        index_name: str,
+        query: str,
+        filters: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        output_mode: str = VERBOSE,
+        snippets: bool = False
+    ) -> str:
+        """
+        Page through a large result set without re-scoring earlier pages.
+        
+        Call without a cursor to get the first page. If more results are
+        available the response ends with a cursor; pass it back (with the same
+        index_name and query) to get the next page, which is already being
+        fetched in the background.
+        
+        Args:
+            index_name: Name of the index to search
+            query: Search query (can use Lucene syntax)
+            filters: Optional list of filter queries
+            fields: Optional list of fields to retrieve
+            page_size: Number of results per page (at least 1; ignored when
+                continuing from a cursor, which keeps its first page's size)
+            cursor: Cursor returned by the previous page, if any
+            output_mode: "verbose" (one line per field), "compact" (one
+                line per result, long values shortened) or "json" (structured)
+            snippets: Show the matching passages of long text fields
+                instead of the full text (cut locally from each page)
             
-            if not hits:
-                return f"No results found for query: '{query}'"
+        Returns:
+            Formatted page of search results
+        """
+        try:
+            check_mode(output_mode)
+            with tool_call("search_pages", call_timeout):
+                if cursor:
+                    entry = cursors.pop(cursor, None)
+                    if entry is None:
+                        return render_error(f"Unknown or expired cursor: '{cursor}'", output_mode)
+                    pages, offset, page_size, highlight = entry
+                else:
+                    if page_size < 1:
+                        return render_error(
+                            f"page_size must be at least 1, got {page_size}", output_mode
+                        )
+                    projection = plan_projection(
+                        client.index_configs.get(index_name), fields, output_mode, options,
+                        snippets=snippets
+                    )
+                    highlight = projection.highlight
+                    pages = client.iter_search_pages(
+                        index_name=index_name,
+                        query=query,
+                        page_size=page_size,
+                        retrieve_fields=projection.all_fields(),
+                        filter_queries=filters
+                    )
+                    offset = 0
                 
-            formatted_results = f"Found {total_hits} results for query: '{query}'\n\n"
-            
-            for i, hit in enumerate(hits):
-                formatted_results += f"Result {i+1} (Score: {hit.get('score', 0):.2f}):\n"
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    page = {"totalHits": {"value": offset}, "hits": []}
                 
-                # Format fields
-                fields = hit.get("fields", {})
-                for field_name, field_value in fields.items():
-                    actual_value = field_value.get("fieldValue", {})
+                next_cursor = None
+                returned = len(page.get("hits", []))
+                if returned < page_size:
+                    await pages.aclose()
+                else:
+                    next_cursor = uuid.uuid4().hex
+                    cursors[next_cursor] = (pages, offset + returned, page_size, highlight)
+                    while len(cursors) > MAX_OPEN_CURSORS:
+                        _, (stale, _, _, _) = cursors.popitem(last=False)
+                        await stale.aclose()
                     
-                    # Extract the correct type of value
-                    value_type_keys = [k for k in actual_value.keys() if k.endswith("Value")]
-                    if value_type_keys:
-                        value = actual_value.get(value_type_keys[0])
-                        formatted_results += f"  {field_name}: {value}\n"
-                
-                formatted_results += "\n"
+                decoder = await client.get_hit_decoder(index_name)
+                hits = HitTable.from_response(page, decoder, highlight, query)
+                return render_search_results(
+                    query, hits,
+                    start=offset,
+                    mode=output_mode,
+                    max_field_chars=snippet_field_chars(output_mode, options) if snippets else None,
+                    options=options,
+                    next_cursor=next_cursor
+                )
+            
+        except Exception as e:
+            return render_error(f"Error paging search results: {str(e)}", output_mode)
+    
+    @mcp.tool()
+    async def search_batch(
+        queries: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        output_mode: str = VERBOSE,
+        snippets: bool = False
+    ) -> str:
+        """
+        Run several searches in one call, executed concurrently.
+        
+        Each query spec takes the same arguments as search_advanced:
+        index_name and query (required), and optionally filters, fields,
+        start_hit and top_hits. A failing query is reported in its own
+        section and does not fail the batch.
+        
+        Args:
+            queries: List of query specs
+            max_concurrency: Maximum searches to run at once (capped by the
+                server's configured limit)
+            output_mode: "verbose" (one line per field), "compact" (one
+                line per result, long values shortened) or "json" (structured)
+            snippets: Show the matching passages of long text fields
+                instead of the full text, for every query
+            
+        Returns:
+            Formatted results for each query, in input order
+        """
+        try:
+            check_mode(output_mode)
+            with tool_call("search_batch", call_timeout):
+                outcomes: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+                valid_indexes = []
+                valid_args = []
+                for i, spec in enumerate(queries):
+                    try:
+                        args = _batch_spec_to_search_args(spec)
+                        projection = plan_projection(
+                            client.index_configs.get(args["index_name"]),
+                            args.get("retrieve_fields"), output_mode, options,
+                            snippets=snippets
+                        )
+                        args["retrieve_fields"] = projection.retrieve_fields
+                        args["highlight"] = projection.highlight
+                        valid_args.append(args)
+                        valid_indexes.append(i)
+                    except ValueError as e:
+                        outcomes[i] = {"error": f"Invalid query spec: {e}"}
+                    
+                results = await client.search_batch(
+                    valid_args, max_concurrency=max_concurrency, decode=True
+                )
+                for i, result in zip(valid_indexes, results):
+                    outcomes[i] = result
                 
-            return formatted_results
+                entries: List[
+                    Tuple[str, Optional[SearchResult], Optional[str], Optional[HitDecoder]]
+                ] = []
+                for spec, outcome in zip(queries, outcomes):
+                    label = spec.get("query", "") if isinstance(spec, dict) else ""
+                    if outcome is None or "error" in outcome:
+                        error = outcome["error"] if outcome else "no result"
+                        entries.append((label, None, error, None))
+                    else:
+                        entries.append((label, outcome["result"], None, None))
+                    
+                batch_options = options
+                if snippets:
+                    batch_options = replace(
+                        options,
+                        verbose_field_chars=snippet_field_chars(VERBOSE, options),
+                        compact_field_chars=snippet_field_chars(COMPACT, options)
+                    )
+                return render_batch_results(entries, mode=output_mode, options=batch_options)
             
         except Exception as e:
-            return f"Error performing advanced search: {str(e)}"
+            return render_error(f"Error performing batch search: {str(e)}", output_mode)
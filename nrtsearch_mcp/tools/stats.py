@@ -0,0 +1,54 @@
+"""
+Server statistics MCP tool.
+"""
+
+from typing import Any, Callable, List
+
+# Using try-except to handle when MCP package is not available
+try:
+    from mcp.server.fastmcp import FastMCP  # type: ignore
+except ImportError:
+    # Mock implementation for development without MCP package
+    class FastMCP:  # type: ignore[no-redef]
+        """Mock FastMCP class for development without the actual package."""
+        def __init__(self, name: str) -> None:
+            self.name = name
+            self.tools: List[Callable[..., Any]] = []
+            
+        def tool(self) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+            def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+                self.tools.append(func)
+                return func
+            return decorator
+
+from nrtsearch_mcp import metrics
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.render import VERBOSE, check_mode, render_error, render_server_stats
+
+
+def register_stats_tools(mcp: FastMCP, client: NRTSearchClient) -> None:
+    """Register the server statistics tool with the MCP server.
+    
+    Args:
+        mcp: The MCP server instance
+        client: The NRTSearch client
+    """
+    
+    @mcp.tool()
+    async def get_server_stats(output_mode: str = VERBOSE) -> str:
+        """
+        Get server statistics: tool call latencies and errors, backend
+        endpoints, cache hit rates, and retry, hedging and concurrency limits.
+        
+        Args:
+            output_mode: "verbose" (text) or "json" (structured)
+            
+        Returns:
+            Current server statistics
+        """
+        try:
+            check_mode(output_mode)
+            return render_server_stats(metrics.server_stats(client), output_mode)
+            
+        except Exception as e:
+            return render_error(f"Error retrieving server statistics: {str(e)}", output_mode)
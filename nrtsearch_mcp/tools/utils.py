@@ -2,7 +2,43 @@
 Utility functions for NRTSearch MCP tools.
 """
 
-from typing import Any, Dict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from nrtsearch_mcp import jsoncodec, metrics, tracing
+from nrtsearch_mcp.deadline import deadline
+
+
+@contextmanager
+def tool_call(name: str, call_timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    Run the body of a tool call under its deadline, recording its metrics
+    and, when tracing is enabled, its span.
+    
+    Args:
+        name: Tool name, used as the metrics label and span name
+        call_timeout: Time budget in seconds for the call (None for no limit)
+    """
+    with metrics.track_tool(name), tracing.tool_span(name), deadline(call_timeout):
+        yield
+
+
+def format_plain_value(value: Any) -> str:
+    """
+    Format a decoded field value for display.
+    
+    Scalars are shown as-is; lists (multi-valued fields) and objects are
+    shown as compact JSON.
+    
+    Args:
+        value: Decoded field value
+        
+    Returns:
+        String representation of the value
+    """
+    if isinstance(value, (list, dict)):
+        return jsoncodec.dumps_str(value)
+    return str(value)
 
 
 def format_field_value(field_value: Dict[str, Any]) -> str:
@@ -0,0 +1,418 @@
+"""
+Optional request tracing.
+
+Each sampled tool call becomes a trace: a root span for the tool, with child
+spans for the phases inside it (MCP dispatch, query normalization, each HTTP
+attempt, JSON decoding and formatting). Spans follow the OpenTelemetry data
+model (128-bit trace IDs, 64-bit span IDs, epoch-nanosecond timestamps and
+flat attributes) and are handed to a pluggable exporter once the tool span
+ends.
+
+The current span lives in a context variable, so spans started by hedges,
+retries and batch searches attach to the call that started them. When
+tracing is disabled, or a call is not sampled, no span is current and every
+helper returns a shared no-op span after a single context variable lookup.
+"""
+
+import functools
+import logging
+import random
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from nrtsearch_mcp import jsoncodec
+from nrtsearch_mcp.config import ServerConfig
+
+# The OpenTelemetry exporter needs the optional opentelemetry-api package
+try:
+    from opentelemetry import trace as otel_trace  # type: ignore
+    OPENTELEMETRY_AVAILABLE = True
+except ImportError:
+    OPENTELEMETRY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Prefix of tool span names, followed by the tool name
+TOOL_SPAN_PREFIX = "tools/call "
+
+# Attribute naming the tool a span belongs to
+TOOL_ATTRIBUTE = "mcp.tool"
+
+
+class _Trace:
+    """Spans collected for one sampled tool call."""
+
+    __slots__ = ("tracer", "spans", "dropped", "finished")
+
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+        self.spans: List["Span"] = []
+        self.dropped = 0
+        self.finished = False
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+        "attributes", "error", "_trace", "_token"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace: _Trace,
+        trace_id: int,
+        parent_id: Optional[int],
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+        self._trace = trace
+        self._token: Optional[Token] = None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def child(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        """Start a child span, or return the no-op span if the trace is full."""
+        trace = self._trace
+        if trace.finished:
+            return NOOP_SPAN
+        if len(trace.spans) >= trace.tracer.max_spans_per_trace:
+            trace.dropped += 1
+            return NOOP_SPAN
+        span = Span(name, trace, self.trace_id, self.span_id, attributes)
+        trace.spans.append(span)
+        return span
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}" if str(exc) else exc_type.__name__
+            self.attributes["exception.type"] = exc_type.__name__
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        if self.parent_id is None:
+            self._trace.tracer._finish(self._trace)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the span in OTLP/JSON field names."""
+        return {
+            "traceId": f"{self.trace_id:032x}",
+            "spanId": f"{self.span_id:016x}",
+            "parentSpanId": "" if self.parent_id is None else f"{self.parent_id:016x}",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class _NoopSpan:
+    """Stand-in used when nothing is being traced."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def child(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> "_NoopSpan":
+        return self
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current: ContextVar[Optional[Span]] = ContextVar("nrtsearch_mcp_span", default=None)
+
+# Tool whose call the MCP dispatcher decided not to sample
+_unsampled_tool: ContextVar[Optional[str]] = ContextVar("nrtsearch_mcp_unsampled_tool", default=None)
+
+
+class _UnsampledCall(_NoopSpan):
+    """No-op span for a dispatched call that was not sampled.
+
+    While it is current, the tool's own span follows the dispatcher's
+    sampling decision instead of sampling the call again.
+    """
+
+    __slots__ = ("name", "_token")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> "_UnsampledCall":
+        self._token = _unsampled_tool.set(self.name)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if self._token is not None:
+            _unsampled_tool.reset(self._token)
+            self._token = None
+
+
+class InMemoryExporter:
+    """Keeps finished traces in memory (for tests and debugging)."""
+
+    def __init__(self, max_traces: int = 1000):
+        self.max_traces = max_traces
+        self.traces: List[List[Span]] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.traces.append(spans)
+        if len(self.traces) > self.max_traces:
+            del self.traces[0]
+
+    def spans(self) -> List[Span]:
+        """All exported spans, oldest trace first."""
+        return [span for trace in self.traces for span in trace]
+
+    def clear(self) -> None:
+        self.traces.clear()
+
+
+class LoggingExporter:
+    """Logs each finished trace as one line of JSON."""
+
+    def __init__(self, log: logging.Logger = logger, level: int = logging.INFO):
+        self.log = log
+        self.level = level
+
+    def export(self, spans: List[Span]) -> None:
+        if self.log.isEnabledFor(self.level):
+            self.log.log(self.level, "trace %s", jsoncodec.dumps_str([s.to_dict() for s in spans]))
+
+
+class OpenTelemetryExporter:
+    """Replays finished traces through the OpenTelemetry API.
+
+    Spans keep their timings and parent/child structure; IDs are assigned by
+    the OpenTelemetry SDK that the application has configured (without one,
+    the API discards them).
+    """
+
+    def __init__(self, tracer: Any = None):
+        if not OPENTELEMETRY_AVAILABLE:
+            raise ImportError("The opentelemetry exporter requires the opentelemetry-api package")
+        self.tracer = tracer or otel_trace.get_tracer("nrtsearch_mcp")
+
+    def export(self, spans: List[Span]) -> None:
+        started: Dict[int, Any] = {}
+        for span in spans:
+            parent = started.get(span.parent_id) if span.parent_id is not None else None
+            otel_span = self.tracer.start_span(
+                span.name,
+                context=None if parent is None else otel_trace.set_span_in_context(parent),
+                start_time=span.start_ns,
+                attributes=span.attributes
+            )
+            if span.error:
+                otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, span.error))
+            started[span.span_id] = otel_span
+        # Children end before their parents
+        for span in reversed(spans):
+            started[span.span_id].end(end_time=span.end_ns)
+
+
+EXPORTERS: Dict[str, Callable[[], Any]] = {
+    "log": LoggingExporter,
+    "memory": InMemoryExporter,
+    "opentelemetry": OpenTelemetryExporter,
+}
+
+
+class Tracer:
+    """Starts sampled traces and hands finished ones to an exporter."""
+
+    def __init__(
+        self,
+        exporter: Any,
+        sample_rate: float = 1.0,
+        max_spans_per_trace: int = 256,
+        rng: Optional[random.Random] = None
+    ):
+        """Initialize the tracer.
+
+        Args:
+            exporter: Object with an export(spans) method, called once per trace
+            sample_rate: Fraction of tool calls traced (0-1)
+            max_spans_per_trace: Spans kept per trace; later ones are dropped
+            rng: Random source for sampling (for tests)
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.max_spans_per_trace = max(1, max_spans_per_trace)
+        self._rng = rng or random.Random()
+        self.sampled = 0
+        self.unsampled = 0
+        self.dropped_spans = 0
+        self.export_errors = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Optional["Tracer"]:
+        """Build a tracer from the server configuration.
+
+        Returns:
+            The tracer, or None if tracing is disabled
+
+        Raises:
+            ValueError: If the exporter name is unknown
+        """
+        tracing = config.tracing
+        if not tracing.enabled:
+            return None
+        if tracing.exporter not in EXPORTERS:
+            raise ValueError(
+                f"Unknown tracing exporter '{tracing.exporter}' "
+                f"(expected one of {', '.join(EXPORTERS)})"
+            )
+        return cls(
+            EXPORTERS[tracing.exporter](),
+            sample_rate=tracing.sample_rate,
+            max_spans_per_trace=tracing.max_spans_per_trace
+        )
+
+    def start(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        """Start a root span if this call is sampled, else the no-op span."""
+        if self.sample_rate < 1.0 and self._rng.random() >= self.sample_rate:
+            self.unsampled += 1
+            return NOOP_SPAN
+        self.sampled += 1
+        trace = _Trace(self)
+        span = Span(name, trace, random.getrandbits(128) or 1, None, attributes)
+        trace.spans.append(span)
+        return span
+
+    def _finish(self, trace: _Trace) -> None:
+        trace.finished = True
+        self.dropped_spans += trace.dropped
+        # Spans still running (abandoned hedges, background refreshes) are left out
+        spans = [span for span in trace.spans if span.end_ns is not None]
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            self.export_errors += 1
+            logger.warning("Failed to export trace: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "sampled": self.sampled,
+            "unsampled": self.unsampled,
+            "dropped_spans": self.dropped_spans,
+            "export_errors": self.export_errors,
+        }
+
+
+_tracer: Optional[Tracer] = None
+
+
+def configure(tracer: Optional[Tracer]) -> None:
+    """Install the process-wide tracer (None disables tracing)."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def current_span() -> Any:
+    """The span of the running operation, or the no-op span."""
+    return _current.get() or NOOP_SPAN
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """Start a child of the current span; a no-op when nothing is traced.
+
+    Args:
+        name: Span name
+        attributes: Initial span attributes
+    """
+    parent = _current.get()
+    if parent is None:
+        return NOOP_SPAN
+    return parent.child(name, attributes)
+
+
+def tool_span(name: str) -> Any:
+    """Start the span for a tool call.
+
+    If the MCP dispatcher already opened the tool's span, the time spent
+    between dispatch and the tool body is recorded as an ``mcp.dispatch``
+    child and the dispatcher's span stays current. If the dispatcher did
+    not sample the call, neither does the tool.
+
+    Args:
+        name: Tool name
+    """
+    current = _current.get()
+    if current is None:
+        if _tracer is None or _unsampled_tool.get() == name:
+            return NOOP_SPAN
+        return _tracer.start(TOOL_SPAN_PREFIX + name, {TOOL_ATTRIBUTE: name})
+    if current.parent_id is None and current.attributes.get(TOOL_ATTRIBUTE) == name:
+        dispatch = current.child("mcp.dispatch")
+        if dispatch is not NOOP_SPAN:
+            dispatch.start_ns = current.start_ns
+            dispatch.end_ns = time.time_ns()
+        return NOOP_SPAN
+    return current.child(TOOL_SPAN_PREFIX + name, {TOOL_ATTRIBUTE: name})
+
+
+def dispatch_span(name: str) -> Any:
+    """Start the span for a tool call as the MCP server receives it.
+
+    Args:
+        name: Tool name
+    """
+    if _tracer is None or _current.get() is not None:
+        return NOOP_SPAN
+    span = _tracer.start(TOOL_SPAN_PREFIX + name, {TOOL_ATTRIBUTE: name})
+    if span is NOOP_SPAN:
+        return _UnsampledCall(name)
+    return span
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator running a function in a child span when a trace is active."""
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            parent = _current.get()
+            if parent is None:
+                return func(*args, **kwargs)
+            with parent.child(name, {"code.function": func.__name__}):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore
+    return decorator
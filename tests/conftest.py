@@ -0,0 +1,45 @@
+"""
+Shared fixtures and helpers for the tests.
+"""
+
+import pytest
+
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+
+class ToolRecorder:
+    """Minimal stand-in for FastMCP that records registered tools by name."""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self, **kwargs):
+        def decorator(func):
+            self.tools[func.__name__] = func
+            return func
+        return decorator
+
+
+@pytest.fixture
+def stub():
+    """A stub NRTSearch server with the default canned responses.
+
+    Test modules that need other latencies or payloads override this
+    fixture, tuning the server it yields.
+    """
+    with StubNRTSearchServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def connect(stub):
+    """Factory for (unstarted) clients of the ``stub`` server.
+
+    Keyword arguments are passed on to NRTSearchClient.
+    """
+    def connect(**kwargs):
+        connection = NRTSearchConnection(host=stub.host, port=stub.port)
+        return NRTSearchClient(connection, **kwargs)
+    return connect
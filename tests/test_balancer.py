@@ -0,0 +1,158 @@
+"""
+Tests for routing requests across several NRTSearch endpoints.
+"""
+
+import random
+from contextlib import ExitStack
+
+import pytest
+
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.balancer import PRIMARY, REPLICA, Endpoint, LoadBalancer
+from nrtsearch_mcp.config import (
+    EndpointConfig,
+    IndexConfig,
+    NRTSearchConnection,
+    ServerConfig,
+)
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+
+def make_balancer(*endpoints, **kwargs):
+    return LoadBalancer(
+        [Endpoint("http://default", PRIMARY)],
+        {"reviews": list(endpoints)},
+        rng=random.Random(7),
+        **kwargs
+    )
+
+
+def test_choose_prefers_lower_latency_replica():
+    """Power of two choices picks the replica with the lower latency average."""
+    fast = Endpoint("http://fast", REPLICA)
+    slow = Endpoint("http://slow", REPLICA)
+    primary = Endpoint("http://primary", PRIMARY)
+    balancer = make_balancer(fast, slow, primary)
+    fast.ewma, slow.ewma, primary.ewma = 0.01, 0.5, 0.001
+
+    # With two replicas both are always drawn, so the faster one always wins
+    assert all(balancer.choose("reviews") is fast for _ in range(50))
+    # Metadata requests go to the primary
+    assert balancer.choose("reviews", PRIMARY) is primary
+    # Unknown indexes use the default endpoint
+    assert balancer.choose("other").url == "http://default"
+
+
+def test_choose_respects_weights():
+    """Equally fast replicas receive traffic in proportion to their weight."""
+    heavy = Endpoint("http://heavy", REPLICA, weight=3.0)
+    light_a = Endpoint("http://light-a", REPLICA)
+    light_b = Endpoint("http://light-b", REPLICA)
+    balancer = make_balancer(heavy, light_a, light_b)
+    counts = {heavy: 0, light_a: 0, light_b: 0}
+    for _ in range(2000):
+        counts[balancer.choose("reviews")] += 1
+    assert counts[heavy] > counts[light_a] + counts[light_b] * 0.5
+    assert counts[light_a] > 0 and counts[light_b] > 0
+
+
+def test_ejection_and_readmission():
+    """Repeated failures eject an endpoint; successes re-admit it."""
+    a = Endpoint("http://a", REPLICA)
+    b = Endpoint("http://b", REPLICA)
+    balancer = make_balancer(a, b, unhealthy_threshold=2, healthy_threshold=2)
+
+    balancer.record_failure(a)
+    assert a.healthy
+    balancer.record_failure(a)
+    assert not a.healthy and a.ejections == 1
+    assert all(balancer.choose("reviews") is b for _ in range(20))
+
+    balancer.record_success(a)
+    assert not a.healthy
+    balancer.record_success(a)
+    assert a.healthy
+
+    # With every replica ejected, requests still go somewhere
+    for endpoint in (a, b):
+        balancer.record_failure(endpoint)
+        balancer.record_failure(endpoint)
+    assert balancer.choose("reviews") in (a, b)
+
+
+def test_invalid_endpoint_role():
+    with pytest.raises(ValueError, match="role"):
+        Endpoint("http://a", "leader")
+
+
+def make_config(servers, **balancing):
+    """Config with the first server as primary and the others as replicas."""
+    primary, *replicas = servers
+    config = ServerConfig(
+        nrtsearch_connection=NRTSearchConnection(host=primary.host, port=primary.port),
+        indexes=[
+            IndexConfig(
+                name="reviews",
+                description="",
+                fields=[],
+                default_search_fields=[],
+                endpoints=[EndpointConfig(primary.host, primary.port, role="primary")] + [
+                    EndpointConfig(replica.host, replica.port) for replica in replicas
+                ]
+            )
+        ]
+    )
+    config.search_cache.enabled = False
+    config.metadata_cache.enabled = False
+    for key, value in balancing.items():
+        setattr(config.load_balancing, key, value)
+    return config
+
+
+@pytest.mark.asyncio
+async def test_searches_avoid_slow_replica():
+    """Searches go to replicas and mostly avoid the one with injected delay."""
+    with ExitStack() as stack:
+        primary, fast, slow = (
+            stack.enter_context(StubNRTSearchServer(latency=latency))
+            for latency in (0.0, 0.0, 0.05)
+        )
+        config = make_config([primary, fast, slow], health_check_interval=0)
+        async with NRTSearchClient.from_config(config) as client:
+            for i in range(40):
+                await client.search("reviews", f"query {i}")
+            await client.get_index_info("reviews")
+
+    assert primary.paths == ["/indices/reviews"]
+    assert fast.request_count + slow.request_count == 40
+    assert fast.request_count > 3 * slow.request_count
+
+
+@pytest.mark.asyncio
+async def test_health_checks_eject_and_readmit():
+    """Background health checks take a failing replica out of rotation."""
+    with ExitStack() as stack:
+        primary, good, bad = (
+            stack.enter_context(StubNRTSearchServer()) for _ in range(3)
+        )
+        config = make_config(
+            [primary, good, bad],
+            health_check_interval=0,
+            unhealthy_threshold=2,
+            healthy_threshold=1
+        )
+        async with NRTSearchClient.from_config(config) as client:
+            endpoint = next(e for e in client.balancer.endpoints() if e.url == bad.url)
+            bad.error_status = 503
+            await client.check_endpoints()
+            await client.check_endpoints()
+            assert not endpoint.healthy
+
+            before = bad.request_count
+            for i in range(10):
+                await client.search("reviews", f"query {i}")
+            assert bad.request_count == before
+
+            bad.error_status = None
+            await client.check_endpoints()
+            assert endpoint.healthy
@@ -0,0 +1,244 @@
+"""
+Tests for the in-process caches.
+"""
+
+import asyncio
+
+import pytest
+
+from nrtsearch_mcp.cache import (
+    DocumentCache,
+    MetadataCache,
+    SearchResultCache,
+    estimate_size,
+    make_search_key,
+)
+from nrtsearch_mcp.config import get_default_config
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+        
+    def __call__(self):
+        return self.now
+
+
+def test_search_key_is_canonical():
+    """Equivalent requests produce the same key."""
+    a = make_search_key(
+        "reviews", "  great   coffee ", 0, 10,
+        ["text", "stars"], ["stars:[4 TO 5]", "city:SF"]
+    )
+    b = make_search_key(
+        "reviews", "great coffee", 0, 10,
+        ["stars", "text", "stars"], ["city:SF", "stars:[4  TO 5]"]
+    )
+    assert a == b
+    assert a != make_search_key("reviews", "great coffee", 10, 10, ["stars", "text"])
+
+
+def test_lru_eviction_and_counters():
+    """The least recently used entry is evicted when the cache is full."""
+    cache = SearchResultCache(max_entries=2)
+    cache.put("a", "idx", {"n": 1})
+    cache.put("b", "idx", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    
+    cache.put("c", "idx", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+    assert cache.stats == {
+        "hits": 3, "misses": 1, "evictions": 1, "expirations": 0, "size": 2
+    }
+
+
+def test_per_index_ttl():
+    """Entries expire after their index TTL; a TTL of 0 disables caching."""
+    clock = FakeClock()
+    cache = SearchResultCache(
+        default_ttl=10.0, index_ttls={"nrt": 1.0, "live": 0}, clock=clock
+    )
+    cache.put("nrt-key", "nrt", {})
+    cache.put("snapshot-key", "snapshot", {})
+    cache.put("live-key", "live", {})
+    assert len(cache) == 2
+    
+    clock.now = 5.0
+    assert cache.get("nrt-key") is None
+    assert cache.get("snapshot-key") == {}
+    assert cache.stats["expirations"] == 1
+
+
+def test_from_config_uses_index_ttls():
+    """Per-index cache_ttl values are read from IndexConfig."""
+    config = get_default_config()
+    config.indexes[0].cache_ttl = 60.0
+    cache = SearchResultCache.from_config(config)
+    assert cache.ttl_for("yelp_reviews") == 60.0
+    assert cache.ttl_for("other") == config.search_cache.default_ttl
+    
+    config.search_cache.enabled = False
+    assert SearchResultCache.from_config(config) is None
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_search_from_cache():
+    """A repeated equivalent search does not reach the backend."""
+    calls = []
+    
+    class RecordingClient(NRTSearchClient):
+        async def _make_request(self, method, path, json_data=None):
+            calls.append(json_data)
+            return {"hits": [], "totalHits": {"value": 0}}
+    
+    config = get_default_config()
+    client = RecordingClient.from_config(config)
+    await client.search("yelp_reviews", "tacos", filter_queries=["a", "b"])
+    await client.search("yelp_reviews", " tacos", filter_queries=["b", "a"])
+    assert len(calls) == 1
+    assert client.result_cache.stats["hits"] == 1
+
+
+def test_metadata_cache_staleness_and_invalidation():
+    """Old entries are served as stale; invalidation is per index."""
+    clock = FakeClock()
+    cache = MetadataCache(ttl=10.0, clock=clock)
+    cache.put("/indices", {"indices": ["a", "b"]})
+    cache.put("/indices/a", {"settings": {}})
+    cache.put("/indices/a/fields", {"fields": []})
+    cache.put("/indices/ab", {"settings": {}})
+    assert cache.get("/indices") == ({"indices": ["a", "b"]}, True)
+    
+    clock.now = 11.0
+    assert cache.get("/indices") == ({"indices": ["a", "b"]}, False)
+    assert cache.get("/indices/missing") is None
+    assert cache.stats == {"hits": 1, "stale_hits": 1, "misses": 1, "size": 4}
+    
+    assert cache.invalidate("a") == 2
+    assert sorted(cache.paths()) == ["/indices", "/indices/ab"]
+    assert cache.invalidate() == 2
+
+
+class MetadataClient(NRTSearchClient):
+    """Client whose backend counts metadata requests per path."""
+    
+    def __init__(self, metadata_cache):
+        super().__init__(
+            get_default_config().nrtsearch_connection,
+            metadata_cache=metadata_cache,
+            known_indexes=["yelp_reviews"]
+        )
+        self.calls = []
+        self.version = 1
+        
+    async def _make_request(self, method, path, json_data=None):
+        self.calls.append(path)
+        if path == "/indices":
+            return {"indices": ["yelp_reviews"], "version": self.version}
+        if path.endswith("/fields"):
+            return {"fields": [{"name": "text", "version": self.version}]}
+        return {"settings": {"version": self.version}}
+
+
+@pytest.mark.asyncio
+async def test_client_warms_and_serves_metadata_from_cache():
+    """Metadata is fetched at start and then served without backend calls."""
+    client = MetadataClient(MetadataCache(refresh_interval=0))
+    await client.start()
+    assert sorted(client.calls) == [
+        "/indices", "/indices/yelp_reviews", "/indices/yelp_reviews/fields"
+    ]
+    
+    assert await client.get_indexes() == ["yelp_reviews"]
+    assert await client.get_field_info("yelp_reviews") == [{"name": "text", "version": 1}]
+    assert await client.get_index_info("yelp_reviews") == {"settings": {"version": 1}}
+    assert len(client.calls) == 3
+    
+    assert client.invalidate_metadata("yelp_reviews") == 2
+    await client.get_index_info("yelp_reviews")
+    assert len(client.calls) == 4
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_serves_stale_metadata_while_revalidating():
+    """A stale entry is returned immediately and refreshed in the background."""
+    clock = FakeClock()
+    client = MetadataClient(MetadataCache(ttl=10.0, refresh_interval=0, clock=clock))
+    await client.start()
+    
+    clock.now = 20.0
+    client.version = 2
+    assert await client.get_index_info("yelp_reviews") == {"settings": {"version": 1}}
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert await client.get_index_info("yelp_reviews") == {"settings": {"version": 2}}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_refreshes_metadata_in_background():
+    """The refresh loop re-fetches every cached entry on its interval."""
+    client = MetadataClient(MetadataCache(refresh_interval=0.01))
+    await client.start()
+    client.version = 2
+    await asyncio.sleep(0.05)
+    assert await client.get_indexes() == ["yelp_reviews"]
+    assert (await client._get_shared("/indices"))["version"] == 2
+    await client.close()
+    assert client._refresh_task is None
+
+
+def make_document(text_size):
+    return {"fields": {"text": {"fieldValue": [{"textValue": "x" * text_size}]}}}
+
+
+def test_document_cache_is_bounded_by_bytes():
+    small, large = make_document(100), make_document(5000)
+    cache = DocumentCache(max_bytes=estimate_size(large) + 3 * estimate_size(small))
+    for i in range(3):
+        cache.put("reviews", f"small-{i}", small)
+    cache.put("reviews", "large", large)
+    assert len(cache) == 4
+
+    # Touch small-0 so small-1 is the least recently used
+    assert cache.get("reviews", "small-0") is small
+    cache.put("reviews", "small-3", small)
+    assert cache.get("reviews", "small-1") is None
+    assert cache.get("reviews", "small-2") is small
+    assert cache.bytes <= cache.max_bytes
+
+    # Another large document pushes out the least recently used entries
+    # until it fits: here the first large one is enough
+    cache.put("reviews", "large-2", large)
+    assert cache.bytes <= cache.max_bytes
+    assert cache.stats["evictions"] == 2
+    assert cache.get("reviews", "large") is None
+    assert cache.get("reviews", "large-2") is large
+    assert cache.get("reviews", "small-0") is small
+
+
+def test_document_cache_ttl_size_limit_and_invalidation():
+    clock = FakeClock()
+    cache = DocumentCache(
+        max_document_bytes=1000, default_ttl=10, index_ttls={"live": 0}, clock=clock
+    )
+    cache.put("reviews", "1", make_document(10))
+    cache.put("reviews", "huge", make_document(5000))
+    cache.put("live", "1", make_document(10))
+    cache.put("other", "1", make_document(10))
+    assert len(cache) == 2
+    assert cache.stats["too_large"] == 1
+
+    clock.now += 10
+    assert cache.get("reviews", "1") is None
+    assert cache.stats["expirations"] == 1
+
+    assert cache.invalidate("other") == 1
+    assert len(cache) == 0
+    assert cache.bytes == 0
@@ -0,0 +1,106 @@
+"""
+Tests for per-call deadline propagation.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from nrtsearch_mcp import deadline
+from nrtsearch_mcp.retry import RetryPolicy
+from nrtsearch_mcp.tools.search import register_search_tools
+from tests.conftest import ToolRecorder
+
+
+def test_nested_deadlines_only_shorten():
+    assert deadline.remaining() is None
+    with deadline.deadline(10):
+        assert 9 < deadline.remaining() <= 10
+        with deadline.deadline(60):
+            assert deadline.remaining() <= 10
+        with deadline.deadline(1):
+            assert deadline.remaining() <= 1
+        with deadline.deadline(None):
+            assert deadline.remaining() > 9
+    assert deadline.remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_follows_tasks():
+    async def child():
+        return deadline.remaining()
+
+    with deadline.deadline(5):
+        task = asyncio.ensure_future(child())
+    assert 0 < await task <= 5
+
+    with deadline.deadline(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(deadline.DeadlineExceeded):
+            deadline.check("search")
+
+
+@pytest.fixture
+def stub(stub):
+    stub.latency = 0.1
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_is_remaining_budget(connect):
+    """A request slower than the budget is abandoned when the budget runs out."""
+    async with connect() as client:
+        started = time.perf_counter()
+        with deadline.deadline(0.03):
+            with pytest.raises(deadline.DeadlineExceeded):
+                await client.search("reviews", "slow")
+        assert time.perf_counter() - started < 0.09
+
+        # Running out of budget does not count against the endpoint
+        endpoint = client.balancer.endpoints()[0]
+        assert endpoint.failures == 0
+        assert endpoint.healthy
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_deadline(stub, connect):
+    """No retry is scheduled when its backoff would overrun the budget."""
+    stub.latency = 0.0
+    stub.error_status = 503
+    retry = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=1.0)
+    async with connect(retry=retry) as client:
+        started = time.perf_counter()
+        with deadline.deadline(0.2):
+            with pytest.raises((httpx.HTTPStatusError, deadline.DeadlineExceeded)):
+                await client.get_index_info("reviews")
+        assert time.perf_counter() - started < 0.3
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_partial_results(connect):
+    """Searches finished before the deadline are kept; the rest report errors."""
+    async with connect() as client:
+        searches = [{"index_name": "reviews", "query": f"query {i}"} for i in range(5)]
+        with deadline.deadline(0.25):
+            results = await client.search_batch(searches, max_concurrency=1)
+
+    assert len(results) == 5
+    succeeded = [r for r in results if "result" in r]
+    failed = [r for r in results if "error" in r]
+    assert 1 <= len(succeeded) <= 2
+    assert len(failed) >= 3
+    assert all(r["error"].startswith("DeadlineExceeded") for r in failed)
+    assert results[0] == succeeded[0]
+
+
+@pytest.mark.asyncio
+async def test_tool_call_timeout(connect):
+    """Tools enforce the configured per-call budget and report the timeout."""
+    async with connect() as client:
+        recorder = ToolRecorder()
+        register_search_tools(recorder, client, call_timeout=0.03)
+        output = await recorder.tools["search_index"]("reviews", "slow")
+
+    assert output.startswith("Error searching index: Deadline exceeded")
@@ -0,0 +1,42 @@
+"""
+Tests for the compiled hit decoder.
+"""
+
+from nrtsearch_mcp.decoder import HitDecoder
+
+
+SCHEMA = [
+    {"name": "review_id", "type": "ATOM"},
+    {"name": "stars", "type": "INT"},
+    {"name": "tags", "type": "ATOM"},
+    {"name": "text", "type": "TEXT"},
+]
+
+
+def test_decodes_list_and_dict_shaped_values():
+    """Both fieldValue shapes decode to plain values."""
+    decoder = HitDecoder.from_field_info(SCHEMA)
+    fields = {
+        "review_id": {"fieldValue": {"textValue": "abc"}},
+        "stars": {"fieldValue": [{"intValue": 4}]},
+        "tags": {"fieldValue": [{"textValue": "bar"}, {"textValue": "pub"}]},
+        "text": {"fieldValue": []},
+    }
+    assert decoder.decode_fields(fields) == {
+        "review_id": "abc", "stars": 4, "tags": ["bar", "pub"]
+    }
+
+
+def test_falls_back_when_value_key_differs_from_schema():
+    """A value stored under an unexpected key is still found."""
+    decoder = HitDecoder.from_field_info(SCHEMA)
+    assert decoder.decode_fields({"stars": {"fieldValue": [{"floatValue": 4.5}]}}) == {"stars": 4.5}
+
+
+def test_learns_fields_missing_from_schema():
+    """Unknown fields are scanned once and compiled for later hits."""
+    decoder = HitDecoder()
+    first = {"city": {"fieldValue": [{"textValue": "SF"}]}, "odd": {"fieldValue": {}}}
+    assert decoder.decode_fields(first) == {"city": "SF"}
+    assert decoder.decode_fields({"city": {"fieldValue": {"textValue": "LA"}}}) == {"city": "LA"}
+    assert "city" in decoder._extractors
@@ -0,0 +1,149 @@
+"""
+Tests for fetching many documents by ID.
+"""
+
+import json
+
+import pytest
+
+from nrtsearch_mcp import metrics
+from nrtsearch_mcp.cache import DocumentCache
+from nrtsearch_mcp.config import IndexConfig
+from nrtsearch_mcp.tools.index import register_index_tools
+from tests.conftest import ToolRecorder
+
+INDEX = IndexConfig(
+    name="reviews",
+    description="",
+    fields=["review_id", "stars", "text"],
+    default_search_fields=["text"],
+    id_field="review_id"
+)
+
+
+@pytest.fixture
+def stub(stub):
+    stub.set_documents(100, text_size=20)
+    return stub
+
+
+def doc_id_of(entry):
+    return entry["document"]["fields"]["review_id"]["fieldValue"][0]["textValue"]
+
+
+@pytest.mark.asyncio
+async def test_small_sets_use_parallel_getdoc(stub, connect):
+    ids = ["review-3", "nope", "review-1", "review-3"]
+    async with connect(index_configs=[INDEX]) as client:
+        entries = await client.get_documents("reviews", ids)
+
+    assert [e["doc_id"] for e in entries] == ids
+    assert doc_id_of(entries[0]) == "review-3"
+    assert entries[1]["document"] is None
+    assert doc_id_of(entries[2]) == "review-1"
+    # Duplicates are fetched once
+    assert sorted(stub.paths) == ["/getDoc"] * 3
+
+
+@pytest.mark.asyncio
+async def test_large_sets_use_one_id_search(stub, connect):
+    ids = [f"review-{i}" for i in range(60, 0, -2)] + ["missing-1"]
+    async with connect(index_configs=[INDEX], get_documents_search_threshold=10) as client:
+        entries = await client.get_documents("reviews", ids)
+
+    assert stub.paths == ["/search"]
+    assert [e["doc_id"] for e in entries] == ids
+    assert [doc_id_of(e) for e in entries[:-1]] == ids[:-1]
+    assert entries[-1]["document"] is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_id_search_falls_back_to_getdoc(stub, connect):
+    """A backend that does not support the ID search (4xx) is asked per document."""
+    answer = stub.response_body
+
+    def reject_search(method, path, request=b""):
+        return None if path == "/search" else answer(method, path, request)
+
+    stub.response_body = reject_search
+    ids = [f"review-{i}" for i in range(5)]
+    async with connect(index_configs=[INDEX], get_documents_search_threshold=2) as client:
+        entries = await client.get_documents("reviews", ids)
+
+    assert [doc_id_of(e) for e in entries] == ids
+    assert stub.paths[0] == "/search"
+    assert stub.paths[1:] == ["/getDoc"] * 5
+
+
+@pytest.mark.asyncio
+async def test_get_documents_tool(connect):
+    metrics.reset()
+    async with connect(index_configs=[INDEX]) as client:
+        tools = ToolRecorder()
+        register_index_tools(tools, client)
+        text = await tools.tools["get_documents"]("reviews", ["review-2", "ghost", "review-0"])
+        data = json.loads(
+            await tools.tools["get_documents"]("reviews", ["review-2", "ghost"], output_mode="json")
+        )
+        too_many = await tools.tools["get_documents"]("reviews", ["x"] * 1001)
+
+    assert text.startswith("Fetched 2 of 3 documents from index reviews (1 missing, 0 failed)")
+    assert text.index("=== Document review-2 ===") < text.index("=== Document review-0 ===")
+    assert "Not found: ghost" in text
+    assert data["found"] == 1
+    assert data["missing"] == ["ghost"]
+    assert data["documents"][0]["doc_id"] == "review-2"
+    assert too_many.startswith("Error retrieving documents: too many document IDs")
+    assert metrics.TOOL_ERRORS.get("get_documents", "ValueError") == 1
+
+
+@pytest.mark.asyncio
+async def test_search_hits_fill_the_document_cache(stub, connect):
+    """A getDoc for a document just returned by a search costs no request."""
+    async with connect(index_configs=[INDEX], document_cache=DocumentCache()) as client:
+        await client.search("reviews", "coffee", retrieve_fields=INDEX.fields)
+        document = await client.get_document("reviews", "review-4")
+        entries = await client.get_documents("reviews", ["review-1", "review-2"])
+        assert stub.paths == ["/search"]
+        assert document["fields"]["review_id"]["fieldValue"][0]["textValue"] == "review-4"
+        assert all(e["document"] is not None for e in entries)
+
+        # Documents not in any hit are fetched once, then served from the cache
+        await client.get_document("reviews", "review-50")
+        await client.get_document("reviews", "review-50")
+        assert stub.paths == ["/search", "/getDoc"]
+
+
+@pytest.mark.asyncio
+async def test_partial_hits_are_not_cached(stub, connect):
+    partial = IndexConfig(
+        name="reviews", description="", fields=["review_id", "useful"],
+        default_search_fields=[], id_field="review_id"
+    )
+    async with connect(index_configs=[partial], document_cache=DocumentCache()) as client:
+        await client.search("reviews", "coffee")
+        await client.get_document("reviews", "review-1")
+
+    assert stub.paths == ["/search", "/getDoc"]
+
+
+@pytest.mark.asyncio
+async def test_dict_shaped_hits_are_cached(stub, connect):
+    """Hits with the dict-shaped ``fieldValue`` are cached by their ID too."""
+    stub.set_response("/search", {
+        "totalHits": {"value": 2},
+        "hits": [
+            {"score": 1.0, "fields": {
+                "review_id": {"fieldValue": {"textValue": f"dict-{i}"}},
+                "stars": {"fieldValue": {"intValue": 5}},
+                "text": {"fieldValue": {"textValue": "Great restaurant!"}}
+            }}
+            for i in range(2)
+        ]
+    })
+    async with connect(index_configs=[INDEX], document_cache=DocumentCache()) as client:
+        await client.search("reviews", "great", retrieve_fields=INDEX.fields)
+        document = await client.get_document("reviews", "dict-1")
+
+    assert stub.paths == ["/search"]
+    assert document["fields"]["review_id"]["fieldValue"] == {"textValue": "dict-1"}
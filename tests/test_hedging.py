@@ -0,0 +1,121 @@
+"""
+Tests for hedged search requests.
+"""
+
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.hedging import HedgePolicy
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from tests.test_balancer import make_config
+
+
+def test_delay_waits_for_samples_and_tracks_percentile():
+    policy = HedgePolicy(percentile=90, min_samples=5, min_delay=0.002)
+    for latency in (0.001, 0.001, 0.001, 0.001):
+        policy.observe(latency)
+    assert policy.delay() is None
+
+    for latency in (0.001, 0.001, 0.001, 0.001, 0.001, 0.05):
+        policy.observe(latency)
+    # 10 samples: the 90th percentile is the 9th smallest, floored at min_delay
+    assert policy.delay() == 0.002
+    policy.observe(0.05)
+    assert policy.delay() == 0.05
+
+
+def test_budget_limits_extra_requests():
+    """At most budget_percent of searches are hedged."""
+    policy = HedgePolicy(budget_percent=10)
+    granted = 0
+    for _ in range(100):
+        policy.start()
+        granted += policy.try_acquire()
+    assert granted == 10
+    assert policy.stats()["hedges"] == 10
+    assert policy.stats()["budget_exhausted"] == 90
+
+
+@pytest.fixture
+def cluster():
+    """A primary and two replicas, all answering in 10ms."""
+    with ExitStack() as stack:
+        yield [stack.enter_context(StubNRTSearchServer(latency=0.01)) for _ in range(3)]
+
+
+def hedged_client(servers, **hedging):
+    config = make_config(servers, health_check_interval=0)
+    config.hedging.enabled = True
+    config.hedging.min_samples = 5
+    config.hedging.percentile = 90
+    for key, value in hedging.items():
+        setattr(config.hedging, key, value)
+    return NRTSearchClient.from_config(config)
+
+
+@pytest.mark.asyncio
+async def test_hedge_answers_when_replica_is_slow(cluster):
+    """A duplicate sent to the second replica wins over a stalled one."""
+    primary, a, b = cluster
+    async with hedged_client(cluster, budget_percent=50) as client:
+        for i in range(10):
+            await client.search("reviews", f"warm-up {i}")
+        before = client.hedging.stats()
+
+        # Stall replica a and make the balancer pick it first
+        a.latency = 1.0
+        endpoint_a, endpoint_b = (
+            next(e for e in client.balancer.endpoints() if e.url == stub.url)
+            for stub in (a, b)
+        )
+        endpoint_a.ewma, endpoint_b.ewma = 0.0001, 1.0
+
+        started = time.perf_counter()
+        result = await client.search("reviews", "slow query")
+        elapsed = time.perf_counter() - started
+
+    assert len(result["hits"]) == 10
+    assert elapsed < 0.5
+    stats = client.hedging.stats()
+    assert stats["hedges"] == before["hedges"] + 1
+    assert stats["hedge_wins"] == before["hedge_wins"] + 1
+    assert primary.paths.count("/search") == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget(cluster):
+    """Once the budget is spent, slow searches wait for the first replica."""
+    primary, a, b = cluster
+    async with hedged_client(cluster, budget_percent=0) as client:
+        # A known 10ms hedge delay, instead of one measured from warm-up searches
+        for _ in range(5):
+            client.hedging.observe(0.01)
+        a.latency = b.latency = 0.1
+        await client.search("reviews", "slow query")
+
+    assert client.hedging.stats()["hedges"] == 0
+    assert client.hedging.stats()["budget_exhausted"] == 1
+    assert a.request_count + b.request_count == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_searches_are_retried(cluster):
+    """A failed attempt is retried on another replica, as without hedging."""
+    primary, a, b = cluster
+    a.error_status = 503
+    async with hedged_client(cluster) as client:
+        endpoint_a, endpoint_b = (
+            next(e for e in client.balancer.endpoints() if e.url == stub.url)
+            for stub in (a, b)
+        )
+        endpoint_a.ewma, endpoint_b.ewma = 0.0001, 1.0
+        client.retry.base_delay = 0
+        result = await client.search("reviews", "query")
+
+    assert len(result["hits"]) == 10
+    assert (a.paths, b.paths) == (["/search"], ["/search"])
+    assert client.retry.stats()["requests"] == 1
+    assert client.retry.stats()["retries"] == 1
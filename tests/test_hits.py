@@ -0,0 +1,57 @@
+"""
+Tests for the columnar HitTable.
+"""
+
+import asyncio
+
+import pytest
+
+from nrtsearch_mcp.cache import SearchResultCache, make_search_key
+from nrtsearch_mcp.decoder import HitDecoder
+from nrtsearch_mcp.hits import HitTable
+from nrtsearch_mcp.tools.render import render_search_results
+from tests.test_render import make_result
+from tests.test_search_tools import BatchClient
+
+
+def test_from_response_stores_columns():
+    result = make_result(3)
+    del result["hits"][1]["fields"]["text"]
+    result["hits"][2]["fields"]["stars"] = {"fieldValue": [{"intValue": 5}]}
+    result["searchState"] = {"lastDocId": 2}
+
+    table = HitTable.from_response(result, HitDecoder())
+
+    assert len(table) == 3
+    assert table.total_hits == 3
+    assert list(table.scores) == [0.9, 0.9, 0.9]
+    assert list(table.columns) == ["review_id", "text", "stars"]
+    assert table.fields(0) == {"review_id": "r0", "text": "Great restaurant!"}
+    assert table.fields(1) == {"review_id": "r1"}
+    assert table.fields(2) == {"review_id": "r2", "text": "Great restaurant!", "stars": 5}
+    assert table.search_state == {"lastDocId": 2}
+    assert not hasattr(table, "__dict__")
+
+
+@pytest.mark.parametrize("mode", ["verbose", "compact", "json"])
+def test_rendering_a_table_matches_the_raw_response(mode):
+    result = make_result(4, text="x" * 300)
+    table = HitTable.from_response(result, HitDecoder())
+    assert render_search_results("food", table, mode=mode) == (
+        render_search_results("food", result, HitDecoder(), mode=mode)
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_hits_caches_the_decoded_table():
+    client = BatchClient(result_cache=SearchResultCache())
+    first, second = await asyncio.gather(
+        client.search_hits("yelp_reviews", "tacos"),
+        client.search_hits("yelp_reviews", "tacos")
+    )
+    assert first is second
+    assert first.fields(0) == {"text": "about tacos"}
+    assert await client.search_hits("yelp_reviews", " tacos ") is first
+    assert client.result_cache.stats["hits"] == 1
+    key = ("hits",) + make_search_key("yelp_reviews", "tacos")
+    assert client.result_cache.get(key) is first
@@ -0,0 +1,30 @@
+"""
+Tests for the pluggable JSON codec.
+"""
+
+import pytest
+
+from nrtsearch_mcp import jsoncodec
+
+
+@pytest.fixture(params=sorted(jsoncodec.AVAILABLE_CODECS))
+def codec(request):
+    """Run a test against every installed JSON backend."""
+    previous = jsoncodec.get_codec().name
+    yield jsoncodec.use_codec(request.param)
+    jsoncodec.use_codec(previous)
+
+
+def test_round_trip_from_bytes(codec):
+    """Objects survive encode/decode, and decoding accepts bytes."""
+    document = {"hits": [{"score": 0.5, "fields": {"text": {"fieldValue": [{"textValue": "café"}]}}}]}
+    encoded = jsoncodec.dumps(document)
+    assert isinstance(encoded, bytes)
+    assert jsoncodec.loads(encoded) == document
+    assert jsoncodec.dumps_str(["a", 1]) == '["a",1]'
+
+
+def test_unknown_backend_is_rejected():
+    """Selecting a backend that is not installed fails clearly."""
+    with pytest.raises(ValueError, match="not available"):
+        jsoncodec.use_codec("simdjson")
@@ -0,0 +1,129 @@
+"""
+Tests for the adaptive concurrency limiter.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.limiter import (
+    HIGH_PRIORITY,
+    LOW_PRIORITY,
+    AdaptiveLimiter,
+    LimiterRejected,
+)
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+
+def test_aimd_adjusts_limit():
+    """Fast successes grow the limit; drops and slow requests shrink it."""
+    limiter = AdaptiveLimiter(initial_limit=4, min_limit=2, max_limit=5, latency_threshold=1.0)
+    limiter.inflight = 4
+    for _ in range(4):
+        limiter.inflight += 1
+        limiter.release(latency=0.01)
+    assert limiter.limit == pytest.approx(5.0, abs=0.1)
+
+    limiter.inflight += 1
+    limiter.release(dropped=True)
+    assert limiter.limit == pytest.approx(4.5, abs=0.1)
+
+    for _ in range(20):
+        limiter.inflight += 1
+        limiter.release(latency=5.0)
+    assert limiter.limit == 2
+    assert limiter.stats()["drops"] == 21
+
+
+def test_idle_limit_does_not_grow():
+    """Successes only raise the limit while it is actually being used."""
+    limiter = AdaptiveLimiter(initial_limit=10)
+    for _ in range(50):
+        limiter.inflight += 1
+        limiter.release(latency=0.01)
+    assert limiter.limit == 10
+
+
+@pytest.mark.asyncio
+async def test_queue_admits_high_priority_first():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, queue_timeout=1.0)
+    await limiter.acquire()
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+        limiter.release(latency=0.01)
+
+    tasks = [
+        asyncio.ensure_future(request("search-1", LOW_PRIORITY)),
+        asyncio.ensure_future(request("search-2", LOW_PRIORITY)),
+        asyncio.ensure_future(request("metadata", HIGH_PRIORITY)),
+    ]
+    await asyncio.sleep(0)
+    assert limiter.waiting == 3
+
+    limiter.release(latency=0.01)
+    await asyncio.gather(*tasks)
+    assert order == ["metadata", "search-1", "search-2"]
+    assert limiter.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_rejections():
+    """Requests are rejected when the queue is full or the wait times out."""
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_queue=1, queue_timeout=0.05)
+    await limiter.acquire()
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(LimiterRejected, match="queue is full"):
+        await limiter.acquire()
+    with pytest.raises(LimiterRejected, match="Timed out"):
+        await waiting
+
+    stats = limiter.stats()
+    assert stats["rejected_full"] == 1
+    assert stats["rejected_timeout"] == 1
+    assert stats["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1)
+    await limiter.acquire()
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert limiter.waiting == 0
+    limiter.release(latency=0.01)
+    assert limiter.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_client_caps_outstanding_requests():
+    """A burst of searches never has more than the limit outstanding."""
+    with StubNRTSearchServer(latency=0.02) as stub:
+        limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=2)
+        connection = NRTSearchConnection(host=stub.host, port=stub.port)
+        async with NRTSearchClient(connection, limiter=limiter) as client:
+            peak = 0
+
+            async def search(i):
+                nonlocal peak
+                task = asyncio.ensure_future(client.search("reviews", f"query {i}"))
+                await asyncio.sleep(0.005)
+                peak = max(peak, limiter.inflight)
+                return await task
+
+            results = await asyncio.gather(*(search(i) for i in range(8)))
+
+    assert len(results) == 8
+    assert peak <= 2
+    assert limiter.stats()["queued"] > 0
+    assert limiter.inflight == 0
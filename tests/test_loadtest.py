@@ -0,0 +1,46 @@
+"""
+Tests for the stub server's tuning knobs and the load-test harness.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from benchmarks import loadtest
+from benchmarks.stub_server import StubNRTSearchServer
+
+
+def test_stub_injects_errors_and_serves_overrides():
+    with StubNRTSearchServer(error_rate=0.5, seed=3) as stub:
+        stub.set_response("/indices", {"indices": ["a", "b"]})
+        with httpx.Client(base_url=stub.url) as http:
+            statuses = [http.get("/v1/indices").status_code for _ in range(40)]
+            stub.error_rate = 0.0
+            assert http.get("/indices").json() == {"indices": ["a", "b"]}
+            stub.set_search_payload(num_hits=2, text_size=10)
+            assert len(http.post("/search", json={}).json()["hits"]) == 2
+
+    assert statuses.count(503) == stub.injected_errors
+    assert 10 < stub.injected_errors < 30
+
+
+@pytest.mark.asyncio
+async def test_loadtest_reports_comparable_results(tmp_path, capsys):
+    args = loadtest.parse_args([
+        "--workload", "mixed", "--concurrency", "1,4", "--requests", "40", "--warmup", "5",
+        "--latency", "0", "--jitter", "0",
+    ])
+    results = await loadtest.main(args)
+
+    assert [r["concurrency"] for r in results] == [1, 4]
+    for result in results:
+        assert result["calls"] == 40
+        assert result["errors"] == 0
+        assert result["throughput_rps"] > 0
+        assert result["latency"]["p50_ms"] <= result["latency"]["p99_ms"]
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"meta": {"commit": "abc123"}, "results": results}))
+    loadtest.compare(results, str(baseline))
+    assert capsys.readouterr().out.count("throughput    +0.0%") == 2
@@ -0,0 +1,51 @@
+"""
+Tests for debug logging of request and response bodies.
+"""
+
+import logging
+import random
+
+import pytest
+
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.logpreview import BodyPreview, PayloadSampler
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+
+def test_preview_is_capped():
+    assert str(BodyPreview(b'{"hits": []}', 100)) == '{"hits": []}'
+    assert str(BodyPreview(b"x" * 50, 10)) == "xxxxxxxxxx... (50 bytes)"
+    assert str(BodyPreview(None)) == "<empty>"
+    # A cut through a multi-byte character does not fail
+    assert str(BodyPreview("é".encode("utf-8") * 3, 3)).startswith("é")
+
+
+def test_sampling_rate():
+    sampler = PayloadSampler(rate=0.2, rng=random.Random(3))
+    sampled = sum(sampler.sample() for _ in range(1000))
+    assert 150 < sampled < 250
+    assert not any(PayloadSampler(rate=0.0).sample() for _ in range(100))
+    assert all(PayloadSampler(rate=1.0).sample() for _ in range(100))
+
+
+@pytest.mark.asyncio
+async def test_request_logging(caplog):
+    with StubNRTSearchServer(num_hits=5, text_size=500) as stub:
+        connection = NRTSearchConnection(host=stub.host, port=stub.port)
+        sampler = PayloadSampler(rate=1.0, max_chars=200)
+        async with NRTSearchClient(connection, payload_sampler=sampler) as client:
+            with caplog.at_level(logging.INFO, logger="nrtsearch_mcp.nrtsearch_api"):
+                await client.search("reviews", "quiet")
+            assert not caplog.records
+
+            with caplog.at_level(logging.DEBUG, logger="nrtsearch_mcp.nrtsearch_api"):
+                await client.search("reviews", "coffee")
+
+    messages = [record.getMessage() for record in caplog.records]
+    payload = next(m for m in messages if "response:" in m)
+    assert '"queryText": "coffee"' in payload or '"queryText":"coffee"' in payload
+    # The response preview stops at the cap and reports the full size
+    response_preview = payload.split("response: ", 1)[1]
+    assert len(response_preview) < 250
+    assert response_preview.endswith(" bytes)")
@@ -0,0 +1,135 @@
+"""
+Tests for Prometheus-style metrics and the server statistics tool.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from nrtsearch_mcp import metrics
+from nrtsearch_mcp.cache import DocumentCache, MetadataCache, SearchResultCache
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.limiter import AdaptiveLimiter
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.search import register_search_tools
+from nrtsearch_mcp.tools.stats import register_stats_tools
+from tests.conftest import ToolRecorder
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = metrics.Histogram("latency_seconds", "Latency", ["tool"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "search")
+
+    assert histogram.count("search") == 5
+    assert histogram.quantile(0.2, "search") == pytest.approx(0.05)
+    assert 0.1 < histogram.quantile(0.6, "search") <= 1.0
+    assert histogram.quantile(0.5, "other") is None
+    assert histogram.render() == [
+        'latency_seconds_bucket{tool="search",le="0.1"} 2',
+        'latency_seconds_bucket{tool="search",le="1.0"} 4',
+        'latency_seconds_bucket{tool="search",le="+Inf"} 5',
+        'latency_seconds_sum{tool="search"} 6.1',
+        'latency_seconds_count{tool="search"} 5',
+    ]
+
+
+def test_track_tool_counts_errors_by_class():
+    with metrics.track_tool("search_index"):
+        assert metrics.TOOL_INFLIGHT.get("search_index") == 1
+    with pytest.raises(ValueError):
+        with metrics.track_tool("search_index"):
+            raise ValueError("bad query")
+
+    assert metrics.TOOL_INFLIGHT.get("search_index") == 0
+    assert metrics.TOOL_DURATION.count("search_index") == 2
+    assert metrics.TOOL_ERRORS.get("search_index", "ValueError") == 1
+
+
+def test_path_label_hides_index_names():
+    assert metrics.path_label("/search") == "/search"
+    assert metrics.path_label("/indices/reviews") == "/indices/{index}"
+    assert metrics.path_label("/indices/reviews/fields") == "/indices/{index}/fields"
+
+
+@pytest.mark.asyncio
+async def test_backend_and_tool_metrics_are_exposed(stub, connect):
+    async with connect(result_cache=SearchResultCache(), limiter=AdaptiveLimiter()) as client:
+        recorder = ToolRecorder()
+        register_search_tools(recorder, client)
+        await recorder.tools["search_index"]("reviews", "coffee")
+        await recorder.tools["search_index"]("reviews", "coffee")
+        stub.error_status = 500
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_index_info("reviews")
+        text = metrics.render(client)
+
+    endpoint = f"http://{stub.host}:{stub.port}"
+    assert metrics.TOOL_DURATION.count("search_index") == 2
+    assert metrics.BACKEND_DURATION.count(endpoint, "/search") == 1
+    assert metrics.BACKEND_BYTES_RECEIVED.get(endpoint) > 0
+    assert metrics.BACKEND_ERRORS.get(endpoint, "HTTPStatusError") >= 1
+
+    assert "# TYPE nrtsearch_mcp_tool_duration_seconds histogram" in text
+    assert 'nrtsearch_mcp_tool_duration_seconds_count{tool="search_index"} 2' in text
+    assert 'nrtsearch_mcp_cache_hits_total{cache="search_cache"} 1' in text
+    assert f'nrtsearch_mcp_endpoint_healthy{{endpoint="{endpoint}",role="primary"}}' in text
+    assert "nrtsearch_mcp_concurrency_limit" in text
+
+
+def test_each_family_is_declared_once():
+    """Samples of every cache share one HELP/TYPE header per family."""
+    client = NRTSearchClient(
+        NRTSearchConnection(host="localhost", port=8000),
+        result_cache=SearchResultCache(),
+        metadata_cache=MetadataCache(),
+        document_cache=DocumentCache()
+    )
+    lines = metrics.render(client).splitlines()
+    types = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+
+    assert len(types) == len(set(types))
+    hits = [line for line in lines if line.startswith("nrtsearch_mcp_cache_hits_total{")]
+    assert [line.split('"')[1] for line in hits] == ["search_cache", "metadata_cache", "document_cache"]
+    # Samples follow their family's header
+    first = lines.index("# TYPE nrtsearch_mcp_cache_hits_total counter")
+    assert lines[first + 1:first + 4] == hits
+
+
+@pytest.mark.asyncio
+async def test_get_server_stats_tool(stub, connect):
+    async with connect(result_cache=SearchResultCache(), limiter=AdaptiveLimiter()) as client:
+        recorder = ToolRecorder()
+        register_search_tools(recorder, client)
+        register_stats_tools(recorder, client)
+        await recorder.tools["search_index"]("reviews", "coffee")
+        await recorder.tools["search_index"]("reviews", "coffee")
+
+        stats = json.loads(await recorder.tools["get_server_stats"](output_mode="json"))
+        verbose = await recorder.tools["get_server_stats"]()
+
+    assert stats["tools"]["search_index"]["calls"] == 2
+    assert stats["tools"]["search_index"]["errors"] == 0
+    assert stats["search_cache"]["hit_rate"] == pytest.approx(0.5)
+    assert stats["endpoints"][0]["requests"] == len(stub.paths)
+    assert "search_index:\n" in verbose
+    assert "hit_rate: 0.500" in verbose
+
+
+def test_metrics_route():
+    """The HTTP app serves the metrics in the Prometheus text format."""
+    server = pytest.importorskip("nrtsearch_mcp.server")
+    testclient = pytest.importorskip("starlette.testclient")
+    response = testclient.TestClient(server.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    assert "# TYPE nrtsearch_mcp_backend_request_duration_seconds histogram" in response.text
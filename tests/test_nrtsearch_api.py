@@ -0,0 +1,110 @@
+"""
+Tests for the NRTSearch API client.
+"""
+
+import asyncio
+
+import pytest
+
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_connections(stub, connect):
+    """Sequential requests share one keep-alive connection."""
+    async with connect() as client:
+        for _ in range(5):
+            result = await client.search("yelp_reviews", "tacos")
+            assert len(result["hits"]) == 10
+            
+    assert stub.request_count == 5
+    assert stub.connection_count == 1
+
+
+@pytest.mark.asyncio
+async def test_client_lifecycle(connect):
+    """The client starts lazily and can be closed and restarted."""
+    client = connect()
+    assert not client.is_started
+    
+    assert await client.get_indexes() == ["yelp_reviews"]
+    assert client.is_started
+    
+    await client.close()
+    assert not client.is_started
+    await client.close()
+    
+    await client.start()
+    assert await client.get_indexes() == ["yelp_reviews"]
+    await client.close()
+
+
+class PagingClient(NRTSearchClient):
+    """Client backed by an in-memory result set of ``total`` ranked docs."""
+    
+    def __init__(self, total, with_search_state=True):
+        super().__init__(NRTSearchConnection(host="localhost", port=8000))
+        self.total = total
+        self.with_search_state = with_search_state
+        self.requests = []
+        
+    async def _make_request(self, method, path, json_data=None):
+        self.requests.append(json_data)
+        if "searchAfter" in json_data:
+            start = json_data["searchAfter"]["lastDocId"] + 1
+        else:
+            start = json_data["startHit"]
+        doc_ids = range(start, min(start + json_data["topHits"], self.total))
+        response = {
+            "totalHits": {"value": self.total},
+            "hits": [{"luceneDocId": d, "score": 1.0, "fields": {}} for d in doc_ids]
+        }
+        if self.with_search_state and doc_ids:
+            response["searchState"] = {"lastDocId": doc_ids[-1], "lastScore": 1.0}
+        return response
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_uses_search_after_and_prefetches():
+    """Pages continue from the previous cursor and the next page is prefetched."""
+    client = PagingClient(total=25)
+    seen = []
+    async for page in client.iter_search_pages("idx", "q", page_size=10):
+        # The following page is requested while this one is consumed
+        await asyncio.sleep(0)
+        assert len(client.requests) == min(len(seen) // 10 + 2, 3)
+        seen.extend(hit["luceneDocId"] for hit in page["hits"])
+        
+    assert seen == list(range(25))
+    assert all(r["startHit"] == 0 for r in client.requests)
+    assert "searchAfter" not in client.requests[0]
+    assert client.requests[1]["searchAfter"]["lastDocId"] == 9
+    assert client.requests[2]["searchAfter"]["lastDocId"] == 19
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_max_hits_and_start_hit_fallback():
+    """max_hits bounds the walk; without searchState pages use startHit."""
+    client = PagingClient(total=100, with_search_state=False)
+    seen = []
+    async for page in client.iter_search_pages("idx", "q", page_size=10, max_hits=25):
+        seen.extend(hit["luceneDocId"] for hit in page["hits"])
+        
+    assert seen == list(range(25))
+    assert [(r["startHit"], r["topHits"]) for r in client.requests] == [(0, 10), (10, 10), (20, 5)]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_close_cancels_prefetch():
+    """Stopping early cancels the in-flight prefetch."""
+    client = PagingClient(total=100)
+    pages = client.iter_search_pages("idx", "q", page_size=10)
+    first = await pages.__anext__()
+    assert len(first["hits"]) == 10
+    await asyncio.sleep(0)
+    assert len(client.requests) == 2
+    
+    await pages.aclose()
+    await asyncio.sleep(0)
+    assert len(client.requests) == 2
@@ -0,0 +1,167 @@
+"""
+Tests for field projection in the search tools.
+"""
+
+import json
+
+import pytest
+
+from nrtsearch_mcp.config import IndexConfig
+from nrtsearch_mcp.hits import Highlight
+from nrtsearch_mcp.tools.projection import Projection, plan_projection
+from nrtsearch_mcp.tools.render import DEFAULT_OPTIONS
+from nrtsearch_mcp.tools.search import register_search_tools
+from tests.conftest import ToolRecorder
+
+INDEX = IndexConfig(
+    name="reviews",
+    description="Reviews",
+    fields=["review_id", "stars", "text"],
+    default_search_fields=["text"],
+    id_field="review_id"
+)
+
+
+def test_plan_projection():
+    plan = plan_projection
+    assert plan(None, None, "verbose", DEFAULT_OPTIONS) == Projection()
+    assert plan(None, ["text"], "compact", DEFAULT_OPTIONS) == Projection(["text"])
+    assert plan(INDEX, None, "verbose", DEFAULT_OPTIONS) == Projection(INDEX.fields)
+    assert plan(INDEX, None, "json", DEFAULT_OPTIONS) == Projection(INDEX.fields)
+    assert plan(INDEX, ["stars", "stars"], "compact", DEFAULT_OPTIONS) == Projection(["stars"])
+
+    compact = plan(INDEX, None, "compact", DEFAULT_OPTIONS)
+    assert compact.retrieve_fields == ["review_id", "stars"]
+    assert compact.highlight == Highlight(("text",), fragment_chars=160)
+    assert compact.all_fields() == ["review_id", "stars", "text"]
+
+    # A caller-given character limit is a preview in any mode
+    limited = plan(INDEX, ["text"], "verbose", DEFAULT_OPTIONS, max_field_chars=50)
+    assert limited == Projection([], Highlight(("text",), fragment_chars=50))
+
+
+@pytest.fixture
+def stub(stub):
+    stub.set_search_payload(num_hits=3, text_size=2000)
+    return stub
+
+
+def search_requests(client):
+    """Record the bodies of /search requests sent by ``client``."""
+    requests = []
+    send = client._make_request
+
+    async def recording(method, path, json_data=None):
+        if path == "/search":
+            requests.append(dict(json_data))
+        return await send(method, path, json_data)
+
+    client._make_request = recording
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_compact_search_previews_text_with_highlights(connect):
+    async with connect(index_configs=[INDEX]) as client:
+        requests = search_requests(client)
+        tools = ToolRecorder()
+        register_search_tools(tools, client)
+        compact = await tools.tools["search_index"]("reviews", "lorem", output_mode="compact")
+        verbose = await tools.tools["search_index"]("reviews", "lorem")
+
+    assert requests[0]["retrieveFields"] == ["review_id", "stars"]
+    assert requests[0]["highlight"] == {
+        "fields": ["text"], "settings": {"fragmentSize": 160, "maxNumberOfFragments": 1}
+    }
+    assert "1. (1.00) review_id=review-0 | stars=1 | text=lorem ipsum" in compact
+    assert "business_id" not in compact
+
+    assert requests[1]["retrieveFields"] == INDEX.fields
+    assert "highlight" not in requests[1]
+    assert len(verbose) > 3 * 2000 > 3 * len(compact)
+
+
+@pytest.mark.asyncio
+async def test_rejected_highlighting_retrieves_full_text(stub, connect):
+    stub.highlighting = False
+    async with connect(index_configs=[INDEX]) as client:
+        requests = search_requests(client)
+        tools = ToolRecorder()
+        register_search_tools(tools, client)
+        first = await tools.tools["search_index"]("reviews", "lorem", output_mode="compact")
+        second = await tools.tools["search_index"]("reviews", "ipsum", output_mode="compact")
+
+    assert first.startswith("Found 3 results") and second.startswith("Found 3 results")
+    assert "text=lorem ipsum" in first
+    # Only the first search asked for highlights; the index is remembered
+    assert ["highlight" in r for r in requests] == [True, False, False]
+    assert requests[1]["retrieveFields"] == ["review_id", "stars", "text"]
+
+
+@pytest.mark.asyncio
+async def test_bad_query_does_not_disable_highlighting(stub, connect):
+    """A client error that is about the query keeps highlighting on."""
+    answer = stub.response_body
+
+    def reject_bad_queries(method, path, request=b""):
+        if path == "/search" and json.loads(request)["queryText"] == "bad:(":
+            return None
+        return answer(method, path, request)
+
+    stub.response_body = reject_bad_queries
+    async with connect(index_configs=[INDEX]) as client:
+        requests = search_requests(client)
+        tools = ToolRecorder()
+        register_search_tools(tools, client)
+        bad = await tools.tools["search_index"]("reviews", "bad:(", output_mode="compact")
+        good = await tools.tools["search_index"]("reviews", "lorem", output_mode="compact")
+        assert client.stats()["highlight_rejected"] == []
+
+    assert bad.startswith("Error")
+    assert good.startswith("Found 3 results")
+    # The bad query was retried once without highlights; later searches still ask
+    assert ["highlight" in r for r in requests] == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_hits_without_fragments_preview_stored_text(stub, connect):
+    """A query that does not match the text still shows a preview of it."""
+    stub.set_documents(3, text_size=2000)
+    async with connect(index_configs=[INDEX]) as client:
+        requests = search_requests(client)
+        tools = ToolRecorder()
+        register_search_tools(tools, client)
+        matched = await tools.tools["search_index"]("reviews", "dolor", output_mode="compact")
+        unmatched = await tools.tools["search_index"]("reviews", "stars:5", output_mode="compact")
+
+    assert "<em>" not in matched and "dolor" in matched
+    # Only the stored text of the hits without fragments was looked up, by ID
+    assert ["highlight" in r for r in requests] == [True, True, False]
+    assert "queryText" not in requests[2]
+    assert requests[2]["retrieveFields"] == ["text", "review_id"]
+    assert requests[2]["query"]["termInSetQuery"]["textTerms"]["terms"] == [
+        "review-0", "review-1", "review-2"
+    ]
+    assert "1. (1.00) review_id=review-0 | stars=1 | text=lorem ipsum" in unmatched
+    assert len(unmatched) < 3 * 400
+
+
+@pytest.mark.asyncio
+async def test_stored_text_lookup_needs_an_id_field(stub, connect):
+    """The ID is fetched for the lookup but not returned; without one the search repeats."""
+    stub.set_documents(3, text_size=2000)
+    highlight = Highlight(("text",))
+    no_ids = IndexConfig("other", "", INDEX.fields, INDEX.default_search_fields)
+    async with connect(index_configs=[INDEX, no_ids]) as client:
+        requests = search_requests(client)
+        table = await client.search_hits(
+            "reviews", "stars:5", retrieve_fields=["stars"], highlight=highlight
+        )
+        assert requests[0]["retrieveFields"] == ["stars", "review_id"]
+        assert list(table.columns) == ["stars", "text"]
+        assert table.fields(0)["text"].startswith("lorem ipsum")
+
+        del requests[:]
+        await client.search_hits("other", "stars:5", retrieve_fields=["stars"], highlight=highlight)
+        assert [r.get("queryText") for r in requests] == ["stars:5", "stars:5"]
+        assert requests[1]["retrieveFields"] == ["stars", "text"]
@@ -0,0 +1,118 @@
+"""
+Tests for text rendering of tool results.
+"""
+
+import pytest
+
+from nrtsearch_mcp.decoder import HitDecoder
+from nrtsearch_mcp.tools.render import (
+    OutputBuffer,
+    RenderOptions,
+    render_field_info,
+    render_index_info,
+    render_search_results,
+)
+
+
+def make_result(num_hits, text="Great restaurant!"):
+    return {
+        "totalHits": {"value": num_hits},
+        "hits": [
+            {
+                "score": 0.9,
+                "fields": {
+                    "review_id": {"fieldValue": [{"textValue": f"r{i}"}]},
+                    "text": {"fieldValue": [{"textValue": text}]},
+                }
+            }
+            for i in range(num_hits)
+        ]
+    }
+
+
+def test_verbose_output():
+    """Verbose mode prints one line per field."""
+    output = render_search_results("food", make_result(2), HitDecoder())
+    assert output == (
+        "Found 2 results for query: 'food'\n\n"
+        "Result 1 (Score: 0.90):\n  review_id: r0\n  text: Great restaurant!\n\n"
+        "Result 2 (Score: 0.90):\n  review_id: r1\n  text: Great restaurant!\n\n"
+    )
+    assert render_search_results("food", make_result(0), HitDecoder()) == (
+        "No results found for query: 'food'"
+    )
+
+
+def test_compact_output_truncates_fields():
+    """Compact mode prints one line per hit with shortened values."""
+    output = render_search_results(
+        "food", make_result(1, text="x" * 500), HitDecoder(), start=10, mode="compact"
+    )
+    assert output.startswith("Found 1 results for query: 'food'\n11. (0.90) review_id=r0 | text=xxx")
+    assert output.endswith("...\n")
+    assert len(output) < 250
+
+
+def test_output_budget_stops_at_whole_results():
+    """Results past the byte budget are dropped with a note."""
+    options = RenderOptions(max_output_bytes=2000)
+    output = render_search_results("food", make_result(10, text="é" * 200), HitDecoder(), options=options)
+    assert len(output.encode("utf-8")) <= 2000
+    assert "output truncated: showing 4 of 10 results" in output
+    assert output.count("Result ") == 4
+
+
+def test_output_buffer_counts_bytes_near_the_budget():
+    """Parts are accepted by length until the budget is close, then by UTF-8 size."""
+    out = OutputBuffer(100)
+    assert out.add("a" * 20)
+    assert out.add("é" * 30)  # 60 bytes
+    assert not out.add("é" * 11)
+    assert out.add("é" * 10)
+    assert not out.add("x")
+    assert len(out.getvalue().encode("utf-8")) == 100
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown output mode"):
+        render_search_results("food", make_result(1), HitDecoder(), mode="fancy")
+
+
+def test_index_and_field_info():
+    """Index info and field definitions render as before."""
+    assert render_index_info("idx", {"settings": {"a": 1}, "status": {"b": 2}}) == (
+        "Index: idx\n\nSettings:\n  a: 1\n\nStatus:\n  b: 2\n"
+    )
+    assert render_field_info("idx", [{"name": "text", "type": "TEXT", "properties": {"stored": True}}]) == (
+        "Fields for index idx:\n\n- text (TEXT)\n  - stored: True\n"
+    )
+    assert render_field_info("idx", []) == "No field definitions found for index 'idx'."
+
+
+def test_json_search_output():
+    """JSON mode returns the structured SearchResponse model."""
+    from nrtsearch_mcp import jsoncodec
+    
+    output = render_search_results("food", make_result(2), HitDecoder(), mode="json")
+    assert jsoncodec.loads(output) == {
+        "query": "food",
+        "total_hits": 2,
+        "hits": [
+            {"score": 0.9, "fields": {"review_id": "r0", "text": "Great restaurant!"}},
+            {"score": 0.9, "fields": {"review_id": "r1", "text": "Great restaurant!"}},
+        ],
+        "omitted_hits": 0,
+        "next_cursor": None,
+    }
+
+
+def test_json_search_output_respects_budget():
+    """Trailing hits are dropped (and counted) to fit the byte budget."""
+    from nrtsearch_mcp import jsoncodec
+    
+    options = RenderOptions(max_output_bytes=2000)
+    output = render_search_results("food", make_result(10, text="x" * 300), HitDecoder(), mode="json", options=options)
+    assert len(output) <= 2000
+    response = jsoncodec.loads(output)
+    assert len(response["hits"]) + response["omitted_hits"] == 10
+    assert response["hits"]
@@ -0,0 +1,115 @@
+"""
+Tests for retries and per-endpoint circuit breakers.
+"""
+
+import random
+from contextlib import ExitStack
+
+import httpx
+import pytest
+
+from benchmarks.stub_server import StubNRTSearchServer
+from nrtsearch_mcp.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from nrtsearch_mcp.config import NRTSearchConnection
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.retry import RetryPolicy
+from tests.test_balancer import make_config
+from tests.test_cache import FakeClock
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3, rng=random.Random(1))
+    for attempt, cap in ((1, 0.1), (2, 0.2), (3, 0.3), (6, 0.3)):
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0.0 <= d <= cap for d in delays)
+        assert max(delays) > cap * 0.8
+
+
+def test_retry_budget_drains_during_outage():
+    """Retries are capped by the budget once the saved-up tokens are spent."""
+    policy = RetryPolicy(max_attempts=5, budget_ratio=0.1, budget_max_tokens=2)
+    error = httpx.ConnectError("refused")
+    retried = 0
+    for _ in range(30):
+        policy.start()
+        retried += policy.should_retry(error, 1)
+    # Two saved-up tokens plus one earned per ten requests
+    assert retried == 4
+    assert policy.stats()["budget_exhausted"] == 26
+
+
+def test_only_retryable_errors_are_retried():
+    policy = RetryPolicy(max_attempts=3)
+    request = httpx.Request("POST", "http://nrtsearch/search")
+
+    def status_error(code):
+        return httpx.HTTPStatusError("", request=request, response=httpx.Response(code))
+
+    assert policy.should_retry(status_error(503), 1)
+    assert not policy.should_retry(status_error(400), 1)
+    assert not policy.should_retry(ValueError("bad"), 1)
+    assert policy.should_retry(CircuitOpenError("open"), 2)
+    assert not policy.should_retry(httpx.ReadTimeout("slow"), 3)
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_cancel()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["opened"] == 2
+    assert breaker.stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_search_retries_on_another_replica():
+    """A replica answering 503 is retried around, then its breaker opens."""
+    with ExitStack() as stack:
+        primary, good, bad = (stack.enter_context(StubNRTSearchServer()) for _ in range(3))
+        bad.error_status = 503
+        config = make_config([primary, good, bad], health_check_interval=0)
+        config.circuit_breaker.failure_threshold = 2
+        async with NRTSearchClient.from_config(config) as client:
+            for i in range(10):
+                result = await client.search("reviews", f"query {i}")
+                assert len(result["hits"]) == 10
+
+            endpoint = next(e for e in client.balancer.endpoints() if e.url == bad.url)
+            assert endpoint.breaker.state == OPEN
+            assert endpoint.stats()["breaker"]["state"] == OPEN
+
+    assert bad.request_count <= 2
+    assert good.request_count == 10
+    assert client.retry.stats()["retries"] == bad.request_count
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    with StubNRTSearchServer() as stub:
+        connection = NRTSearchConnection(host=stub.host, port=stub.port)
+        async with NRTSearchClient(connection, retry=RetryPolicy(base_delay=0)) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client._make_request("GET", "/unknown")
+            stub.error_status = 502
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_document("reviews", "1")
+
+    assert stub.paths == ["/unknown"] + ["/getDoc"] * 3
@@ -0,0 +1,148 @@
+"""
+Tests for the search tools registered by register_search_tools.
+"""
+
+import asyncio
+
+import pytest
+
+from nrtsearch_mcp.config import get_default_config
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.tools.search import register_search_tools
+from tests.conftest import ToolRecorder
+
+
+def make_hit(doc_id, text):
+    return {
+        "luceneDocId": doc_id,
+        "score": 1.0,
+        "fields": {"text": {"fieldValue": {"textValue": text}}}
+    }
+
+
+class BatchClient(NRTSearchClient):
+    """Client whose backend echoes the query, fails on 'boom' and tracks concurrency."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(get_default_config().nrtsearch_connection, **kwargs)
+        self.in_flight = 0
+        self.peak = 0
+        
+    async def _make_request(self, method, path, json_data=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if json_data["queryText"] == "boom":
+                raise RuntimeError("backend exploded")
+            return {
+                "totalHits": {"value": 1},
+                "hits": [make_hit(1, f"about {json_data['queryText']}")]
+            }
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_client_search_batch_reports_partial_failures():
+    """Failures are reported per search, in input order."""
+    client = BatchClient(batch_max_concurrency=2)
+    results = await client.search_batch([
+        {"index_name": "yelp_reviews", "query": f"q{i}"} for i in range(5)
+    ] + [{"index_name": "yelp_reviews", "query": "boom"}])
+    
+    assert [r["result"]["hits"][0]["fields"]["text"]["fieldValue"]["textValue"]
+            for r in results[:5]] == [f"about q{i}" for i in range(5)]
+    assert "backend exploded" in results[5]["error"]
+    assert client.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_search_batch_tool():
+    """The tool formats every query and isolates invalid or failing ones."""
+    mcp = ToolRecorder()
+    client = BatchClient()
+    register_search_tools(mcp, client)
+    
+    result = await mcp.tools["search_batch"]([
+        {"index_name": "yelp_reviews", "query": "tacos", "top_hits": 3},
+        {"index_name": "yelp_reviews", "query": "boom"},
+        {"query": "no index"},
+        {"index_name": "yelp_reviews", "query": "pizza", "bogus": 1},
+    ], max_concurrency=1)
+    
+    assert result.startswith("Batch of 4 queries: 1 succeeded, 3 failed")
+    assert "=== Query 1: 'tacos' ===\nFound 1 results" in result
+    assert "about tacos" in result
+    assert "=== Query 2: 'boom' ===\nError: RuntimeError: backend exploded" in result
+    assert "Invalid query spec: missing 'index_name'" in result
+    assert "Invalid query spec: unknown keys: bogus" in result
+    assert client.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_search_pages_tool_follows_cursor():
+    """Each page returns a cursor for the next one until results run out."""
+    from tests.test_nrtsearch_api import PagingClient
+    
+    mcp = ToolRecorder()
+    register_search_tools(mcp, PagingClient(total=5))
+    search_pages = mcp.tools["search_pages"]
+    
+    first = await search_pages("idx", "q", page_size=2)
+    assert "Result 1 " in first and "Result 2 " in first
+    cursor = first.rsplit("Next cursor: ", 1)[1].strip()
+    
+    second = await search_pages("idx", "q", page_size=2, cursor=cursor)
+    assert "Result 3 " in second and "Result 4 " in second
+    cursor = second.rsplit("Next cursor: ", 1)[1].strip()
+    
+    third = await search_pages("idx", "q", page_size=2, cursor=cursor)
+    assert "Result 5 " in third and "Next cursor" not in third
+    
+    assert "Unknown or expired cursor" in await search_pages("idx", "q", cursor=cursor)
+
+
+@pytest.mark.asyncio
+async def test_search_pages_cursor_keeps_its_page_size():
+    """A cursor pages by its first call's page_size; empty pages are rejected."""
+    from tests.test_nrtsearch_api import PagingClient
+    
+    mcp = ToolRecorder()
+    register_search_tools(mcp, PagingClient(total=5))
+    search_pages = mcp.tools["search_pages"]
+    
+    assert "page_size must be at least 1" in await search_pages("idx", "q", page_size=0)
+    
+    first = await search_pages("idx", "q", page_size=2)
+    cursor = first.rsplit("Next cursor: ", 1)[1].strip()
+    # Without page_size the call defaults to 10, but the cursor still pages by 2
+    second = await search_pages("idx", "q", cursor=cursor)
+    assert "Result 4 " in second and "Result 5 " not in second
+    assert "Next cursor: " in second
+
+
+@pytest.mark.asyncio
+async def test_search_tools_json_mode():
+    """Tools return structured JSON, including per-query errors in batches."""
+    from nrtsearch_mcp import jsoncodec
+    
+    mcp = ToolRecorder()
+    register_search_tools(mcp, BatchClient())
+    
+    result = jsoncodec.loads(await mcp.tools["search_index"](
+        "yelp_reviews", "tacos", output_mode="json"
+    ))
+    assert result["hits"] == [{"score": 1.0, "fields": {"text": "about tacos"}}]
+    
+    batch = jsoncodec.loads(await mcp.tools["search_batch"]([
+        {"index_name": "yelp_reviews", "query": "tacos"},
+        {"index_name": "yelp_reviews", "query": "boom"},
+    ], output_mode="json"))
+    assert (batch["succeeded"], batch["failed"]) == (1, 1)
+    assert batch["results"][0]["result"]["total_hits"] == 1
+    assert "backend exploded" in batch["results"][1]["error"]
+    
+    assert "Unknown output mode" in await mcp.tools["search_index"](
+        "yelp_reviews", "x", output_mode="xml"
+    )
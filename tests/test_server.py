@@ -2,11 +2,16 @@
 Tests for the NRTSearch MCP server.
 """
 
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 import pytest_asyncio
 
-from nrtsearch_mcp.config import get_default_config
+from nrtsearch_mcp.config import NRTSearchConnection, get_default_config
 from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from tests.conftest import ToolRecorder
 
 
 @pytest.fixture
@@ -16,7 +21,7 @@ def config():
 
 
 @pytest_asyncio.fixture
-async def mock_client(monkeypatch):
+async def mock_client(monkeypatch, config):
     """Mock the NRTSearch client for testing."""
     
     class MockNRTSearchClient(NRTSearchClient):
@@ -75,7 +80,7 @@ async def mock_client(monkeypatch):
             # Default empty response
             return {}
     
-    return MockNRTSearchClient(config().nrtsearch_connection)
+    return MockNRTSearchClient(config.nrtsearch_connection)
 
 
 @pytest.mark.asyncio
@@ -98,3 +103,56 @@ async def test_search(mock_client):
     assert first_hit["fields"]["review_id"]["fieldValue"]["textValue"] == "abc123"
     assert first_hit["fields"]["text"]["fieldValue"]["textValue"] == "Great restaurant!"
     assert first_hit["fields"]["stars"]["fieldValue"]["floatValue"] == 5.0
+
+
+def test_connection_url_includes_path_prefix():
+    """The path prefix is normalised onto the base URL."""
+    connection = NRTSearchConnection(host="localhost", port=8080, path_prefix="v1/")
+    assert connection.url == "http://localhost:8080/v1"
+    assert NRTSearchConnection(host="localhost", port=8080).url == "http://localhost:8080"
+
+
+def test_register_tools_exposes_all_tools(config):
+    """One client backs the search, index and legacy search tools."""
+    server = pytest.importorskip("nrtsearch_mcp.server")
+    recorder = ToolRecorder()
+    server.register_tools(recorder, NRTSearchClient.from_config(config))
+    assert {
+        "search_index", "search_advanced", "search_pages", "search_batch",
+        "get_indexes", "get_index_info", "get_document_by_id", "get_field_info",
+        "invalidate_metadata_cache", "search", "get_server_stats", "get_documents",
+    } <= set(recorder.tools)
+
+
+@pytest.mark.asyncio
+async def test_legacy_search_tool_uses_configured_client(config, stub):
+    """The original search tool goes through the shared client and path prefix."""
+    server = pytest.importorskip("nrtsearch_mcp.server")
+    stub.set_search_payload(num_hits=3, text_size=20)
+    config.nrtsearch_connection = NRTSearchConnection(
+        host=stub.host, port=stub.port, path_prefix="/v1"
+    )
+    recorder = ToolRecorder()
+    async with NRTSearchClient.from_config(config) as client:
+        server.register_tools(recorder, client)
+        result = await recorder.tools["search"]("yelp_reviews", "great coffee", topHits=3)
+        again = await recorder.tools["search"]("yelp_reviews", "great coffee", topHits=3)
+
+    assert len(result.hits) == 3
+    assert result.hits[0].stars == 1
+    assert again == result
+    # The repeated query is answered from the search result cache
+    assert stub.paths.count("/v1/search") == 1
+    assert all(path.startswith("/v1/") for path in stub.paths)
+
+
+def test_import_builds_no_server():
+    """The module-level server is only built when it is looked up."""
+    pytest.importorskip("nrtsearch_mcp.server")
+    code = (
+        "import nrtsearch_mcp.server as server\n"
+        "assert 'mcp' not in vars(server) and 'app' not in vars(server)\n"
+        "app = server.app\n"
+        "assert server.app is app and vars(server)['mcp'] is server.mcp\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[1])
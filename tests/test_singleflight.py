@@ -0,0 +1,143 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from nrtsearch_mcp import deadline
+from nrtsearch_mcp.config import get_default_config
+from nrtsearch_mcp.nrtsearch_api import NRTSearchClient
+from nrtsearch_mcp.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Only the first of several concurrent calls runs."""
+    group = SingleFlight()
+    runs = 0
+    
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return runs
+    
+    results = await asyncio.gather(*(group.do("k", work) for _ in range(5)))
+    assert results == [1] * 5
+    assert (group.calls, group.coalesced) == (1, 4)
+    assert len(group) == 0
+    
+    # Once finished, the next call runs again
+    assert await group.do("k", work) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    """All waiters see the shared call's exception."""
+    group = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    results = await asyncio.gather(
+        group.do("k", fail), group.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_call_for_others():
+    """The shared call survives until its last waiter is cancelled."""
+    group = SingleFlight()
+    started = asyncio.Event()
+    
+    async def work():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+    
+    first = asyncio.ensure_future(group.do("k", work))
+    second = asyncio.ensure_future(group.do("k", work))
+    await started.wait()
+    first.cancel()
+    assert await second == "done"
+    
+    lonely = asyncio.ensure_future(group.do("k", work))
+    await asyncio.sleep(0)
+    lonely.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lonely
+    await asyncio.sleep(0)
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_each_waiter_keeps_its_own_deadline():
+    """The shared call ignores the first caller's deadline; waiters keep theirs."""
+    group = SingleFlight()
+    seen = []
+    
+    async def work():
+        seen.append(deadline.remaining())
+        await asyncio.sleep(0.2)
+        return "done"
+    
+    async def call(timeout):
+        with deadline.deadline(timeout):
+            return await group.do("k", work)
+    
+    # A patient caller joining an impatient one still gets the result
+    short = asyncio.ensure_future(call(0.05))
+    await asyncio.sleep(0)
+    long = asyncio.ensure_future(call(5))
+    with pytest.raises(deadline.DeadlineExceeded):
+        await short
+    assert await long == "done"
+    assert seen == [None]
+    
+    # An impatient caller joining an unbounded one gives up on time
+    unbounded = asyncio.ensure_future(call(None))
+    await asyncio.sleep(0)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(deadline.DeadlineExceeded):
+        await call(0.05)
+    assert loop.time() - start < 0.15
+    assert await unbounded == "done"
+    
+    # Once every waiter has given up, the shared call is cancelled
+    with pytest.raises(deadline.DeadlineExceeded):
+        await call(0.01)
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_requests():
+    """Identical concurrent searches and metadata calls hit the backend once."""
+    calls = []
+    
+    class SlowClient(NRTSearchClient):
+        async def _make_request(self, method, path, json_data=None):
+            calls.append(path)
+            await asyncio.sleep(0.01)
+            if path == "/indices":
+                return {"indices": ["yelp_reviews"]}
+            if path.endswith("/fields"):
+                return {"fields": [{"name": "text"}]}
+            return {"hits": []}
+    
+    client = SlowClient(get_default_config().nrtsearch_connection)
+    await asyncio.gather(
+        *(client.search("yelp_reviews", "tacos") for _ in range(3)),
+        *(client.get_indexes() for _ in range(3)),
+        *(client.get_field_info("yelp_reviews") for _ in range(3)),
+        *(client.get_index_info("yelp_reviews") for _ in range(3)),
+        client.search("yelp_reviews", "burritos")
+    )
+    assert sorted(calls) == sorted([
+        "/search", "/search", "/indices",
+        "/indices/yelp_reviews/fields", "/indices/yelp_reviews"
+    ])
@@ -0,0 +1,102 @@
+"""
+Tests for snippets of long text fields.
+"""
+
+import pytest
+
+from nrtsearch_mcp.config import get_default_config
+from nrtsearch_mcp.snippets import best_windows, query_terms, snippet
+from nrtsearch_mcp.tools.render import RenderOptions
+from nrtsearch_mcp.tools.search import register_search_tools
+from tests.test_projection import INDEX, search_requests
+from tests.conftest import ToolRecorder
+
+FILLER = "The parking lot was full and the line was long. " * 10
+REVIEW = (
+    FILLER
+    + "Their coffee is strong. "
+    + FILLER
+    + "Best coffee in town, and a great irish pub next door. "
+    + FILLER
+)
+
+
+def test_query_terms_strip_lucene_syntax():
+    assert query_terms('text:(irish AND pub) OR "great coffee" stars:[4 TO 5] bar* x') == [
+        "irish", "pub", "great", "coffee", "bar"
+    ]
+
+
+def test_best_windows_prefer_distinct_terms():
+    terms = query_terms("great coffee pub")
+    [(start, end)] = best_windows(REVIEW, terms, length=80)
+    assert "great irish pub" in REVIEW[start:end] and "Best coffee" in REVIEW[start:end]
+
+    windows = best_windows(REVIEW, terms, length=80, count=2)
+    assert len(windows) == 2
+    assert windows[0][1] <= windows[1][0]
+    assert "Their coffee" in REVIEW[windows[0][0]:windows[0][1]]
+
+    # Without a match the text is previewed from its start
+    assert best_windows(REVIEW, ["sushi"], length=80)[0][0] == 0
+    assert best_windows("short", ["sushi"], length=80) == [(0, 5)]
+
+
+def test_snippet_marks_cuts():
+    text = snippet(REVIEW, ["coffee"], length=60, count=2)
+    assert text.startswith("...") and text.endswith("...")
+    assert text.count("coffee") == 2
+    assert len(text) <= 2 * 60 + len(" ... ") + 6
+    assert snippet("Great coffee.", ["coffee"], length=60) == "Great coffee."
+
+
+@pytest.fixture
+def stub(stub):
+    stub.set_search_payload(num_hits=5, text_size=3000)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_snippets_use_backend_highlighting(connect):
+    async with connect(index_configs=[INDEX]) as client:
+        requests = search_requests(client)
+        tools = ToolRecorder()
+        register_search_tools(tools, client, RenderOptions(snippet_chars=120, snippet_count=3))
+        full = await tools.tools["search_index"]("reviews", "dolor")
+        short = await tools.tools["search_index"]("reviews", "dolor", snippets=True)
+
+    assert requests[1]["highlight"] == {
+        "fields": ["text"], "settings": {"fragmentSize": 120, "maxNumberOfFragments": 3}
+    }
+    assert requests[1]["retrieveFields"] == ["review_id", "stars"]
+    assert short.count(" ... ") == 5 * 2
+    assert len(short) * 5 < len(full)
+
+
+@pytest.mark.asyncio
+async def test_snippets_are_cut_locally_without_highlighting(stub, connect):
+    stub.highlighting = False
+    async with connect(index_configs=[INDEX]) as client:
+        tools = ToolRecorder()
+        register_search_tools(tools, client)
+        full = await tools.tools["search_index"]("reviews", "amet", output_mode="json")
+        short = await tools.tools["search_index"]("reviews", "amet", output_mode="json", snippets=True)
+        compact = await tools.tools["search_advanced"](
+            "reviews", "amet", output_mode="compact", snippets=True
+        )
+        page = await tools.tools["search_pages"]("reviews", "amet", snippets=True)
+        assert client.stats()["highlight_rejected"] == ["reviews"]
+
+    assert len(short) * 5 < len(full)
+    for output in (short, compact, page):
+        assert "amet" in output and " ... " in output
+    # Compact mode does not cut the two snippets back to its preview length
+    assert all(len(line) > 400 for line in compact.splitlines()[1:] if line)
+
+
+def test_snippet_settings_from_config():
+    config = get_default_config()
+    config.snippets.length = 80
+    config.snippets.count = 1
+    options = RenderOptions.from_config(config)
+    assert (options.snippet_chars, options.snippet_count) == (80, 1)
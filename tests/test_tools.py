@@ -8,6 +8,8 @@ import pytest_asyncio
 from mcp.server.fastmcp import FastMCP
 
 from nrtsearch_mcp.config import get_default_config
+from nrtsearch_mcp.decoder import HitDecoder
+from nrtsearch_mcp.hits import HitTable
 from nrtsearch_mcp.tools.search import register_search_tools
 from nrtsearch_mcp.tools.index import register_index_tools
 
@@ -19,6 +21,9 @@ def mock_client(monkeypatch):
     class MockClient:
         """Mock client with predefined responses."""
         
+        # No configured indexes: searches retrieve whatever the backend returns
+        index_configs = {}
+        
         async def search(self, index_name, query, **kwargs):
             """Mock search method."""
             return {
@@ -57,6 +62,15 @@ def mock_client(monkeypatch):
                 ]
             }
         
+        async def search_hits(self, index_name, query, highlight=None, **kwargs):
+            """Mock search_hits method."""
+            return HitTable.from_response(
+                await self.search(index_name, query, **kwargs),
+                await self.get_hit_decoder(index_name),
+                highlight,
+                query
+            )
+        
         async def get_indexes(self):
             """Mock get_indexes method."""
             return ["yelp_reviews", "test_index"]
@@ -103,6 +117,10 @@ def mock_client(monkeypatch):
                     "properties": {"stored": True}
                 }
             ]
+        
+        async def get_hit_decoder(self, index_name):
+            """Mock get_hit_decoder method."""
+            return HitDecoder.from_field_info(await self.get_field_info(index_name))
     
     return MockClient()
 
@@ -0,0 +1,190 @@
+"""
+Tests for request tracing.
+"""
+
+import random
+
+import pytest
+
+from nrtsearch_mcp import tracing
+from nrtsearch_mcp.config import NRTSearchConnection, get_default_config
+from nrtsearch_mcp.tools.index import register_index_tools
+from nrtsearch_mcp.tools.search import register_search_tools
+from tests.conftest import ToolRecorder
+
+
+@pytest.fixture
+def exporter():
+    exporter = tracing.InMemoryExporter()
+    tracing.configure(tracing.Tracer(exporter))
+    yield exporter
+    tracing.configure(None)
+
+
+@pytest.fixture
+def stub(stub):
+    stub.set_search_payload(num_hits=3, text_size=200)
+    return stub
+
+
+def test_disabled_tracing_is_a_no_op():
+    assert tracing.get_tracer() is None
+    assert tracing.tool_span("search_index") is tracing.NOOP_SPAN
+    assert tracing.span("http") is tracing.NOOP_SPAN
+    with tracing.tool_span("search_index") as span:
+        span.set_attribute("ignored", True)
+        assert tracing.current_span() is tracing.NOOP_SPAN
+
+
+@pytest.mark.asyncio
+async def test_tool_phases_are_child_spans(exporter, connect):
+    async with connect() as client:
+        tools = ToolRecorder()
+        register_search_tools(tools, client)
+        await tools.tools["search_index"]("reviews", "great  coffee")
+
+    [trace] = exporter.traces
+    root = trace[0]
+    assert root.name == "tools/call search_index"
+    assert root.parent_id is None
+    assert root.attributes["mcp.tool"] == "search_index"
+    names = [span.name for span in trace[1:]]
+    assert {"search.normalize", "http", "json.decode", "format"} <= set(names)
+    assert all(span.trace_id == root.trace_id for span in trace)
+    assert all(span.parent_id == root.span_id for span in trace[1:])
+    assert all(span.start_ns >= root.start_ns and span.end_ns <= root.end_ns for span in trace)
+
+    search = next(s for s in trace if s.name == "http" and s.attributes["url.path"] == "/search")
+    assert search.attributes["http.response.status_code"] == 200
+    assert search.to_dict()["parentSpanId"] == f"{root.span_id:016x}"
+
+
+@pytest.mark.asyncio
+async def test_errors_are_recorded(exporter, stub, connect):
+    stub.error_status = 500
+    async with connect() as client:
+        tools = ToolRecorder()
+        register_index_tools(tools, client)
+        output = await tools.tools["get_index_info"]("reviews")
+
+    assert output.startswith("Error")
+    [trace] = exporter.traces
+    assert trace[0].error.startswith("HTTPStatusError")
+    http = [span for span in trace if span.name == "http"]
+    assert http and all(span.attributes["http.response.status_code"] == 500 for span in http)
+    assert trace[0].to_dict()["status"]["code"] == "ERROR"
+
+
+def test_sampling_and_span_cap():
+    exporter = tracing.InMemoryExporter()
+    tracer = tracing.Tracer(exporter, sample_rate=0.25, max_spans_per_trace=3, rng=random.Random(7))
+    tracing.configure(tracer)
+    try:
+        for _ in range(200):
+            with tracing.tool_span("search_index"):
+                for _ in range(5):
+                    with tracing.span("http"):
+                        pass
+    finally:
+        tracing.configure(None)
+
+    assert 30 < len(exporter.traces) < 70
+    assert tracer.stats()["sampled"] == len(exporter.traces)
+    assert all(len(trace) == 3 for trace in exporter.traces)
+    assert tracer.stats()["dropped_spans"] == 3 * len(exporter.traces)
+
+
+def test_tool_span_follows_dispatch_sampling():
+    """A call the dispatcher did not sample is not sampled again by the tool."""
+    exporter = tracing.InMemoryExporter()
+    tracer = tracing.Tracer(exporter, sample_rate=0.1, rng=random.Random(3))
+    tracing.configure(tracer)
+    try:
+        for _ in range(1000):
+            with tracing.dispatch_span("search_index"):
+                with tracing.tool_span("search_index"):
+                    pass
+    finally:
+        tracing.configure(None)
+
+    stats = tracer.stats()
+    assert stats["sampled"] + stats["unsampled"] == 1000
+    assert 60 < stats["sampled"] < 140
+    assert len(exporter.traces) == stats["sampled"]
+
+
+def test_tracer_from_config():
+    config = get_default_config()
+    assert tracing.Tracer.from_config(config) is None
+    config.tracing.enabled = True
+    config.tracing.exporter = "memory"
+    assert isinstance(tracing.Tracer.from_config(config).exporter, tracing.InMemoryExporter)
+    config.tracing.exporter = "zipkin"
+    with pytest.raises(ValueError):
+        tracing.Tracer.from_config(config)
+
+
+@pytest.mark.asyncio
+async def test_mcp_dispatch_span(stub):
+    """Through the MCP server, dispatch time is a child of the tool span."""
+    server = pytest.importorskip("nrtsearch_mcp.server")
+    fastmcp = pytest.importorskip("fastmcp")
+    config = get_default_config()
+    config.nrtsearch_connection = NRTSearchConnection(host=stub.host, port=stub.port)
+    config.indexes = []
+    config.tracing.enabled = True
+    config.tracing.exporter = "memory"
+    mcp = server.create_server(config)
+    try:
+        async with fastmcp.Client(mcp) as session:
+            await session.call_tool("search_index", {"index_name": "reviews", "query": "coffee"})
+        exporter = tracing.get_tracer().exporter
+    finally:
+        tracing.configure(None)
+
+    [trace] = exporter.traces
+    assert trace[0].name == "tools/call search_index"
+    dispatch = [span for span in trace if span.name == "mcp.dispatch"]
+    assert len(dispatch) == 1
+    assert dispatch[0].parent_id == trace[0].span_id
+    assert dispatch[0].start_ns == trace[0].start_ns
+
+
+def test_opentelemetry_exporter_replays_structure():
+    otel_trace = pytest.importorskip("opentelemetry.trace")
+
+    class RecordingTracer:
+        def __init__(self):
+            self.started = []
+
+        def start_span(self, name, context=None, start_time=None, attributes=None):
+            parent = None if context is None else otel_trace.get_current_span(context)
+            span = RecordingSpan(name, parent, start_time)
+            self.started.append(span)
+            return span
+
+    class RecordingSpan(otel_trace.NonRecordingSpan):
+        def __init__(self, name, parent, start_time):
+            super().__init__(otel_trace.INVALID_SPAN_CONTEXT)
+            self.name, self.parent, self.start_time = name, parent, start_time
+            self.end_time = None
+
+        def end(self, end_time=None):
+            self.end_time = end_time
+
+    exporter = tracing.InMemoryExporter()
+    tracing.configure(tracing.Tracer(exporter))
+    try:
+        with tracing.tool_span("get_indexes"):
+            with tracing.span("http"):
+                pass
+    finally:
+        tracing.configure(None)
+
+    otel_tracer = RecordingTracer()
+    tracing.OpenTelemetryExporter(otel_tracer).export(exporter.traces[0])
+    root, http = otel_tracer.started
+    assert (root.name, root.parent) == ("tools/call get_indexes", None)
+    assert http.parent is root
+    assert http.start_time == exporter.traces[0][1].start_ns
+    assert root.end_time == exporter.traces[0][0].end_ns